@@ -0,0 +1,56 @@
+"""
+Time to summarise a large allure-results folder natively, serially and with a
+process pool. Writes synthetic result files into a temporary folder.
+
+Usage:
+    python benchmarks/bench_allure_summary.py --results 20000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.allure_report import summarize_results
+
+STATUSES = ("passed", "passed", "passed", "failed", "broken", "skipped")
+
+
+def write_results(results_dir, count):
+    for i in range(count):
+        result = {
+            "uuid": f"uuid-{i}", "historyId": f"history-{i}", "name": f"test_{i}",
+            "fullName": f"tests.ui.test_suite_{i % 20}#test_{i}", "status": STATUSES[i % len(STATUSES)],
+            "start": 1_700_000_000_000 + i * 10, "stop": 1_700_000_000_000 + i * 10 + (i % 700),
+            "steps": [{"name": f"step {s}", "status": "passed"} for s in range(10)],
+            "labels": [{"name": "suite", "value": f"test_suite_{i % 20}"}, {"name": "framework", "value": "pytest"}],
+        }
+        with open(os.path.join(results_dir, f"uuid-{i}-result.json"), "w") as f:
+            json.dump(result, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=20000)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        write_results(results_dir, args.results)
+        start = time.perf_counter()
+        serial = summarize_results(results_dir, processes=0)
+        serial_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        pooled = summarize_results(results_dir, processes=args.processes, parallel_threshold=1000)
+        pooled_seconds = time.perf_counter() - start
+
+    assert serial == pooled
+    print(f"Result files: {args.results} ({serial['total']} tests, {len(serial['suites'])} suites)")
+    print(f"  serial       : {serial_seconds:6.2f}s")
+    print(f"  process pool : {pooled_seconds:6.2f}s ({os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Wall-clock comparison of launching a browser per test (old `page` fixture)
+against reusing a pooled browser with a fresh context per test.
+
+Usage:
+    python benchmarks/bench_browser_pool.py --browser chromium --tests 20
+"""
+import argparse
+import os
+import sys
+import time
+
+from playwright.sync_api import sync_playwright
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.browser_pool import BrowserPool
+
+LAUNCH_OPTIONS = {"headless": True}
+PAGE_HTML = "<html><body><h1>benchmark</h1></body></html>"
+
+
+def run_test(browser):
+    context = browser.new_context(viewport={"width": 1920, "height": 1080})
+    page = context.new_page()
+    page.set_content(PAGE_HTML)
+    page.close()
+    context.close()
+
+
+def bench_launch_per_test(playwright, browser_name, tests):
+    start = time.perf_counter()
+    for _ in range(tests):
+        browser = getattr(playwright, browser_name).launch(**LAUNCH_OPTIONS)
+        run_test(browser)
+        browser.close()
+    return time.perf_counter() - start
+
+
+def bench_pooled(playwright, browser_name, tests, max_uses):
+    pool = BrowserPool(playwright, max_uses=max_uses)
+    start = time.perf_counter()
+    for _ in range(tests):
+        browser = pool.acquire((browser_name, 0), LAUNCH_OPTIONS)
+        run_test(browser)
+        pool.release((browser_name, 0))
+    pool.close_all()
+    return time.perf_counter() - start, pool.launches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", default="chromium")
+    parser.add_argument("--tests", type=int, default=20)
+    parser.add_argument("--max-uses", type=int, default=50)
+    args = parser.parse_args()
+
+    with sync_playwright() as playwright:
+        before = bench_launch_per_test(playwright, args.browser, args.tests)
+        after, launches = bench_pooled(playwright, args.browser, args.tests, args.max_uses)
+
+    print(f"Browser: {args.browser}, tests: {args.tests}")
+    print(f"  launch per test : {before:8.2f}s ({before / args.tests * 1000:.0f} ms/test, {args.tests} launches)")
+    print(f"  pooled browser  : {after:8.2f}s ({after / args.tests * 1000:.0f} ms/test, {launches} launches)")
+    print(f"  saved           : {before - after:8.2f}s ({(1 - after / before) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Per-test cost of Playwright tracing: runs the same small test with tracing off
+and in each trace mode, and compares median wall-clock time per test.
+
+Usage:
+    python benchmarks/bench_tracing.py --browser chromium --tests 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from playwright.sync_api import sync_playwright
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.trace_store import TraceSession, TraceStore
+
+PAGE_HTML = "<html><body><h1>benchmark</h1><input id='q'><button onclick='this.textContent=1'>go</button></body></html>"
+
+
+def run_test(browser, trace):
+    start = time.perf_counter()
+    context = browser.new_context(viewport={"width": 1920, "height": 1080})
+    trace.start(context)
+    page = context.new_page()
+    page.set_content(PAGE_HTML)
+    page.locator("#q").fill("tracing")
+    page.locator("button").click()
+    trace.stop(context, failed=False)
+    page.close()
+    context.close()
+    return time.perf_counter() - start
+
+
+def bench_mode(browser, mode, tests, store):
+    timings = [run_test(browser, TraceSession(mode, store, f"bench_{mode}_{i}")) for i in range(tests)]
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", default="chromium")
+    parser.add_argument("--tests", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as trace_dir, sync_playwright() as playwright:
+        store = TraceStore(trace_dir)
+        browser = getattr(playwright, args.browser).launch(headless=True)
+        run_test(browser, TraceSession("off", store, "warmup"))
+        results = {mode: bench_mode(browser, mode, args.tests, store) for mode in ("off", "retain-on-failure", "on")}
+        browser.close()
+        stored_mb = store.total_bytes() / 1024 ** 2
+
+    baseline = results["off"]
+    print(f"Browser: {args.browser}, tests per mode: {args.tests}")
+    for mode, median in results.items():
+        print(f"  {mode:<18}: {median * 1000:7.0f} ms/test (+{(median - baseline) * 1000:.0f} ms)")
+    print(f"  traces kept by 'on': {stored_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Median wait overhead of the old sleep-polling waits against the event-driven
+ones in ScriptUtils. Overhead is the time between the condition becoming true
+and the wait returning.
+
+The predicate benchmark needs no browser. `--browser` additionally times
+fluent_wait against an element that is revealed by a page timer.
+
+Usage:
+    python benchmarks/bench_waits.py --trials 20
+    python benchmarks/bench_waits.py --trials 10 --browser chromium
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.script_utils import ScriptUtils
+
+# Condition becomes true somewhere in this window (seconds)
+READY_AFTER = (0.02, 0.3)
+REVEAL_HTML = """
+<html><body><div id="target" style="display:none">ready</div>
+<script>setTimeout(() => {{ window.revealedAt = performance.now();
+document.getElementById('target').style.display = 'block'; }}, {delay_ms});</script></body></html>
+"""
+
+
+def legacy_wait_with_sleep_check(condition_func, timeout=10, poll_interval=1):
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition_func():
+            return
+        time.sleep(poll_interval)
+    raise TimeoutError("[FAIL] Condition not met within timeout.")
+
+
+def legacy_fluent_wait(page, selector, timeout=10, poll_interval=0.5):
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        try:
+            if page.is_visible(selector):
+                return True
+        except Exception:
+            pass
+        time.sleep(poll_interval)
+    raise TimeoutError(f"[FAIL] Element not visible after {timeout} seconds: {selector}")
+
+
+def predicate_overhead(wait, trials):
+    overheads = []
+    for _ in range(trials):
+        ready_at = time.monotonic() + random.uniform(*READY_AFTER)
+        with contextlib.redirect_stdout(io.StringIO()):
+            wait(lambda: time.monotonic() >= ready_at)
+        overheads.append(time.monotonic() - ready_at)
+    return statistics.median(overheads)
+
+
+def fluent_overhead(page, wait, trials):
+    overheads = []
+    for _ in range(trials):
+        page.set_content(REVEAL_HTML.format(delay_ms=int(random.uniform(*READY_AFTER) * 1000)))
+        start_ms = page.evaluate("performance.now()")
+        start = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            wait(page, "#target")
+        elapsed = time.monotonic() - start
+        revealed_after = (page.evaluate("window.revealedAt") - start_ms) / 1000
+        overheads.append(elapsed - revealed_after)
+    return statistics.median(overheads)
+
+
+def report(name, before, after):
+    print(f"{name:<22}{before * 1000:>12.1f} ms{after * 1000:>12.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], help="Also benchmark fluent_wait")
+    args = parser.parse_args()
+
+    print(f"{'Median overhead':<22}{'before':>15}{'after':>15}")
+    report("wait_with_sleep_check",
+           predicate_overhead(legacy_wait_with_sleep_check, args.trials),
+           predicate_overhead(ScriptUtils.wait_with_sleep_check, args.trials))
+
+    if args.browser:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, args.browser).launch(headless=True)
+            page = browser.new_page()
+            report("fluent_wait",
+                   fluent_overhead(page, legacy_fluent_wait, args.trials),
+                   fluent_overhead(page, ScriptUtils.fluent_wait, args.trials))
+            browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Import-time budget for test collection.
+
+Runs `python -X importtime -m pytest --collect-only` on a test path and fails
+when the total import time exceeds the budget or when a heavy optional
+dependency is imported just to collect the tests. It also compares the run
+against the checked-in baseline: the total may not grow past the tolerance and
+no module may become heavy that was not heavy in the baseline.
+
+Usage:
+    python benchmarks/import_time.py                         # tests/api, default budget
+    python benchmarks/import_time.py --budget-ms 800
+    python benchmarks/import_time.py --write-baseline        # refresh benchmarks/importtime_baseline.txt
+"""
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGET = "tests/api"
+DEFAULT_BUDGET_MS = 2000
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "importtime_baseline.txt")
+# Timings differ between machines; a regression must exceed the baseline by this fraction
+BASELINE_TOLERANCE = 0.5
+HEAVY_MODULE_MS = 20
+# Only needed by specific helpers; collecting API tests must not import them
+FORBIDDEN_MODULES = ("twilio", "pandas", "openpyxl", "fitz", "pymysql", "jsonschema", "aiohttp", "PIL")
+
+LINE_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def measure(target=DEFAULT_TARGET, workdir=None):
+    """
+    Returns the raw `-X importtime` report for collecting `target`.
+    Output capture is disabled (-s) so conftest imports are reported too.
+
+    :param workdir: Run pytest from this directory (with a copy of data/)
+                    instead of the repo root. Logs, reports and the background
+                    cleanup use relative paths, so they stay inside it.
+    """
+    cwd = ROOT
+    if workdir is not None:
+        shutil.copytree(os.path.join(ROOT, "data"), os.path.join(workdir, "data"), dirs_exist_ok=True)
+        cwd = workdir
+    command = [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q", "-s",
+               "-p", "no:cacheprovider", "--rootdir", ROOT, os.path.join(ROOT, target)]
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"[ERROR] Collecting {target} failed (exit code {result.returncode}):\n{result.stdout[-2000:]}")
+    return "\n".join(line for line in result.stderr.splitlines() if line.startswith("import time:"))
+
+
+def parse_importtime(report):
+    """
+    Returns a list of (name, self_us, cumulative_us, depth) entries.
+    """
+    entries = []
+    for line in report.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def total_ms(entries):
+    return sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000
+
+
+def find_problems(entries, budget_ms=DEFAULT_BUDGET_MS, forbidden=FORBIDDEN_MODULES):
+    problems = []
+    imported = {name.split(".")[0] for name, _, _, _ in entries}
+    for module in forbidden:
+        if module in imported:
+            problems.append(f"'{module}' is imported during collection")
+    total = total_ms(entries)
+    if total > budget_ms:
+        problems.append(f"total import time {total:.0f} ms exceeds budget {budget_ms} ms")
+    return problems
+
+
+def heavy_modules(entries, threshold_ms=HEAVY_MODULE_MS):
+    """
+    Returns the top-level packages with an import of at least `threshold_ms`
+    (cumulative). Individual submodules are too noisy to compare between runs.
+    """
+    return {name.split(".")[0] for name, _, cumulative, _ in entries if cumulative >= threshold_ms * 1000}
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path, "r") as f:
+        return parse_importtime(f.read())
+
+
+def compare_to_baseline(entries, baseline, tolerance=BASELINE_TOLERANCE, threshold_ms=HEAVY_MODULE_MS):
+    """
+    Returns the regressions against `baseline`: modules that are heavy now but
+    were not heavy then, and a total that grew by more than `tolerance`.
+    The baseline side uses a threshold lowered by the same tolerance, so a module
+    just under the line on one machine is not flagged on a slower one.
+    """
+    problems = []
+    new_heavy = heavy_modules(entries, threshold_ms) - heavy_modules(baseline, threshold_ms / (1 + tolerance))
+    for module in sorted(new_heavy):
+        problems.append(f"'{module}' takes {threshold_ms} ms or more to import and is not heavy in the baseline")
+    total, baseline_total = total_ms(entries), total_ms(baseline)
+    if total > baseline_total * (1 + tolerance):
+        problems.append(f"total import time {total:.0f} ms exceeds baseline {baseline_total:.0f} ms by more than {tolerance:.0%}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target", nargs="?", default=DEFAULT_TARGET)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Raw importtime report to compare against")
+    parser.add_argument("--write-baseline", action="store_true", help="Save this run as the new baseline")
+    args = parser.parse_args()
+
+    report = measure(args.target)
+    entries = parse_importtime(report)
+    if args.write_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(report + "\n")
+        print(f"[INFO] Baseline written: {args.baseline}")
+
+    print(f"Slowest top-level imports while collecting {args.target}:")
+    top_level = sorted((e for e in entries if e[3] == 0), key=lambda e: e[2], reverse=True)
+    for name, _, cumulative, _ in top_level[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print(f"Total: {total_ms(entries):.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    problems = find_problems(entries, args.budget_ms)
+    if os.path.exists(args.baseline):
+        problems += compare_to_baseline(entries, load_baseline(args.baseline))
+    else:
+        print(f"[WARN] No baseline at {args.baseline}; run with --write-baseline to create one")
+    for problem in problems:
+        print(f"[FAIL] {problem}")
+    if problems:
+        sys.exit(1)
+    print("[PASS] Import budget met")
+
+
+if __name__ == "__main__":
+    main()
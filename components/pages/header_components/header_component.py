@@ -1,3 +1,5 @@
+from utils.script_utils import ScriptUtils
+
 class HeaderComponent:
     def __init__(self, page):
         self.page = page
@@ -5,4 +7,13 @@ class HeaderComponent:
         self.user_menu = "#userMenu"
 
     def is_logo_visible(self):
-        return self.page.is_visible(self.logo)
\ No newline at end of file
+        return self.page.is_visible(self.logo)
+
+    def get_state(self):
+        """
+        Reads logo and user menu state in one round-trip.
+        """
+        return ScriptUtils.snapshot(self.page, {
+            "logo": {"selector": self.logo, "attributes": ["src", "alt"]},
+            "user_menu": self.user_menu,
+        })
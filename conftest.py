@@ -2,25 +2,61 @@ import pytest
 import os
 import json
 import datetime
-import re
-import requests
+import statistics
+import warnings
+import contextlib
+import shutil
+import tempfile
+import allure
 from playwright.sync_api import sync_playwright
-from utils.cleanup_utils import delete_old_timestamp_folders
+from utils.cleanup_utils import BackgroundCleanup
 from utils.message_utils import send_teams_message, send_slack_message, send_email_from_config
-from utils.allure_report import generate_allure_report, parse_allure_summary
-from utils.health_check import check_api, check_web_app, check_mobile_backend, check_database
-
-# ------------------ CLEANUP OLD FILES ------------------ #
-for folder in ["screenshots", "logs", "reports", "allure-results"]:
-    delete_old_timestamp_folders(folder, days_old=7)
+from utils.allure_report import start_allure_report, summarize_results, write_summary
+from utils.health_check import build_health_checks, health_cache_key, run_health_gate, format_health_table
+from utils.browser_pool import BrowserPool
+from utils.auth_state import get_storage_state, refresh_storage_state
+from utils.network_utils import NetworkRouter
+from utils.round_trips import RoundTripCounter
+from utils.har_utils import HarSession, HAR_MODES
+from utils.cassette import CASSETTE_MODES
+from utils import api_utils
+from utils.config_reader import get_config, set_default_config_path
+from utils.logger_utils import attach_handler, configure_logging, run_timestamp, set_test_context, stop_logging, log_dir
+from utils.log_merge import merge_logs
+from utils.timing import configure_timing, get_profiler, timed
+from utils.duration_scheduler import DurationHistory, DurationScheduling
+from utils.browser_slots import browser_capacity, item_slot, save_slot_map, slot_id, slot_of
+from utils.artifacts import ArtifactStore, ConsoleRecorder
+from utils.trace_store import TraceSession, TraceStore, TRACE_MODES
+from utils.trend_db import TrendDB
+from utils.rerun_plugin import SmartRerun, load_flake_rates
+from page_objects.pages.login_pages.login_page import LoginPage
+from page_objects.locators.login_locators.login_locators import LoginLocators
 
 # ------------------ GLOBALS ------------------ #
-RUN_TIMESTAMP = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+# Exported through the environment so xdist workers log into the same run folder
+RUN_TIMESTAMP = run_timestamp()
 SCREENSHOT_DIR = os.path.join("screenshots", RUN_TIMESTAMP)
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 
+CONTEXT_OPTIONS = {"accept_downloads": True, "viewport": {"width": 1920, "height": 1080}}
+
 config = {}
 playwright = None
+browser_pool = None
+artifact_store = None
+trace_store = None
+tracing_stats = {"traced": 0, "kept": 0, "overhead_ms": []}
+har_unmatched = {}
+cleanup_task = None
+cassette_worker_stats = []
+duration_scheduler = None
+slot_map_dir = None
+measured_durations = {}
+skipped_tests = set()
+run_results = {}
+trend_report = None
+round_trips_unavailable = False
 
 # ------------------ CLI OPTIONS ------------------ #
 def pytest_addoption(parser):
@@ -28,19 +64,106 @@ def pytest_addoption(parser):
     parser.addoption("--browsers", action="store", default="chromium", help="Comma-separated: chromium,firefox,webkit")
     parser.addoption("--instances", action="store", default="1", help="Instances per browser")
     parser.addoption("--mcp", action="store_true", help="Enable MCP (Model Component Proxy) for self-healing")
+    parser.addoption("--har-mode", action="store", default="off", choices=HAR_MODES, help="Record or replay per-test HAR files")
+    parser.addoption("--har-dir", action="store", default="hars", help="Directory holding per-test HAR files")
+    parser.addoption("--api-cassette", action="store", default="off", choices=CASSETTE_MODES, help="Record/replay API calls made through send_request")
+    parser.addoption("--cassette-dir", action="store", default="cassettes", help="Directory holding API cassettes")
+    parser.addoption("--health-check", action="store_true", help="Probe the environment before the suite and abort if it is down")
+    parser.addoption("--retries", action="store", type=int, default=None, help="Rerun failed tests up to N times at the end of the session (default: reruns.retries in config)")
+    parser.addoption("--no-quarantine", action="store_true", help="Do not turn failures of historically flaky tests into xfail")
+    parser.addoption("--trace-mode", action="store", default=None, choices=TRACE_MODES, help="Playwright tracing per test (default: tracing.mode in config)")
+    parser.addoption("--no-duration-scheduling", action="store_true", help="Use xdist's default load scheduling instead of duration-aware LPT")
+
+# ------------------ PLUGIN CONFIGURATION ------------------ #
+def pytest_configure(config):
+    # Every get_config() call without a path now resolves to --config
+    set_default_config_path(config.getoption("--config"))
+    # Started here rather than on import, so the logging section comes from --config
+    configure_logging(get_config().get("logging", {}))
+    api_utils.configure_cassette(config.getoption("--api-cassette"), config.getoption("--cassette-dir"))
+    configure_timing(get_config().get("timing", {}).get("enabled", True))
+    configure_reruns(config)
+    start_cleanup(config)
+
+# ------------------ RERUNS ------------------ #
+def configure_reruns(pytest_config):
+    rerun_cfg = get_config().get("reruns", {})
+    if not rerun_cfg.get("enabled", True):
+        return
+    if pytest_config.getoption("reruns", None):
+        print("[WARN] --reruns (pytest-rerunfailures) is set — end-of-session reruns are disabled")
+        return
+    trends_cfg = get_config().get("trends", {})
+    quarantine = rerun_cfg.get("quarantine", True) and not pytest_config.getoption("--no-quarantine")
+    retries = pytest_config.getoption("--retries")
+    pytest_config.pluginmanager.register(SmartRerun(
+        retries=retries if retries is not None else rerun_cfg.get("retries", 0),
+        flaky_retries=rerun_cfg.get("flaky_retries", 2),
+        max_session_reruns=rerun_cfg.get("max_session_reruns", 20),
+        backoff_seconds=rerun_cfg.get("backoff_seconds", 1),
+        flake_rates=load_flake_rates(
+            trends_cfg.get("path", "reports/trends.sqlite"),
+            runs=rerun_cfg.get("history_runs", 20),
+            min_runs=rerun_cfg.get("min_history_runs", 5),
+        ),
+        quarantine_rate=rerun_cfg.get("quarantine_rate", 0.3) if quarantine else None,
+    ), "smart_rerun")
+
+# ------------------ CLEANUP OLD FILES ------------------ #
+def start_cleanup(pytest_config):
+    global cleanup_task
+    # Only the controller (or a non-xdist run) cleans; workers would race on rmtree
+    if hasattr(pytest_config, "workerinput"):
+        return
+    cleanup_cfg = get_config().get("cleanup", {})
+    cleanup_task = BackgroundCleanup(
+        list(cleanup_cfg.get("folders", ["screenshots", "logs", "reports", "allure-results"])),
+        days_old=cleanup_cfg.get("days_old", 7),
+        max_total_gb=cleanup_cfg.get("max_total_gb"),
+        lock_path=cleanup_cfg.get("lock_path", ".cleanup.lock"),
+        keep_after=datetime.datetime.strptime(RUN_TIMESTAMP, '%Y-%m-%d_%H-%M-%S'),
+        deadline_seconds=cleanup_cfg.get("deadline_seconds", 120),
+    ).start()
+
+def finish_cleanup():
+    if cleanup_task is None:
+        return
+    result = cleanup_task.join(timeout=get_config().get("cleanup", {}).get("join_timeout_seconds", 30))
+    if result is None:
+        print("[Cleanup] Still running in background — skipped waiting")
+    elif result["ran"]:
+        print(f"[Cleanup] Reclaimed {result['reclaimed_bytes'] / 1024 ** 2:.1f} MB")
 
-# ------------------ LOAD CONFIG ------------------ #
-def load_config(path='data/config.json'):
-    with open(path, 'r') as f:
-        cfg = json.load(f)
-    env_section = cfg.get("environment", {})
-    token_var = env_section.get("auth_token_env_var")
-    if token_var:
-        token = os.getenv(token_var)
-        if token:
-            env_section["auth_token"] = token
-    cfg["environment"] = env_section
-    return cfg
+# ------------------ PRE-SUITE HEALTH GATE ------------------ #
+def pytest_sessionstart(session):
+    # The automation logger doesn't propagate to root; pytest's capture handlers
+    # (caplog, captured-log report sections) are registered after pytest_configure
+    logging_plugin = session.config.pluginmanager.get_plugin("logging-plugin")
+    if logging_plugin is not None:
+        attach_handler(logging_plugin.caplog_handler)
+        attach_handler(logging_plugin.report_handler)
+
+    cfg = get_config()
+    gate_cfg = cfg.get("health_check", {})
+    if not (session.config.getoption("--health-check") or gate_cfg.get("enabled", False)):
+        return
+
+    check_names = gate_cfg.get("checks", ["web_app", "api"])
+    checks = build_health_checks(cfg, check_names, gate_cfg.get("timeout_seconds", 5))
+    # The xdist controller probes first; workers start within the TTL and reuse its results
+    results, from_cache = run_health_gate(
+        checks,
+        deadline_seconds=gate_cfg.get("deadline_seconds", 15),
+        cache_path=gate_cfg.get("cache_path", ".health_cache.json"),
+        ttl_seconds=gate_cfg.get("cache_ttl_seconds", 60),
+        # A result probed for another environment or other endpoints is never reused
+        cache_key=health_cache_key(cfg, check_names),
+    )
+    table = format_health_table(results)
+    if not all(result["ok"] for result in results.values()):
+        pytest.exit(f"[Health] Environment is down — aborting before running tests\n{table}", returncode=3)
+    if not hasattr(session.config, "workerinput"):
+        print(f"\n[Health] Environment checks{' (cached)' if from_cache else ''}:\n{table}")
 
 # ------------------ PARAMETRIZE TESTS ------------------ #
 def pytest_generate_tests(metafunc):
@@ -48,23 +171,166 @@ def pytest_generate_tests(metafunc):
     instances = int(metafunc.config.getoption("instances"))
     params = [(browser.strip(), i) for browser in browsers for i in range(instances)]
     if "browser_instance" in metafunc.fixturenames:
-        metafunc.parametrize("browser_instance", params)
+        # Ids like "chromium-0" name the browser slot the duration scheduler routes on
+        metafunc.parametrize("browser_instance", params, ids=[slot_id(*param) for param in params])
+
+# ------------------ DURATION-AWARE SCHEDULING ------------------ #
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    global duration_scheduler
+    sched_cfg = get_config().get("scheduler", {})
+    if config.getvalue("dist") != "load" or config.getoption("--no-duration-scheduling") or not sched_cfg.get("enabled", True):
+        return None  # Fall back to xdist's own scheduler
+    duration_scheduler = DurationScheduling(
+        config, log,
+        history=DurationHistory(sched_cfg.get("history_path", ".test_durations.json")),
+        ui_paths=sched_cfg.get("ui_paths", ["tests/ui/"]),
+        defaults={"ui": sched_cfg.get("default_ui_seconds", 30), "api": sched_cfg.get("default_api_seconds", 1)},
+        queue_depth=sched_cfg.get("queue_depth", 2),
+        slot_map_dir=slot_map_dir,
+    )
+    return duration_scheduler
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # The controller only receives node ids; workers save each test's browser slot here
+    global slot_map_dir
+    if slot_map_dir is None:
+        slot_map_dir = tempfile.mkdtemp(prefix="browser_slots_")
+    node.workerinput["slot_map_dir"] = slot_map_dir
+
+def pytest_collection_modifyitems(config, items):
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput and workerinput.get("slot_map_dir"):
+        # Written before this worker reports its collection, so it is ready when scheduling starts
+        save_slot_map(workerinput["slot_map_dir"], workerinput["workerid"], {item.nodeid: item_slot(item) for item in items})
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    # -n auto: one worker per browser slot, capped by what this machine can run
+    slots = len(config.getoption("browsers").split(",")) * int(config.getoption("instances"))
+    slots_cfg = get_config().get("browser_slots", {})
+    capacity = browser_capacity(
+        cpus_per_browser=slots_cfg.get("cpus_per_browser", 1),
+        memory_mb_per_browser=slots_cfg.get("memory_mb_per_browser", 600),
+        reserve_memory_mb=slots_cfg.get("reserve_memory_mb", 1024),
+        max_browsers=slots_cfg.get("max_browsers"),
+    )
+    workers = min(slots, capacity)
+    print(f"[Slots] {slots} browser slot(s), capacity {capacity} — starting {workers} worker(s)")
+    return workers
+
+def pytest_runtest_logreport(report):
+    # On the xdist controller this sees every worker's reports
+    if report.skipped:
+        skipped_tests.add(report.nodeid)
+    collect_run_result(report)
+    if attempt_of(report):
+        return  # Reruns are reported separately and would skew the history
+    measured_durations[report.nodeid] = measured_durations.get(report.nodeid, 0.0) + report.duration
+
+def attempt_of(report):
+    # 0 for the first run; set by the rerun plugin, or by pytest-rerunfailures as "rerun"
+    return getattr(report, "rerun_attempt", getattr(report, "rerun", 0))
+
+def record_durations():
+    sched_cfg = get_config().get("scheduler", {})
+    if not sched_cfg.get("enabled", True):
+        return
+    measured = {nodeid: seconds for nodeid, seconds in measured_durations.items() if nodeid not in skipped_tests}
+    try:
+        DurationHistory(sched_cfg.get("history_path", ".test_durations.json")).update(measured)
+    except Exception as e:
+        print(f"[WARN] Could not update test duration history: {e}")
+
+# ------------------ TREND DATABASE ------------------ #
+def collect_run_result(report):
+    result = run_results.setdefault(report.nodeid, {"nodeid": report.nodeid, "outcome": "passed", "duration": 0.0, "attempts": 1})
+    attempt = attempt_of(report)
+    result["attempts"] = max(result["attempts"], attempt + 1)
+    if not attempt:
+        result["duration"] += report.duration  # Duration of the first attempt only
+    node = getattr(report, "node", None)  # Set by xdist on the controller
+    result["worker"] = node.gateway.id if node is not None else "main"
+    if report.outcome == "rerun":
+        return  # A later attempt settles the outcome
+    if getattr(report, "quarantined", False):
+        result["outcome"] = "failed"  # Still a failure as far as history is concerned
+    elif report.skipped and result["outcome"] == "passed":
+        result["outcome"] = "skipped"
+    elif report.failed:
+        result["outcome"] = "failed" if report.when == "call" else "error"
+    elif report.when == "call":
+        result["outcome"] = "passed"  # A later attempt passed
+
+def record_trends(exitstatus):
+    trends_cfg = get_config().get("trends", {})
+    if not trends_cfg.get("enabled", True):
+        return None
+    # Only suite tests: unit-test runs (tests/utils) would skew durations and flake history
+    suite_paths = tuple(trends_cfg.get("suite_paths", ["tests/ui/", "tests/api/"]))
+    suite_results = [result for result in run_results.values() if result["nodeid"].startswith(suite_paths)]
+    if not suite_results:
+        return None
+    results = []
+    for result in suite_results:
+        slot = slot_of(result["nodeid"])
+        browser, instance = slot.rsplit("-", 1) if slot else (None, None)
+        results.append(dict(result, browser=browser, instance=int(instance) if instance else None))
+    run_started = datetime.datetime.strptime(RUN_TIMESTAMP, '%Y-%m-%d_%H-%M-%S').timestamp()
+    try:
+        with TrendDB(trends_cfg.get("path", "reports/trends.sqlite")) as db:
+            db.record_run(f"{RUN_TIMESTAMP}-{os.getpid()}", run_started, results, exit_status=int(exitstatus))
+            return {
+                "runs": db.run_count(),
+                "regressions": db.regressions(trends_cfg.get("regression_pct", 25), trends_cfg.get("baseline_runs", 5)),
+                "flaky": db.flake_rates(trends_cfg.get("flake_runs", 20)),
+            }
+    except Exception as e:
+        print(f"[WARN] Could not update the trend database: {e}")
+        return None
 
 # ------------------ SUITE STARTUP ------------------ #
 @pytest.fixture(scope="session", autouse=True)
 def before_suite(request):
-    global playwright, config
-    config = load_config(request.config.getoption("--config"))
+    global playwright, config, browser_pool, artifact_store, trace_store
+    config = get_config()
     print("\n[Setup] Starting Playwright...")
     playwright = sync_playwright().start()
+    browser_pool = BrowserPool(playwright, max_uses=config.get("browser_pool", {}).get("max_uses", 50))
+    api_utils.configure_default_client(base_url=config["environment"].get("api_url") or None, **config.get("api", {}))
+    api_utils.configure_schema_registry(config.get("paths", {}).get("schema_dir", "schemas/"))
+    artifact_store = create_artifact_store(config.get("artifacts", {}))
+    tracing_cfg = config.get("tracing", {})
+    trace_store = TraceStore(tracing_cfg.get("dir", "traces"), max_bytes=int(tracing_cfg.get("max_store_mb", 500) * 1024 ** 2))
     yield
-    print("\n[Teardown] Stopping Playwright...")
+    api_utils.get_default_client().close()
+    artifact_store.close()
+    if artifact_store.bytes_written or artifact_store.skipped:
+        stats = artifact_store.stats()
+        print(f"\n[Artifacts] {stats['bytes_written'] / 1024 ** 2:.1f} MB written, "
+              f"{stats['deduplicated']} duplicate(s) stored once, {stats['skipped']} capture(s) skipped over budget")
+    print(f"\n[Teardown] Closing browser pool ({browser_pool.launches} launches)...")
+    browser_pool.close_all()
+    print("[Teardown] Stopping Playwright...")
     playwright.stop()
 
-# ------------------ PAGE FIXTURE ------------------ #
-@pytest.fixture
-def page(browser_instance):
-    browser_name, _ = browser_instance
+def create_artifact_store(artifacts_cfg):
+    # The run budget is split evenly between xdist workers
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    max_run_mb = artifacts_cfg.get("max_run_mb")
+    return ArtifactStore(
+        SCREENSHOT_DIR,
+        max_bytes=int(max_run_mb * 1024 ** 2 / workers) if max_run_mb else None,
+        image_format=artifacts_cfg.get("image_format", "webp"),
+        quality=artifacts_cfg.get("quality", 75),
+        full_page=artifacts_cfg.get("full_page", False),
+        capture_dom=artifacts_cfg.get("capture_dom", True),
+        workers=artifacts_cfg.get("encoder_threads", 2),
+    )
+
+# ------------------ BROWSER LAUNCH OPTIONS ------------------ #
+def get_launch_options():
     default_headless = config.get("headless", True)
     mcp_enabled = config.get("enable_mcp", False)
     proxy_config = {"server": config.get("mcp_proxy", "http://localhost:3000")} if mcp_enabled else None
@@ -82,57 +348,412 @@ def page(browser_instance):
     }
     if proxy_config:
         launch_options["proxy"] = proxy_config
+    return launch_options
+
+# ------------------ AUTHENTICATED STATE ------------------ #
+def auth_login(user_key):
+    def login(page):
+        page.goto(config["environment"]["base_url"])
+        username, password = LoginPage.get_login_credentials(user_key)
+        LoginPage(page).login(username, password)
+    return login
+
+
+def auth_cache_options():
+    auth_cfg = config.get("auth_cache", {})
+    return {
+        "env": config["environment"].get("env", "default"),
+        "cache_dir": auth_cfg.get("dir", ".auth"),
+    }
+
+
+def get_auth_storage_state(browser, user_key):
+    return get_storage_state(
+        browser,
+        user=user_key,
+        login_fn=auth_login(user_key),
+        ttl_seconds=config.get("auth_cache", {}).get("ttl_minutes", 30) * 60,
+        context_options=CONTEXT_OPTIONS,
+        **auth_cache_options(),
+    )
+
+
+def ensure_logged_in(context, page, user_key):
+    """
+    A cached session can be revoked server-side before its cookies expire. The
+    app then redirects to the login form; log in again and refresh the cache.
+    """
+    page.wait_for_selector(f"{LoginLocators.PROFILE_ICON}, {LoginLocators.USERNAME_INPUT}")
+    if page.is_visible(LoginLocators.USERNAME_INPUT):
+        refresh_storage_state(context, page, user=user_key, login_fn=auth_login(user_key), **auth_cache_options())
+
+# ------------------ PAGE FIXTURE ------------------ #
+@pytest.fixture
+def page(request, browser_instance):
+    har = HarSession(request.config.getoption("--har-mode"), request.config.getoption("--har-dir"), request.node.nodeid)
+    if har.mode == "replay" and not har.has_recording:
+        pytest.skip(f"No HAR recorded at {har.path} — run with --har-mode=record first")
+
+    # Browsers are pooled per worker; every test still gets its own context
+    browser = browser_pool.acquire(browser_instance, get_launch_options())
+    context_options = dict(CONTEXT_OPTIONS, **har.context_options())
+
+    # Until the test starts, a failed step must hand the context and browser back itself
+    context = None
+    try:
+        # @pytest.mark.auth_user("valid_user") seeds the context with a cached login
+        auth_marker = request.node.get_closest_marker("auth_user")
+        if auth_marker:
+            user_key = auth_marker.args[0] if auth_marker.args else "valid_user"
+            context_options["storage_state"] = get_auth_storage_state(browser, user_key)
+
+        context = browser.new_context(**context_options)
+        # @pytest.mark.network_routing turns routing on for one test when it is off in config.json
+        network_cfg = config.get("network", {})
+        if request.node.get_closest_marker("network_routing"):
+            network_cfg = dict(network_cfg, enabled=True)
+        router = NetworkRouter(network_cfg)
+        # Route order matters: handlers registered last are tried first
+        har.install_unmatched_catcher(context)
+        router.install(context)
+        har.install_replay(context)
+        # Started before goto so the trace covers the whole test
+        tracing_cfg = config.get("tracing", {})
+        trace = TraceSession(
+            request.config.getoption("--trace-mode") or tracing_cfg.get("mode", "off"),
+            trace_store,
+            request.node.nodeid,
+            execution_count=getattr(request.node, "execution_count", 1),
+            screenshots=tracing_cfg.get("screenshots", True),
+            snapshots=tracing_cfg.get("snapshots", True),
+            sources=tracing_cfg.get("sources", False),
+        )
+        trace.start(context)
+        page = context.new_page()
+        request.node.console_recorder = ConsoleRecorder(page, config.get("artifacts", {}).get("console_max_entries", 500))
+        with timed("goto", selector=config["environment"]["base_url"], page_object="page") as goto_timer:
+            page.goto(config["environment"]["base_url"])
+        page_load_ms = round(goto_timer.duration_ms)
+        if auth_marker:
+            ensure_logged_in(context, page, user_key)
+    except BaseException:
+        crashed = False
+        if context is not None:
+            try:
+                context.close()
+            except Exception as e:
+                print(f"[WARN] Context cleanup after failed setup failed, recycling browser: {e}")
+                crashed = True
+        browser_pool.release(browser_instance, crashed=crashed)
+        raise
+
+    # Protocol round-trips made by the test body itself (fixture setup/teardown excluded)
+    round_trips = round_trip_counter()
+    with round_trips or contextlib.nullcontext():
+        yield page
+    if round_trips is not None:
+        request.node.user_properties.append(("playwright_round_trips", round_trips.total))
+        allure.attach(json.dumps(round_trips.summary(), indent=2), name="playwright-round-trips", attachment_type=allure.attachment_type.JSON)
+        print(f"\n[Playwright] {round_trips.total} protocol round-trips")
+
+    if router.enabled:
+        network_stats = dict(router.stats, page_load_ms=page_load_ms)
+        allure.attach(json.dumps(network_stats, indent=2), name="network-routing", attachment_type=allure.attachment_type.JSON)
+        print(f"\n[Network] Blocked {network_stats['blocked']}, stubbed {network_stats['stubbed']}, "
+              f"~{network_stats['bytes_saved_estimate']} bytes saved, page load {page_load_ms} ms")
+
+    if har.unmatched:
+        har_unmatched[request.node.nodeid] = har.unmatched
+        allure.attach("\n".join(har.unmatched), name="har-unmatched-requests", attachment_type=allure.attachment_type.TEXT)
+        print(f"\n[HAR] {len(har.unmatched)} request(s) not found in {har.path}")
+
+    try:
+        stop_tracing(trace, context, request.node)
+    except Exception as e:
+        print(f"[WARN] Stopping the trace failed: {e}")
+
+    crashed = False
+    try:
+        page.close()
+        context.close()  # Also flushes the HAR in record mode
+    except Exception as e:
+        print(f"[WARN] Context teardown failed, recycling browser: {e}")
+        crashed = True
+    browser_pool.release(browser_instance, crashed=crashed)
+
+    # Encoding ran in the background while the context closed; attach once done
+    pending = getattr(request.node, "failure_artifacts", None)
+    if pending is not None:
+        attach_failure_artifacts(pending)
+
+def round_trip_counter():
+    """
+    Returns a RoundTripCounter, or None when this Playwright version can't be
+    hooked. Counting is diagnostics only, so that warns once and tests still run.
+    """
+    global round_trips_unavailable
+    if round_trips_unavailable:
+        return None
+    try:
+        RoundTripCounter.install()
+    except RuntimeError as e:
+        round_trips_unavailable = True
+        warnings.warn(f"Playwright round-trip counting disabled: {e}", RuntimeWarning)
+        return None
+    return RoundTripCounter()
+
+def stop_tracing(trace, context, item):
+    if not trace.enabled:
+        return
+    reports = [getattr(item, f"rep_{when}", None) for when in ("setup", "call")]
+    failed = any(report is not None and (report.failed or report.outcome == "rerun") for report in reports)
+    path = trace.stop(context, failed)
+    tracing_stats["traced"] += 1
+    tracing_stats["overhead_ms"].append(round(trace.overhead_ms, 1))
+    item.user_properties.append(("trace_overhead_ms", round(trace.overhead_ms, 1)))
+    if path:
+        tracing_stats["kept"] += 1
+        allure.attach.file(path, name="playwright-trace", extension="zip")
+        trace_store.touch(path)
+        print(f"\n[Trace] Saved: {path} (open with: playwright show-trace {path})")
+
+def attach_failure_artifacts(pending):
+    paths = pending.wait(timeout=60)
+    artifact_store.record(pending.nodeid, paths)
+    if paths.get("screenshot"):
+        extension = paths["screenshot"].rsplit(".", 1)[-1]
+        allure.attach.file(paths["screenshot"], name="failure-screenshot", extension=extension)
+        print(f"\n[Screenshot] Saved: {paths['screenshot']}")
+    if paths.get("dom"):
+        allure.attach.file(paths["dom"], name="failure-dom", extension="html.gz")
+    if paths.get("console"):
+        allure.attach.file(paths["console"], name="console-log", attachment_type=allure.attachment_type.TEXT)
+
+# ------------------ BLANK PAGE (NO APP) ------------------ #
+@pytest.fixture
+def blank_page():
+    """
+    A real page on about:blank from a pooled headless chromium, for tests of
+    page helpers that need a browser but not the application under test.
+    """
+    # Its own pool key: the test slots' chromium may be headed
+    pool_key = ("chromium", "blank")
+    try:
+        browser = browser_pool.acquire(pool_key, dict(get_launch_options(), headless=True))
+    except Exception as e:
+        pytest.skip(f"Chromium could not be launched: {e}")
+    crashed = False
+    context = None
+    try:
+        context = browser.new_context()
+        yield context.new_page()
+    finally:
+        try:
+            if context is not None:
+                context.close()
+        except Exception as e:
+            print(f"[WARN] Closing the blank page context failed, recycling browser: {e}")
+            crashed = True
+        browser_pool.release(pool_key, crashed=crashed)
+
+# ------------------ LOGGING CONTEXT ------------------ #
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    callspec = getattr(item, "callspec", None)
+    browser_instance = callspec.params.get("browser_instance") if callspec else None
+    set_test_context(item.nodeid, slot_id(*browser_instance) if browser_instance else None)
 
-    browser = getattr(playwright, browser_name).launch(**launch_options)
-    context = browser.new_context(accept_downloads=True, viewport={"width": 1920, "height": 1080})
-    page = context.new_page()
-    page.goto(config["environment"]["base_url"])
+def pytest_runtest_logfinish(nodeid, location):
+    set_test_context()
 
-    yield page
+# ------------------ ACTION TIMING ------------------ #
+@pytest.fixture(autouse=True)
+def action_timing(request):
+    # Autouse, so it wraps the page fixture's goto as well as the test body
+    profiler = get_profiler()
+    if not profiler.enabled:
+        yield
+        return
+    profiler.start_test(request.node.nodeid)
+    yield
+    profile = profiler.finish_test()
+    if profile and profile["actions"]:
+        allure.attach(json.dumps(profile, indent=2), name="action-timings", attachment_type=allure.attachment_type.JSON)
 
-    page.close()
-    context.close()
-    browser.close()
+def write_timing_reports():
+    profiler = get_profiler()
+    if not profiler.actions:
+        return None
+    out_dir = os.path.join(get_config().get("timing", {}).get("dir", "reports/timing"), RUN_TIMESTAMP)
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "session_profile.json"), "w") as f:
+        json.dump({"slowest": profiler.slowest(n=len(profiler.actions))}, f, indent=2)
+    with open(os.path.join(out_dir, "session.folded"), "w") as f:
+        f.write(profiler.folded_text())
+    return out_dir
 
 # ------------------ API SESSION FIXTURE ------------------ #
 @pytest.fixture
 def api_session():
-    session = requests.Session()
     headers = {"Content-Type": "application/json"}
     token = config.get("environment", {}).get("auth_token")
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    session.headers.update(headers)
-    return session
+    # Shares the keep-alive connection pool with api_utils.send_request
+    return api_utils.get_default_client().new_session(headers)
 
-# ------------------ SCREENSHOT ON FAILURE ------------------ #
+# ------------------ FAILURE ARTIFACTS ------------------ #
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
+    # rep_setup / rep_call let fixture teardown see how the test went
+    setattr(item, f"rep_{report.when}", report)
 
-    # Only act after the test "call" phase and if it failed
-    if report.when == "call" and report.failed:
+    # Only act after the test "call" phase and if it failed (including attempts that will be rerun)
+    if report.when == "call" and (report.failed or report.outcome == "rerun"):
         # Try to get the Playwright page object (may not exist for API tests)
         page = item.funcargs.get("page", None)
 
-        if page and hasattr(page, "screenshot"):
-            try:
-                test_name = re.sub(r'[^a-zA-Z0-9_]+', '_', item.name)
-                screenshot_path = os.path.join(SCREENSHOT_DIR, f"{test_name}.png")
-                page.screenshot(path=screenshot_path, full_page=True)
-                print(f"\n[Screenshot] Saved: {screenshot_path}")
-            except Exception as e:
-                print(f"[WARN] Screenshot capture failed: {e}")
+        if page and hasattr(page, "screenshot") and artifact_store is not None:
+            # Only the capture happens here; encoding and writing run in the background
+            console = getattr(item, "console_recorder", None)
+            item.failure_artifacts = artifact_store.capture(page, item.nodeid, console.text() if console else None)
         else:
             print(f"[INFO] No Playwright page object — skipping screenshot for: {item.name}")
+# ------------------ XDIST WORKER RESULTS ------------------ #
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # Runs on the xdist controller with whatever each worker put in workeroutput
+    worker_output = getattr(node, "workeroutput", {})
+    if "cassette_stats" in worker_output:
+        cassette_worker_stats.append(worker_output["cassette_stats"])
+    if "timing_profile" in worker_output:
+        get_profiler().merge(worker_output["timing_profile"])
+    if "tracing_stats" in worker_output:
+        for key in ("traced", "kept", "overhead_ms"):
+            tracing_stats[key] += worker_output["tracing_stats"][key]
+    if "har_unmatched" in worker_output:
+        har_unmatched.update(worker_output["har_unmatched"])
+
+# ------------------ TERMINAL SUMMARY ------------------ #
+def pytest_terminal_summary(terminalreporter):
+    cassette = api_utils.get_cassette()
+    if cassette.enabled:
+        totals = cassette.stats()
+        for stats in cassette_worker_stats:
+            for key, value in stats.items():
+                totals[key] += value
+        terminalreporter.section(f"API cassette ({cassette.mode})")
+        terminalreporter.write_line(f"hits: {totals['hits']}, misses: {totals['misses']}, recorded: {totals['recorded']}")
+
+    profiler = get_profiler()
+    if profiler.actions and not hasattr(terminalreporter.config, "workerinput"):
+        terminalreporter.section("Slowest actions (total time)")
+        for totals in profiler.slowest(n=get_config().get("timing", {}).get("top_n", 10)):
+            name = f"{totals['page_object']}.{totals['action']}" if totals["page_object"] else totals["action"]
+            target = f" {totals['selector']}" if totals["selector"] else ""
+            terminalreporter.write_line(f"{totals['total_ms']:>10.0f} ms  x{totals['count']:<4} max {totals['max_ms']:>7.0f} ms  {name}{target}")
+
+    if duration_scheduler is not None and duration_scheduler.predicted_makespan is not None:
+        summary = duration_scheduler.summary()
+        actual = f"{summary['actual_makespan']:.1f} s" if summary["actual_makespan"] is not None else "n/a"
+        terminalreporter.section("Duration-aware scheduling")
+        terminalreporter.write_line(f"predicted makespan: {summary['predicted_makespan']:.1f} s, actual: {actual}")
+        for worker, stats in sorted(summary["workers"].items()):
+            terminalreporter.write_line(f"    {worker}: {stats['serves']}, busy {stats['busy_seconds']:.1f} s")
+
+    if tracing_stats["traced"] and not hasattr(terminalreporter.config, "workerinput"):
+        overheads = sorted(tracing_stats["overhead_ms"])
+        mode = terminalreporter.config.getoption("--trace-mode") or get_config().get("tracing", {}).get("mode", "off")
+        terminalreporter.section(f"Playwright tracing ({mode})")
+        terminalreporter.write_line(
+            f"traced: {tracing_stats['traced']}, kept: {tracing_stats['kept']}, "
+            f"overhead per test: median {statistics.median(overheads):.0f} ms, max {overheads[-1]:.0f} ms, "
+            f"total {sum(overheads) / 1000:.1f} s")
+        if trace_store is not None:
+            terminalreporter.write_line(f"store: {trace_store.total_bytes() / 1024 ** 2:.1f} MB in {trace_store.trace_dir}/")
+
+    if trend_report and (trend_report["regressions"] or trend_report["flaky"]):
+        top_n = get_config().get("trends", {}).get("top_n", 5)
+        terminalreporter.section(f"Trends (over {trend_report['runs']} recorded runs)")
+        for row in trend_report["regressions"][:top_n]:
+            terminalreporter.write_line(f"slower {row['change_pct']:+.0f}%: {row['baseline_seconds']:.1f} s -> {row['seconds']:.1f} s  {row['nodeid']}")
+        for row in trend_report["flaky"][:top_n]:
+            terminalreporter.write_line(f"flaky {row['flake_rate'] * 100:.0f}% ({row['flaky_runs']}/{row['runs']} runs)  {row['nodeid']}")
+
+    if har_unmatched:
+        terminalreporter.section("HAR replay: unmatched requests (stale recordings?)")
+        for nodeid, requests_missed in har_unmatched.items():
+            terminalreporter.write_line(f"{nodeid}: {len(requests_missed)} unmatched")
+            for entry in requests_missed:
+                terminalreporter.write_line(f"    {entry}")
+
+def finish_logging():
+    logging_cfg = get_config().get("logging", {})
+    if not logging_cfg.get("merge_on_finish", True):
+        return
+    run_dir = log_dir(logging_cfg.get("dir", "logs"))
+    if os.path.isdir(run_dir):
+        count = merge_logs(run_dir)
+        print(f"\n[Logs] Merged {count} entries into {os.path.join(run_dir, 'merged.jsonl')}")
+
+# ------------------ RUN SUMMARY ------------------ #
+def build_run_summary(pytest_config):
+    allure_cfg = get_config().get("allure", {})
+    results_dir = pytest_config.getoption("allure_report_dir", None) or allure_cfg.get("results_dir", "allure-results")
+    run_started = datetime.datetime.strptime(RUN_TIMESTAMP, '%Y-%m-%d_%H-%M-%S').timestamp()
+    # Read natively from this run's result files; no allure CLI or JVM needed
+    summary = summarize_results(
+        results_dir,
+        since=run_started,
+        processes=allure_cfg.get("processes"),
+        parallel_threshold=allure_cfg.get("parallel_threshold", 2000),
+    )
+    if not summary["total"]:
+        print(f"\n[Post-Suite] No Allure results from this run in {results_dir}/")
+        return summary
+    summary_path = write_summary(summary, os.path.join(allure_cfg.get("summary_dir", "reports/summary"), f"{RUN_TIMESTAMP}.json"))
+    print(f"\n[Post-Suite] {summary['total']} tests: {summary['passed']} passed, {summary['failed']} failed, "
+          f"{summary['broken']} broken, {summary['skipped']} skipped in {summary['duration']} — {summary_path}")
+
+    summary["report_path"] = None
+    if allure_cfg.get("html", True):
+        # The CLI runs on after pytest exits unless html_wait_seconds is set
+        job = start_allure_report(results_dir, allure_cfg.get("html_dir", "reports/allure-report/"))
+        if job:
+            summary["report_path"] = job.output_dir
+            if allure_cfg.get("html_wait_seconds"):
+                job.wait(timeout=allure_cfg["html_wait_seconds"])
+    return summary
+
 # ------------------ POST-SUITE ACTIONS ------------------ #
 def pytest_sessionfinish(session, exitstatus):
-    print("\n[Post-Suite] Generating Allure report...")
-    generate_allure_report()
-    summary = parse_allure_summary()
-    overall_status = "Fail" if summary.get("failed", 0) > 0 else "Pass"
+    global trend_report
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["cassette_stats"] = api_utils.get_cassette().stats()
+        session.config.workeroutput["timing_profile"] = get_profiler().session_profile()
+        session.config.workeroutput["tracing_stats"] = tracing_stats
+        session.config.workeroutput["har_unmatched"] = har_unmatched
+        # Flush this worker's log before the controller merges
+        stop_logging()
+        return
+    # Flush the controller's own main.jsonl too before merging
+    stop_logging()
+    finish_logging()
+    record_durations()
+    trend_report = record_trends(exitstatus)
+    timing_dir = write_timing_reports()
+    if timing_dir:
+        print(f"\n[Timing] Session profile and flame graph stacks written to {timing_dir}")
+    finish_cleanup()
+    if slot_map_dir:
+        shutil.rmtree(slot_map_dir, ignore_errors=True)
+
+    # Controller only: workers' results are all in allure-results by now
+    summary = build_run_summary(session.config)
+    overall_status = "Fail" if summary.get("failed", 0) or summary.get("broken", 0) else "Pass"
 
     # Uncomment to enable notifications
     # send_email_from_config(allure_summary=summary, overall_status=overall_status)
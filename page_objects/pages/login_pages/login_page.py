@@ -1,7 +1,8 @@
 from page_objects.locators.login_locators.login_locators import LoginLocators
 from utils.script_utils import ScriptUtils
 from utils.logger_utils import get_logger 
-from utils.config_reader import read_json_config
+from utils.config_reader import get_config
+from utils.timing import timed
 
 logger = get_logger()
 
@@ -10,6 +11,7 @@ class LoginPage:
         self.page = page
         logger.debug("LoginPage initialized")
 
+    @timed("login", page_object="LoginPage")
     def login(self, username, password):
         try:
             logger.info("Starting login process")
@@ -31,15 +33,32 @@ class LoginPage:
             logger.exception(f"Login failed: {str(e)}")
             raise
 
+    def get_form_state(self):
+        """
+        Reads the whole login form (values, visibility, disabled flags) in one round-trip.
+        """
+        return ScriptUtils.snapshot(self.page, {
+            "username": LoginLocators.USERNAME_INPUT,
+            "password": LoginLocators.PASSWORD_INPUT,
+            "login_button": {"selector": LoginLocators.LOGIN_BUTTON, "attributes": ["disabled"]},
+        })
+
     @staticmethod
     def get_valid_login_credentials():
         """
         Loads valid login credentials from JSON config and returns them as a tuple.
         """
+        return LoginPage.get_login_credentials("valid_user")
+
+    @staticmethod
+    def get_login_credentials(user_key):
+        """
+        Loads the credential set `user_key` from 'testdata/login_data.json' and returns it as a tuple.
+        """
         try:
-            logger.debug("Reading login data from 'testdata/login_data.json'")
-            data = read_json_config("testdata/login_data.json")
-            login_data = data["valid_user"]
+            logger.debug(f"Reading login data '{user_key}' from 'testdata/login_data.json'")
+            data = get_config("testdata/login_data.json")
+            login_data = data[user_key]
             username = login_data["username"]
             password = login_data["password"]
             logger.debug("Successfully loaded login credentials")
@@ -9,6 +9,7 @@ from utils.api_utils import (
     validate_json_schema,
     assert_response_time
 )
+from utils.async_api_utils import gather_requests
 
 BASE_URL = "https://reqres.in/api"
 
@@ -118,3 +119,13 @@ def test_parametrized_user_pages(auth_header, page):
     response = send_request("GET", f"{BASE_URL}/users?page={page}", headers=auth_header)
     assert_status_code(response, 200)
     assert "data" in response.json()
+
+
+def test_bulk_user_pages(auth_header):
+    # Fans out all page checks concurrently instead of one send_request at a time
+    specs = [{"url": f"{BASE_URL}/users", "params": {"page": page}, "headers": auth_header} for page in range(1, 13)]
+    responses = gather_requests(specs, concurrency=6)
+    for response in responses:
+        assert_status_code(response, 200)
+        assert_json_contains_keys(response, ["page", "data"])
+        assert_response_time(response, threshold_seconds=2)
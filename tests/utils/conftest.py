@@ -0,0 +1,10 @@
+import pytest
+
+from utils.stub_server import StubServer
+
+
+@pytest.fixture
+def local_server():
+    routes = {"/users": {"status": 200, "body": {"page": 1, "data": []}}}
+    with StubServer(routes) as server:
+        yield server
@@ -0,0 +1,61 @@
+import json
+import os
+
+from utils.allure_report import summarize_results
+
+
+def write_result(results_dir, name, status, start, stop, history_id=None, suite="test_login"):
+    result = {
+        "name": name, "fullName": f"tests.ui.{suite}#{name}", "historyId": history_id or name,
+        "status": status, "start": start, "stop": stop,
+        "labels": [{"name": "suite", "value": suite}, {"name": "framework", "value": "pytest"}],
+    }
+    path = results_dir / f"{name}-{start}-result.json"
+    path.write_text(json.dumps(result))
+    return path
+
+
+def test_summary_counts_statuses_suites_and_durations(tmp_path):
+    write_result(tmp_path, "test_ok", "passed", 1000, 3000)
+    write_result(tmp_path, "test_bad", "failed", 1500, 2500)
+    write_result(tmp_path, "test_api", "broken", 2000, 6000, suite="test_users")
+    (tmp_path / "abc-container.json").write_text("{}")
+    (tmp_path / "torn-result.json").write_text('{"status": "pass')
+
+    summary = summarize_results(str(tmp_path), processes=0)
+
+    assert (summary["total"], summary["passed"], summary["failed"], summary["broken"]) == (3, 1, 1, 1)
+    assert summary["duration_ms"] == 5000 and summary["duration"] == "0:00:05"
+    assert summary["test_time_ms"] == 7000
+    assert summary["suites"]["test_login"]["total"] == 2
+    assert summary["slowest"][0]["name"] == "tests.ui.test_users#test_api"
+
+
+def test_reruns_count_once_with_latest_status(tmp_path):
+    write_result(tmp_path, "test_flaky", "failed", 1000, 2000, history_id="h1")
+    write_result(tmp_path, "test_flaky", "passed", 3000, 4000, history_id="h1")
+
+    summary = summarize_results(str(tmp_path), processes=0)
+
+    assert (summary["total"], summary["passed"], summary["failed"], summary["retries"]) == (1, 1, 0, 1)
+
+
+def test_results_from_earlier_runs_are_skipped(tmp_path):
+    old = write_result(tmp_path, "test_old", "failed", 1000, 2000)
+    os.utime(old, (100, 100))
+    write_result(tmp_path, "test_new", "passed", 5000, 6000)
+
+    summary = summarize_results(str(tmp_path), since=1000, processes=0)
+
+    assert (summary["total"], summary["failed"]) == (1, 0)
+
+
+def test_process_pool_gives_the_same_summary(tmp_path):
+    for i in range(30):
+        write_result(tmp_path, f"test_{i}", "passed" if i % 3 else "failed", i * 100, i * 100 + 50)
+
+    serial = summarize_results(str(tmp_path), processes=0)
+    pooled = summarize_results(str(tmp_path), processes=2, parallel_threshold=5, chunk_size=4)
+
+    assert pooled == serial
+    assert summarize_results(str(tmp_path / "missing"))["total"] == 0
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+
+import pytest
+import requests
+
+from utils import api_utils
+from utils.api_utils import ApiClient, validate_json_schema
+from utils.config_reader import FrozenConfig
+from utils.schema_registry import SchemaRegistry
+
+
+def test_relative_urls_join_base_url():
+    client = ApiClient(base_url="https://reqres.in/api")
+    assert client.build_url("/users?page=2") == "https://reqres.in/api/users?page=2"
+    assert client.build_url("https://httpbin.org/get") == "https://httpbin.org/get"
+
+
+def test_sessions_are_per_host_and_share_one_pool():
+    client = ApiClient()
+    first = client.session_for("https://reqres.in/api/users")
+    assert client.session_for("https://reqres.in/api/users/2") is first
+    other = client.session_for("https://httpbin.org/get")
+    assert other is not first
+    assert first.get_adapter("https://reqres.in") is other.get_adapter("https://httpbin.org") is client.adapter
+
+
+def test_connections_are_kept_alive(local_server):
+    client = ApiClient(base_url=local_server.url, default_headers={"X-Test": "1"})
+    for page in range(5):
+        response = client.request("GET", f"/users?page={page}")
+        assert response.status_code == 200
+    assert len(local_server.client_ports) == 1
+    client.close()
+
+
+def make_json_response(payload):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+USER_SCHEMA = {
+    "type": "object",
+    "properties": {"id": {"type": "integer"}, "email": {"type": "string"}},
+    "required": ["id", "email"],
+}
+
+
+def test_schema_validator_compiled_once_for_dict_and_path(tmp_path, monkeypatch):
+    schema_file = tmp_path / "user.json"
+    schema_file.write_text(json.dumps(USER_SCHEMA))
+    registry = SchemaRegistry(str(tmp_path))
+    monkeypatch.setattr(api_utils, "_schema_registry", registry)
+
+    assert registry.get_validator(dict(USER_SCHEMA)) is registry.get_validator(dict(USER_SCHEMA))
+    first = registry.get_validator("user.json")
+    assert registry.get_validator(str(schema_file)) is first
+
+    validate_json_schema(make_json_response({"id": 1, "email": "a@b.c"}), "user.json")
+    validate_json_schema(make_json_response({"id": 1, "email": "a@b.c"}), USER_SCHEMA)
+
+
+def test_same_schema_object_is_not_reserialised(monkeypatch):
+    registry = SchemaRegistry()
+    schema = dict(USER_SCHEMA)
+    first = registry.get_validator(schema)
+    dumps = []
+    monkeypatch.setattr("utils.schema_registry.json.dumps", lambda *args, **kwargs: dumps.append(args))
+
+    for _ in range(100):
+        assert registry.get_validator(schema) is first
+    assert dumps == []
+
+
+def test_frozen_config_schema_is_accepted():
+    registry = SchemaRegistry()
+    frozen = FrozenConfig(USER_SCHEMA)
+
+    validator = registry.get_validator(frozen)
+
+    assert validator is registry.get_validator(dict(USER_SCHEMA))
+    assert validator.is_valid({"id": 1, "email": "a@b.c"})
+    assert not validator.is_valid({"id": "1"})
+
+
+def test_schema_file_change_invalidates_validator(tmp_path):
+    schema_file = tmp_path / "user.json"
+    schema_file.write_text(json.dumps(USER_SCHEMA))
+    registry = SchemaRegistry(str(tmp_path))
+    first = registry.get_validator("user.json")
+
+    schema_file.write_text(json.dumps(dict(USER_SCHEMA, required=["id"])))
+    os.utime(schema_file, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    assert registry.get_validator("user.json") is not first
+
+
+def test_all_schema_errors_reported_together():
+    with pytest.raises(AssertionError) as excinfo:
+        validate_json_schema(make_json_response({"id": "x"}), USER_SCHEMA)
+    message = str(excinfo.value)
+    assert "2 error(s)" in message
+    assert "id: 'x' is not of type 'integer'" in message
+    assert "'email' is a required property" in message
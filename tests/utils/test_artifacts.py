@@ -0,0 +1,90 @@
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+from utils.artifacts import ArtifactStore, encode_image
+
+
+class FakePage:
+    def __init__(self, png, html="<html><body>failed</body></html>"):
+        self.png = png
+        self.html = html
+        self.screenshot_calls = 0
+
+    def screenshot(self, full_page=False):
+        self.screenshot_calls += 1
+        return self.png
+
+    def content(self):
+        return self.html
+
+
+def test_identical_artifacts_are_stored_once(tmp_path, monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    store = ArtifactStore(str(tmp_path), image_format="png")
+    first = store.capture(FakePage(b"same-pixels"), "test_a", "[error] boom").wait()
+    second = store.capture(FakePage(b"same-pixels"), "test_b", "[error] boom").wait()
+    store.record("test_a", first)
+    store.close()
+
+    assert first == second
+    assert store.deduplicated == 3  # screenshot, DOM and console log
+    with gzip.open(first["dom"], "rt") as f:
+        assert "failed" in f.read()
+    objects = [name for _, _, files in os.walk(tmp_path / "objects") for name in files]
+    assert len(objects) == 3
+    manifest = json.loads((tmp_path / "manifest-main.jsonl").read_text())
+    assert manifest["nodeid"] == "test_a" and manifest["screenshot"] == first["screenshot"]
+
+
+def test_budget_skips_screenshots_but_keeps_console_log(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=10, image_format="png", capture_dom=False)
+    store.capture(FakePage(b"x" * 100), "test_a").wait()
+    page = FakePage(b"y" * 100)
+    paths = store.capture(page, "test_b", "[log] still saved").wait()
+    store.close()
+
+    assert page.screenshot_calls == 0
+    assert list(paths) == ["console"] and store.skipped == 1
+
+
+def screenshot_png():
+    image_module = pytest.importorskip("PIL.Image")
+    image = image_module.effect_mandelbrot((640, 360), (-2.0, -1.0, 1.0, 1.0), 100).convert("RGB")
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue(), image_module
+
+
+@pytest.mark.parametrize("image_format, extension, pil_format", [("webp", "webp", "WEBP"), ("jpeg", "jpg", "JPEG")])
+def test_screenshots_are_reencoded_smaller(image_format, extension, pil_format):
+    png, image_module = screenshot_png()
+
+    data, stored_extension = encode_image(png, image_format, quality=75)
+
+    assert stored_extension == extension
+    assert len(data) < len(png)
+    assert image_module.open(io.BytesIO(data)).format == pil_format
+
+
+def test_png_format_is_stored_unchanged():
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+    assert encode_image(png, "png") == (png, "png")
+
+
+def test_unknown_image_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="gif"):
+        ArtifactStore(str(tmp_path), image_format="gif")
+
+
+def test_screenshot_falls_back_to_png_when_encoding_fails(tmp_path):
+    store = ArtifactStore(str(tmp_path), image_format="webp", capture_dom=False)
+    paths = store.capture(FakePage(b"not-a-png"), "test_a").wait()
+    store.close()
+
+    assert paths["screenshot"].endswith(".png")
+    with open(paths["screenshot"], "rb") as f:
+        assert f.read() == b"not-a-png"
@@ -0,0 +1,28 @@
+from utils.async_api_utils import (
+    assert_json_contains_keys,
+    assert_response_time,
+    assert_status_code,
+    gather_requests,
+)
+
+
+def test_gather_returns_responses_in_input_order(local_server):
+    local_server.add_route("/echo")
+    specs = [{"url": f"/echo?page={page}"} for page in range(50)]
+    responses = gather_requests(specs, concurrency=8, base_url=local_server.url)
+
+    assert [r.json()["path"] for r in responses] == [f"/echo?page={page}" for page in range(50)]
+    for response in responses:
+        assert_status_code(response, 200)
+        assert_json_contains_keys(response, ["path"])
+        assert_response_time(response, threshold_seconds=5)
+    assert responses[0].headers["content-type"] == "application/json"
+
+
+def test_in_flight_requests_never_exceed_concurrency(local_server):
+    local_server.add_route("/slow", delay_ms=50)
+    responses = gather_requests([{"url": "/slow"}] * 24, concurrency=4, base_url=local_server.url)
+
+    assert len(responses) == 24 and local_server.request_count == 24
+    # With 50 ms per request the cap is actually reached, not just respected
+    assert local_server.peak_in_flight == 4
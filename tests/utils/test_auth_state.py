@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import time
+
+from utils.auth_state import get_storage_state, is_storage_state_valid, refresh_storage_state, storage_state_path
+
+
+def write_state(path, cookies):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"cookies": cookies, "origins": []}, f)
+
+
+def test_state_valid_with_session_cookie(tmp_path):
+    path = str(tmp_path / "qa" / "valid_user.json")
+    write_state(path, [{"name": "orangehrm", "value": "x", "expires": -1}])
+    assert is_storage_state_valid(path, ttl_seconds=60)
+
+
+def test_state_invalid_when_cookie_about_to_expire(tmp_path):
+    path = str(tmp_path / "qa" / "valid_user.json")
+    write_state(path, [{"name": "orangehrm", "value": "x", "expires": time.time() + 5}])
+    assert not is_storage_state_valid(path, ttl_seconds=60)
+
+
+def test_state_invalid_after_ttl(tmp_path):
+    path = str(tmp_path / "qa" / "valid_user.json")
+    write_state(path, [{"name": "orangehrm", "value": "x", "expires": -1}])
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert not is_storage_state_valid(path, ttl_seconds=60)
+
+
+class FakeContext:
+    def __init__(self, logins):
+        self.logins = logins
+
+    def new_page(self):
+        return object()
+
+    def storage_state(self, path):
+        write_state(path, [{"name": "orangehrm", "value": "x", "expires": -1}])
+
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.logins = []
+
+    def new_context(self, **kwargs):
+        return FakeContext(self.logins)
+
+
+def test_login_runs_once_per_user(tmp_path):
+    browser = FakeBrowser()
+    calls = []
+    for _ in range(3):
+        path = get_storage_state(browser, "qa", "valid_user", calls.append, cache_dir=str(tmp_path))
+    assert len(calls) == 1
+    assert path == storage_state_path(str(tmp_path), "qa", "valid_user")
+
+
+def test_cold_cache_logs_in_once_across_workers(tmp_path):
+    browser = FakeBrowser()
+    calls = []
+
+    def slow_login(page):
+        calls.append(page)
+        time.sleep(0.2)
+
+    workers = [threading.Thread(target=get_storage_state, args=(browser, "qa", "valid_user", slow_login),
+                                kwargs={"cache_dir": str(tmp_path)}) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(calls) == 1
+    assert not os.path.exists(storage_state_path(str(tmp_path), "qa", "valid_user") + ".lock")
+
+
+def test_rejected_session_is_replaced(tmp_path):
+    path = storage_state_path(str(tmp_path), "qa", "valid_user")
+    write_state(path, [{"name": "orangehrm", "value": "revoked", "expires": -1}])
+    page = object()
+    calls = []
+
+    refreshed = refresh_storage_state(FakeContext([]), page, "qa", "valid_user", calls.append, cache_dir=str(tmp_path))
+
+    assert refreshed == path
+    assert calls == [page]  # Logged in again on the test's own page
+    with open(path) as f:
+        assert json.load(f)["cookies"][0]["value"] == "x"
+    assert not os.path.exists(path + ".lock")
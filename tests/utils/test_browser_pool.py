@@ -0,0 +1,65 @@
+from utils.browser_pool import BrowserPool
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.closed = True
+        self.connected = False
+
+
+class FakeBrowserType:
+    def __init__(self):
+        self.launched = []
+
+    def launch(self, **kwargs):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeBrowserType()
+        self.firefox = FakeBrowserType()
+
+
+def test_browser_is_reused_per_instance():
+    playwright = FakePlaywright()
+    pool = BrowserPool(playwright, max_uses=10)
+    first = pool.acquire(("chromium", 0), {})
+    pool.release(("chromium", 0))
+    second = pool.acquire(("chromium", 0), {})
+    other = pool.acquire(("chromium", 1), {})
+    assert first is second
+    assert other is not first
+    assert pool.launches == 2
+
+
+def test_browser_recycled_after_max_uses():
+    playwright = FakePlaywright()
+    pool = BrowserPool(playwright, max_uses=2)
+    browsers = [pool.acquire(("firefox", 0), {}) for _ in range(3)]
+    assert browsers[0] is browsers[1]
+    assert browsers[2] is not browsers[0]
+    assert browsers[0].closed
+
+
+def test_crashed_browser_is_relaunched():
+    playwright = FakePlaywright()
+    pool = BrowserPool(playwright)
+    first = pool.acquire(("chromium", 0), {})
+    first.connected = False
+    second = pool.acquire(("chromium", 0), {})
+    assert second is not first
+
+    pool.release(("chromium", 0), crashed=True)
+    assert second.closed
+    pool.close_all()
+    assert all(b.closed for b in playwright.chromium.launched)
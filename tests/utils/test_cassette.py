@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+import requests
+
+from utils.cassette import Cassette, CassetteMiss, REDACTED, request_key
+
+
+def make_response(status=200, body=b'{"page": 2}'):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK"
+    response.url = "https://reqres.in/api/users?page=2"
+    response.headers = requests.structures.CaseInsensitiveDict({
+        "Content-Type": "application/json",
+        "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+    })
+    response._content = body
+    response.elapsed = datetime.timedelta(milliseconds=120)
+    return response
+
+
+def test_key_ignores_param_order_and_host_case():
+    a = request_key("get", "https://REQRES.in/api/users?b=2&a=1")
+    b = request_key("GET", "https://reqres.in/api/users", params={"a": "1", "b": "2"})
+    assert a == b
+
+
+def test_key_depends_on_body():
+    a = request_key("POST", "https://reqres.in/api/users", json_body={"name": "Naveed", "job": "QA"})
+    b = request_key("POST", "https://reqres.in/api/users", json_body={"job": "QA", "name": "Naveed"})
+    c = request_key("POST", "https://reqres.in/api/users", json_body={"name": "Jane"})
+    assert a == b
+    assert a != c
+
+
+def test_record_missing_then_replay(tmp_path):
+    calls = []
+
+    def send():
+        calls.append(1)
+        return make_response()
+
+    recorder = Cassette(str(tmp_path), mode="record-missing")
+    recorder.perform("GET", "https://reqres.in/api/users?page=2", send)
+    recorder.perform("GET", "https://reqres.in/api/users?page=2", send)
+    assert len(calls) == 1
+    assert recorder.stats() == {"hits": 1, "misses": 1, "recorded": 1}
+
+    player = Cassette(str(tmp_path), mode="replay")
+    response = player.perform("GET", "https://reqres.in/api/users", send, params={"page": 2})
+    assert response.status_code == 200
+    assert response.json() == {"page": 2}
+    assert response.headers["Date"] == REDACTED
+    assert response.elapsed.total_seconds() == pytest.approx(0.12)
+    assert len(calls) == 1
+
+
+def test_replay_miss_raises(tmp_path):
+    player = Cassette(str(tmp_path), mode="replay")
+    with pytest.raises(CassetteMiss):
+        player.perform("DELETE", "https://reqres.in/api/users/2", make_response)
+    assert player.misses == 1
@@ -0,0 +1,43 @@
+import datetime
+
+from utils.cleanup_utils import BackgroundCleanup, enforce_size_budget, run_cleanup
+from utils.file_lock import FileLock
+
+FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+
+def make_run_folder(base, when, size):
+    folder = base / when.strftime(FORMAT)
+    folder.mkdir(parents=True)
+    (folder / "artifact.bin").write_bytes(b"x" * size)
+    return folder
+
+
+def test_size_budget_deletes_oldest_first(tmp_path):
+    now = datetime.datetime(2025, 1, 10, 12, 0, 0)
+    screenshots, logs = tmp_path / "screenshots", tmp_path / "logs"
+    oldest = make_run_folder(screenshots, now - datetime.timedelta(days=3), 1000)
+    middle = make_run_folder(logs, now - datetime.timedelta(days=2), 1000)
+    newest = make_run_folder(screenshots, now - datetime.timedelta(days=1), 1000)
+    current = make_run_folder(logs, now, 5000)
+
+    reclaimed = enforce_size_budget([str(screenshots), str(logs)], max_total_bytes=6500, keep_after=now)
+
+    assert reclaimed == 2000
+    assert not oldest.exists() and not middle.exists()
+    assert newest.exists() and current.exists()
+
+
+def test_cleanup_skipped_while_another_process_holds_lock(tmp_path):
+    lock_path = str(tmp_path / ".cleanup.lock")
+    with FileLock(lock_path):
+        result = run_cleanup([str(tmp_path / "screenshots")], lock_path=lock_path)
+    assert result == {"ran": False, "reclaimed_bytes": 0}
+
+
+def test_background_cleanup_reports_reclaimed_bytes(tmp_path):
+    old = make_run_folder(tmp_path / "reports", datetime.datetime.now() - datetime.timedelta(days=30), 2048)
+    task = BackgroundCleanup([str(tmp_path / "reports")], days_old=7, lock_path=str(tmp_path / ".cleanup.lock")).start()
+    result = task.join(timeout=10)
+    assert result == {"ran": True, "reclaimed_bytes": 2048}
+    assert not old.exists()
@@ -0,0 +1,63 @@
+import json
+import os
+import time
+
+import pytest
+
+from utils.config_reader import FrozenConfig, get_config
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    write_json(path, {
+        "headless": True,
+        "waits": {"default_timeout": 10000},
+        "environment": {"env": "qa", "base_url": "https://qa.example.com", "auth_token_env_var": "TEST_AUTH_TOKEN"},
+    })
+    return path
+
+
+def test_attribute_access_and_frozen(config_file):
+    cfg = get_config(str(config_file))
+    assert cfg.waits.default_timeout == 10000
+    assert cfg["environment"]["base_url"] == "https://qa.example.com"
+    assert cfg.get("missing", "default") == "default"
+    with pytest.raises(TypeError):
+        cfg.headless = False
+    with pytest.raises(TypeError):
+        cfg["waits"]["default_timeout"] = 1
+
+
+def test_loaded_once_and_reloaded_on_mtime_change(config_file):
+    first = get_config(str(config_file))
+    assert get_config(str(config_file)) is first
+
+    data = first.to_dict()
+    data["waits"]["default_timeout"] = 5000
+    write_json(config_file, data)
+    later = time.time() + 5
+    os.utime(config_file, (later, later))
+    assert get_config(str(config_file)).waits.default_timeout == 5000
+
+
+def test_env_overlay_and_env_var_override(config_file, tmp_path, monkeypatch):
+    write_json(tmp_path / "config.staging.json", {"environment": {"base_url": "https://staging.example.com"}})
+    monkeypatch.setenv("TEST_AUTH_TOKEN", "secret-token")
+
+    cfg = get_config(str(config_file), env="staging")
+    assert cfg.environment.base_url == "https://staging.example.com"
+    assert cfg.environment.auth_token == "secret-token"
+    assert cfg.waits.default_timeout == 10000
+    assert isinstance(cfg.environment, FrozenConfig)
+
+
+def test_overlay_created_after_first_load_is_picked_up(config_file, tmp_path):
+    assert get_config(str(config_file), env="uat").environment.base_url == "https://qa.example.com"
+
+    write_json(tmp_path / "config.uat.json", {"environment": {"base_url": "https://uat.example.com"}})
+    assert get_config(str(config_file), env="uat").environment.base_url == "https://uat.example.com"
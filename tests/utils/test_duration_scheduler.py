@@ -0,0 +1,204 @@
+import pytest
+
+from utils.duration_scheduler import (
+    DurationHistory, DurationScheduling, choose_plan, lane_of, lane_prefs, plan_lanes, plan_slots, predict_durations,
+    simulate_makespan,
+)
+from utils.browser_slots import assign_slots, item_slot, save_slot_map, slot_of
+
+pytest_plugins = "pytester"
+
+
+def test_lpt_beats_collection_order():
+    durations = {f"tests/api/test_{i}": 1.0 for i in range(8)}
+    durations["tests/api/test_slow"] = 8.0  # Collected last
+    lanes = {t: "api" for t in durations}
+
+    lpt, _ = simulate_makespan(durations, lanes, lane_prefs(["api", "api"]))
+    round_robin = max(sum(seconds for i, seconds in enumerate(durations.values()) if i % 2 == worker) for worker in range(2))
+
+    # Round-robin in collection order leaves one worker with four 1s tests and the 8s test
+    assert round_robin == 12.0
+    assert lpt == 8.0
+
+
+def test_lanes_split_workers_by_predicted_work():
+    durations = {f"tests/ui/test_{i}[chromium-0]": 30.0 for i in range(6)}
+    durations.update({f"tests/api/test_{i}": 1.0 for i in range(30)})
+    lanes = {t: lane_of(t) for t in durations}
+
+    worker_lanes, makespan = plan_lanes(durations, lanes, 4)
+
+    assert set(worker_lanes) == {"ui", "api"}
+    # 6 x 30s UI tests on 4 workers cannot finish before two rounds
+    assert makespan == 60.0
+
+
+def test_unknown_tests_use_lane_median(tmp_path):
+    history = DurationHistory(str(tmp_path / "durations.json"))
+    history.update({"tests/ui/test_a": 10.0, "tests/ui/test_b": 20.0, "tests/api/test_a": 0.5})
+    history.update({"tests/ui/test_a": 20.0})
+    nodeids = ["tests/ui/test_a", "tests/ui/test_b", "tests/ui/test_new", "tests/api/test_a", "tests/api/test_new"]
+
+    predicted = predict_durations(nodeids, DurationHistory(history.path), {n: lane_of(n) for n in nodeids}, {"ui": 30, "api": 1})
+
+    assert predicted["tests/ui/test_a"] == 15.0  # EWMA with alpha 0.5
+    assert predicted["tests/ui/test_new"] == 17.5
+    assert predicted["tests/api/test_new"] == 0.5
+
+
+def test_each_slot_is_owned_by_one_worker():
+    durations = {f"tests/ui/test_{i}[{slot}-chromium]": 10.0 for i in range(3)
+                 for slot in ("chromium-0", "chromium-1", "firefox-0", "firefox-1")}
+    durations.update({f"tests/api/test_{i}": 1.0 for i in range(4)})
+    groups = {t: slot_of(t) or lane_of(t) for t in durations}
+
+    worker_prefs, makespan = plan_slots(durations, groups, 2)
+
+    # Contiguous runs by browser type: one worker never needs both chromium and firefox
+    assert worker_prefs[0][:2] == ["chromium-0", "chromium-1"]
+    assert worker_prefs[1][:2] == ["firefox-0", "firefox-1"]
+    assert makespan == 62.0
+
+
+def test_extra_workers_own_no_slot():
+    assert assign_slots(["webkit-0", "chromium-0"], 4) == {"chromium-0": 0, "webkit-0": 2}
+    assert slot_of("tests/ui/test_login.py::test_valid_login[webkit-3-chromium]") == "webkit-3"
+    assert slot_of("tests/api/test_users_api.py::test_get_users") is None
+
+
+def test_single_slot_falls_back_to_lanes():
+    # Default --browsers chromium --instances 1 with -n 4: one slot must not pin all UI tests to gw0
+    durations = {f"tests/ui/test_{i}[chromium-0]": 30.0 for i in range(12)}
+    durations.update({f"tests/api/test_{i}": 1.0 for i in range(20)})
+    lanes = {t: lane_of(t) for t in durations}
+    slots = {t: slot_of(t) for t in durations}
+
+    worker_prefs, groups, makespan = choose_plan(durations, lanes, slots, 4)
+
+    assert groups == lanes
+    assert plan_slots(durations, {t: slots[t] or lanes[t] for t in durations}, 4)[1] == 360.0
+    assert makespan < 100.0
+
+
+def test_slot_mode_kept_when_slots_cover_workers():
+    durations = {f"tests/ui/test_{i}[{slot}]": 10.0 for i in range(3) for slot in ("chromium-0", "chromium-1")}
+    lanes = {t: lane_of(t) for t in durations}
+
+    worker_prefs, groups, makespan = choose_plan(durations, lanes, {t: slot_of(t) for t in durations}, 2)
+
+    assert [prefs[0] for prefs in worker_prefs] == ["chromium-0", "chromium-1"]
+    assert makespan == 30.0
+
+
+# ------------------ XDIST SCHEDULER ------------------ #
+class MockGateway:
+    def __init__(self, id):
+        self.id = id
+
+
+class MockNode:
+    def __init__(self, id):
+        self.gateway = MockGateway(id)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+# What workers save from each test's browser_instance param
+SLOT_MAP = {f"tests/ui/test_{i}.py::test_page[{slot}]": slot for slot in ("chromium-0", "chromium-1") for i in range(3)}
+SLOTTED = list(SLOT_MAP)
+API = ["tests/api/test_users.py::test_get", "tests/api/test_users.py::test_post"]
+
+
+@pytest.fixture
+def scheduler(pytester, tmp_path):
+    # Three 30s UI tests per slot: one slot per worker predicts a shorter run than two lanes
+    sched = DurationScheduling(pytester.parseconfig("--tx=2*popen"), history=DurationHistory(str(tmp_path / "d.json")),
+                               slot_map_dir=str(tmp_path))
+    nodes = [MockNode("gw0"), MockNode("gw1")]
+    for node in nodes:
+        save_slot_map(str(tmp_path), node.gateway.id, SLOT_MAP)
+        sched.add_node(node)
+        sched.add_node_collection(node, SLOTTED + API)
+    sched.schedule()
+    return sched, nodes
+
+
+def names(sched, indices):
+    return [sched.collection[index] for index in indices]
+
+
+def test_scheduler_routes_slots_and_refills_to_queue_depth(scheduler):
+    sched, (gw0, gw1) = scheduler
+
+    assert all("chromium-0" in nodeid for nodeid in names(sched, gw0.sent))
+    assert all("chromium-1" in nodeid for nodeid in names(sched, gw1.sent))
+    assert len(gw0.sent) == len(gw1.sent) == 2
+
+    sched.mark_test_complete(gw0, gw0.sent[0], duration=30.0)
+
+    # The finished test is replaced by the slot's last test, not an API test
+    assert len(sched.node2pending[gw0]) == 2
+    assert names(sched, gw0.sent[2:]) == [SLOTTED[2]]
+    assert sched.summary()["workers"]["gw0"] == {"serves": "chromium-0", "busy_seconds": 30.0}
+
+
+def test_worker_shuts_down_early_when_only_other_slots_remain(scheduler):
+    sched, (gw0, gw1) = scheduler
+
+    while sched.node2pending[gw0]:
+        sched.mark_test_complete(gw0, sched.node2pending[gw0][0])
+
+    # gw0 ran its slot and both API tests; chromium-1's last test stays with its owner
+    assert sorted(names(sched, gw0.sent)) == sorted(SLOTTED[:3] + API)
+    assert gw0.shutting_down
+    assert names(sched, sched.pending) == [SLOTTED[5]]
+    assert not gw1.shutting_down
+
+
+def test_orphaned_slot_is_picked_up_after_a_crash(scheduler):
+    sched, (gw0, gw1) = scheduler
+    held = list(sched.node2pending[gw1])
+
+    crashed = sched.remove_node(gw1)
+
+    assert crashed == sched.collection[held[0]]
+    assert not gw0.shutting_down
+    while sched.node2pending[gw0]:
+        sched.mark_test_complete(gw0, sched.node2pending[gw0][0])
+    # Everything except the test gw1 crashed in ran on gw0, including the rest of chromium-1
+    assert sorted(names(sched, gw0.sent)) == sorted(set(SLOTTED + API) - {crashed})
+    assert gw0.shutting_down and not sched.pending
+
+
+def test_pending_stays_longest_first_after_a_crash(scheduler):
+    sched, (gw0, gw1) = scheduler
+
+    sched.remove_node(gw1)
+
+    predicted = [sched.predicted[nodeid] for nodeid in names(sched, sched.pending)]
+    assert predicted == sorted(predicted, reverse=True)
+    assert names(sched, sched.pending)[-len(API):] == API
+
+
+class MockCallSpec:
+    def __init__(self, params):
+        self.params = params
+
+
+class MockItem:
+    def __init__(self, params=None):
+        if params is not None:
+            self.callspec = MockCallSpec(params)
+
+
+def test_item_slot_comes_from_the_browser_instance_param():
+    assert item_slot(MockItem({"browser_instance": ("webkit", 3), "user": "chromium-0"})) == "webkit-3"
+    assert item_slot(MockItem({"user": "chromium-0"})) is None
+    assert item_slot(MockItem()) is None
@@ -0,0 +1,95 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from utils.har_utils import HarSession, har_path_for
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.har_routes = []
+
+    def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    def route_from_har(self, path, not_found=None):
+        self.har_routes.append((path, not_found))
+
+
+class FakeRoute:
+    def __init__(self, method, url):
+        self.request = SimpleNamespace(method=method, url=url)
+        self.aborted_with = None
+
+    def abort(self, error_code):
+        self.aborted_with = error_code
+
+
+NODEID = "tests/ui/login/test_login.py::test_valid_login[chromium-0]"
+
+
+def test_path_is_flat_and_per_test(tmp_path):
+    path = har_path_for(str(tmp_path), NODEID)
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.basename(path) == "tests_ui_login_test_login.py_test_valid_login_chromium-0_.har"
+    assert path != har_path_for(str(tmp_path), NODEID.replace("chromium-0", "chromium-1"))
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        HarSession("replay-all", str(tmp_path), NODEID)
+
+
+def test_record_mode_only_sets_context_options(tmp_path):
+    har = HarSession("record", str(tmp_path / "hars"), NODEID)
+    context = FakeContext()
+
+    options = har.context_options()
+    har.install_unmatched_catcher(context)
+    har.install_replay(context)
+
+    assert options == {"record_har_path": har.path, "record_har_content": "embed"}
+    assert os.path.isdir(tmp_path / "hars")
+    assert context.routes == [] and context.har_routes == []
+
+
+def test_replay_mode_serves_from_the_test_har(tmp_path):
+    har = HarSession("replay", str(tmp_path), NODEID)
+    context = FakeContext()
+    assert not har.has_recording
+    open(har.path, "w").close()
+
+    har.install_unmatched_catcher(context)
+    har.install_replay(context)
+
+    assert har.has_recording
+    assert har.context_options() == {}
+    assert [pattern for pattern, _ in context.routes] == ["**/*"]
+    assert context.har_routes == [(har.path, "fallback")]
+
+
+def test_unmatched_requests_are_aborted_and_collected(tmp_path):
+    har = HarSession("replay", str(tmp_path), NODEID)
+    context = FakeContext()
+    har.install_unmatched_catcher(context)
+    _, catcher = context.routes[0]
+
+    first, second = FakeRoute("GET", "https://example.com/api/new"), FakeRoute("POST", "https://example.com/login")
+    catcher(first)
+    catcher(second)
+
+    assert har.unmatched == ["GET https://example.com/api/new", "POST https://example.com/login"]
+    assert first.aborted_with == second.aborted_with == "internetdisconnected"
+
+
+def test_off_mode_touches_nothing(tmp_path):
+    har = HarSession("off", str(tmp_path), NODEID)
+    context = FakeContext()
+
+    har.install_unmatched_catcher(context)
+    har.install_replay(context)
+
+    assert har.context_options() == {}
+    assert context.routes == [] and context.har_routes == []
@@ -0,0 +1,46 @@
+import time
+
+from utils.health_check import format_health_table, health_cache_key, run_health_checks, run_health_gate
+
+
+def test_checks_run_concurrently_with_deadline():
+    checks = {
+        "fast": lambda: True,
+        "down": lambda: False,
+        "slow": lambda: time.sleep(0.3) or True,
+        "hung": lambda: time.sleep(3) or True,
+    }
+    start = time.perf_counter()
+    results = run_health_checks(checks, deadline_seconds=0.5)
+    assert time.perf_counter() - start < 1
+    assert results["fast"]["ok"] and results["slow"]["ok"]
+    assert not results["down"]["ok"]
+    assert results["hung"] == {"ok": False, "latency_ms": 500, "error": "deadline exceeded"}
+    assert "hung" in format_health_table(results)
+
+
+def test_gate_results_cached_within_ttl(tmp_path):
+    calls = []
+    checks = {"web_app": lambda: calls.append(1) or True}
+    cache_path = str(tmp_path / "health.json")
+
+    first, from_cache = run_health_gate(checks, cache_path=cache_path, ttl_seconds=60)
+    assert not from_cache and first["web_app"]["ok"]
+    second, from_cache = run_health_gate(checks, cache_path=cache_path, ttl_seconds=60)
+    assert from_cache and second == first
+    assert len(calls) == 1
+
+
+def test_gate_cache_is_keyed_by_environment_and_checks(tmp_path):
+    calls = []
+    checks = {"web_app": lambda: calls.append(1) or True}
+    cache_path = str(tmp_path / "health.json")
+    staging = {"environment": {"env": "staging", "base_url": "https://staging.example.com"}}
+    prod = {"environment": {"env": "prod", "base_url": "https://example.com"}}
+
+    run_health_gate(checks, cache_path=cache_path, cache_key=health_cache_key(staging, ["web_app"]))
+    _, from_cache = run_health_gate(checks, cache_path=cache_path, cache_key=health_cache_key(prod, ["web_app"]))
+
+    assert not from_cache and len(calls) == 2
+    assert health_cache_key(staging, ["web_app"]).startswith("staging-")
+    assert health_cache_key(staging, ["web_app"]) != health_cache_key(staging, ["web_app", "api"])
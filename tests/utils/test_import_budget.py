@@ -0,0 +1,25 @@
+from benchmarks.import_time import compare_to_baseline, find_problems, load_baseline, measure, parse_importtime
+
+
+def test_collecting_api_tests_stays_within_import_budget(tmp_path):
+    # Run outside the repo: the session's cleanup, logs and reports stay in tmp_path
+    entries = parse_importtime(measure("tests/api", workdir=str(tmp_path)))
+    assert entries, "No -X importtime output captured"
+    problems = find_problems(entries) + compare_to_baseline(entries, load_baseline())
+    assert not problems, "\n".join(problems)
+
+
+def test_new_heavy_module_and_slower_total_are_regressions():
+    baseline = parse_importtime(
+        "import time:      2000 |      20000 | utils.api_utils\n"
+        "import time:      1000 |      15000 | allure\n"
+    )
+    current = parse_importtime(
+        "import time:      2000 |      21000 | utils.api_utils\n"
+        "import time:      1000 |      22000 | allure\n"
+        "import time:     30000 |      30000 | pandas.core\n"
+    )
+    problems = compare_to_baseline(current, baseline)
+    assert len(problems) == 2
+    assert "'pandas'" in problems[0]
+    assert "exceeds baseline 35 ms" in problems[1]
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from utils.load_utils import (
+    LatencyHistogram,
+    assert_error_rate,
+    assert_latency_percentile,
+    run_load,
+)
+from utils.stub_server import StubServer
+
+
+def test_histogram_percentiles_within_precision():
+    random.seed(7)
+    values = sorted(random.randint(100, 5_000_000) for _ in range(20_000))
+    histogram = LatencyHistogram(significant_figures=3)
+    for value in values:
+        histogram.record(value)
+
+    for percentile in (50, 90, 99, 99.9):
+        expected = values[int(len(values) * percentile / 100) - 1]
+        assert histogram.percentile(percentile) == pytest.approx(expected, rel=2e-3)
+    assert histogram.max == values[-1]
+    assert histogram.total_count == len(values)
+
+
+def test_histogram_merge():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for value in range(1, 1001):
+        (a if value % 2 else b).record(value)
+    a.merge(b)
+    assert a.total_count == 1000
+    assert a.min == 1 and a.max == 1000
+    assert a.percentile(50) == 500
+
+
+def test_fixed_rate_load_against_stub_server():
+    with StubServer({"/users": {"body": {"data": []}, "delay_ms": 2}}) as server:
+        result = run_load({"url": "/users"}, duration_seconds=1, rps=100, base_url=server.url)
+
+    summary = result.summary()
+    assert 95 <= summary["requests"] <= 100
+    assert summary["p50_ms"] >= 2
+    assert_error_rate(result, 0)
+    assert_latency_percentile(result, 99, threshold_ms=500)
+
+
+def test_errors_are_counted():
+    with StubServer({"/users": {}}, error_rate=1.0) as server:
+        result = run_load({"url": "/users"}, duration_seconds=0.3, concurrency=4, base_url=server.url)
+    assert result.requests > 0
+    assert result.error_rate == 1.0
+    with pytest.raises(AssertionError):
+        assert_error_rate(result, 0.01)
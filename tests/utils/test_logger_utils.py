@@ -0,0 +1,45 @@
+import json
+import logging
+
+from utils.log_merge import iter_merged, merge_logs
+from utils.logger_utils import LOGGER_NAME, JsonLinesFormatter, _ContextFilter, configure_logging, set_test_context
+
+
+def test_records_carry_test_context_as_json():
+    record = logging.LogRecord("automation_logger", logging.INFO, __file__, 1, "Clicked %s", ("#submit",), None)
+    set_test_context("tests/ui/test_login.py::test_valid_login", "chromium-0")
+    try:
+        _ContextFilter().filter(record)
+    finally:
+        set_test_context()
+
+    entry = json.loads(JsonLinesFormatter().format(record))
+
+    assert entry["msg"] == "Clicked #submit"
+    assert entry["nodeid"] == "tests/ui/test_login.py::test_valid_login"
+    assert entry["browser"] == "chromium-0"
+    assert entry["level"] == "INFO" and entry["worker"]
+
+
+def test_merge_interleaves_worker_logs_by_timestamp(tmp_path):
+    (tmp_path / "gw0.jsonl").write_text("\n".join(json.dumps({"ts": ts, "msg": f"gw0-{ts}"}) for ts in (1, 4, 5)))
+    (tmp_path / "gw1.jsonl").write_text("\n".join(json.dumps({"ts": ts, "msg": f"gw1-{ts}"}) for ts in (2, 3, 6)) + "\n{\"ts\": 7")
+
+    count = merge_logs(str(tmp_path))
+
+    merged = [json.loads(line)["msg"] for line in (tmp_path / "merged.jsonl").read_text().splitlines()]
+    assert count == 6
+    assert merged == ["gw0-1", "gw1-2", "gw1-3", "gw0-4", "gw0-5", "gw1-6"]
+    # The merged file itself is not re-read as a worker log
+    assert len(list(iter_merged(str(tmp_path)))) == 6
+
+
+def test_records_reach_pytest_capture(tmp_path, caplog):
+    logger = configure_logging({"dir": str(tmp_path)})
+    assert not logger.propagate
+
+    # conftest attaches pytest's capture handlers instead of relying on the root logger
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        logger.info("Clicked element: %s", "#submit")
+
+    assert "Clicked element: #submit" in caplog.text
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+from utils.network_utils import NetworkRouter
+
+CONFIG = {
+    "enabled": True,
+    "block_resource_types": ["image", "font"],
+    "block_url_globs": ["**/*google-analytics.com/**"],
+    "stubs": [{"url_glob": "**/*hotjar.com/**", "status": 200, "content_type": "application/javascript", "body": "//"}],
+    "estimated_bytes": {"image": 40000, "script": 20000},
+}
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = {}
+
+    def route(self, pattern, handler):
+        self.routes[pattern] = handler
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url="https://example.com/asset"):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.result = None
+
+    def abort(self, error_code):
+        self.result = ("abort", error_code)
+
+    def fallback(self):
+        self.result = ("fallback",)
+
+    def fulfill(self, **kwargs):
+        self.result = ("fulfill", kwargs)
+
+
+def installed(network_config):
+    router = NetworkRouter(network_config)
+    context = FakeContext()
+    router.install(context)
+    return router, context
+
+
+def test_disabled_router_installs_nothing():
+    router, context = installed(dict(CONFIG, enabled=False))
+    assert context.routes == {}
+    assert not NetworkRouter().enabled
+
+
+def test_blocks_configured_resource_types_only():
+    router, context = installed(CONFIG)
+    image, document = FakeRoute("image"), FakeRoute("document")
+
+    context.routes["**/*"](image)
+    context.routes["**/*"](document)
+
+    assert image.result == ("abort", "blockedbyclient")
+    assert document.result == ("fallback",)
+    assert router.stats["blocked"] == 1
+    assert router.stats["blocked_by_type"] == {"image": 1}
+    assert router.stats["bytes_saved_estimate"] == 40000
+
+
+def test_blocks_url_globs_whatever_the_resource_type():
+    router, context = installed(CONFIG)
+    route = FakeRoute("script", "https://www.google-analytics.com/analytics.js")
+
+    context.routes["**/*google-analytics.com/**"](route)
+
+    assert route.result == ("abort", "blockedbyclient")
+    assert router.stats["blocked_by_type"] == {"script": 1}
+    assert router.stats["bytes_saved_estimate"] == 20000
+
+
+def test_stubs_fulfill_with_canned_response():
+    router, context = installed(CONFIG)
+    route = FakeRoute("script", "https://static.hotjar.com/c/hotjar.js")
+
+    context.routes["**/*hotjar.com/**"](route)
+
+    assert route.result == ("fulfill", {"status": 200, "content_type": "application/javascript", "headers": None, "body": "//"})
+    assert router.stats["stubbed"] == 1 and router.stats["blocked"] == 0
+    assert router.stats["bytes_saved_estimate"] == 20000 - 2
+
+
+def test_no_type_filter_without_resource_types():
+    router, context = installed(dict(CONFIG, block_resource_types=[]))
+    assert "**/*" not in context.routes
+    assert set(context.routes) == {"**/*google-analytics.com/**", "**/*hotjar.com/**"}
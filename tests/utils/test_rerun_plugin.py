@@ -0,0 +1,74 @@
+from utils.rerun_plugin import SmartRerun
+from utils.retry import retry_on_failure
+
+pytest_plugins = "pytester"
+
+TESTS = """
+import pytest
+
+ATTEMPTS = {"flaky": 0}
+SETUPS = []
+
+@pytest.fixture(scope="session")
+def resource():
+    SETUPS.append(object())
+    yield SETUPS[-1]
+
+def test_flaky(resource):
+    ATTEMPTS["flaky"] += 1
+    assert ATTEMPTS["flaky"] > 1
+
+def test_fresh_session_fixture_on_rerun(resource):
+    assert len(SETUPS) > 1
+
+def test_broken():
+    assert False
+
+@pytest.mark.retries(0)
+def test_not_retried():
+    assert False
+
+def test_known_flaky():
+    assert False
+"""
+
+
+def run(pytester, **options):
+    pytester.makeini("[pytest]\nmarkers =\n    retries(n): rerun up to n times")
+    pytester.makepyfile(TESTS)
+    plugin = SmartRerun(backoff_seconds=0, **options)
+    result = pytester.runpytest_inprocess("-p", "no:cacheprovider", "-p", "no:rerunfailures", "-p", "no:playwright", plugins=[plugin])
+    return result.parseoutcomes(), plugin
+
+
+def test_failures_are_rerun_at_session_end_with_fresh_fixtures(pytester):
+    outcomes, plugin = run(pytester, retries=1)
+
+    assert outcomes == {"passed": 2, "failed": 3, "rerun": 4}
+    assert {nodeid.split("::")[1] for nodeid in plugin.flaky} == {"test_flaky", "test_fresh_session_fixture_on_rerun"}
+    assert {nodeid.split("::")[1] for nodeid in plugin.failed_after_rerun} == {"test_broken", "test_known_flaky"}
+    assert plugin.attempts and plugin.rerun_seconds >= 0
+
+
+def test_known_flaky_tests_get_more_retries_and_are_quarantined(pytester, request):
+    known = f"{request.node.name}.py::test_known_flaky"  # makepyfile names the module after this test
+    outcomes, plugin = run(pytester, retries=0, flaky_retries=2, quarantine_rate=0.3, flake_rates={known: 0.5})
+
+    assert outcomes == {"failed": 4, "xfailed": 1, "rerun": 2}
+    assert len(plugin.quarantined) == 1
+    assert list(plugin.attempts.values()) == [3]
+
+
+def test_session_budget_stops_reruns(pytester):
+    outcomes, _ = run(pytester, retries=1, max_session_reruns=1)
+
+    assert outcomes == {"passed": 1, "failed": 4, "rerun": 1}
+
+
+def test_retry_on_failure_is_a_marker_shim():
+    @retry_on_failure(retries=3)
+    def test_example():
+        pass
+
+    assert test_example.pytestmark[0].name == "retries"
+    assert test_example.pytestmark[0].args == (3,)
@@ -0,0 +1,33 @@
+import pytest
+from playwright._impl._connection import Connection
+
+from utils.round_trips import RoundTripCounter
+
+
+@pytest.fixture
+def uninstalled(monkeypatch):
+    monkeypatch.setattr(RoundTripCounter, "_installed", False)
+
+
+def test_missing_private_method_fails_loudly(uninstalled, monkeypatch):
+    monkeypatch.delattr(Connection, "_send_message_to_server")
+    with pytest.raises(RuntimeError, match="_send_message_to_server"):
+        RoundTripCounter.install()
+
+
+def test_changed_signature_fails_loudly(uninstalled, monkeypatch):
+    monkeypatch.setattr(Connection, "_send_message_to_server", lambda self, message: None)
+    with pytest.raises(RuntimeError, match="expected"):
+        with RoundTripCounter():
+            pass
+
+
+def test_counts_round_trips_on_a_real_page(blank_page):
+    with RoundTripCounter() as round_trips:
+        blank_page.set_content("<p id='greeting'>Hello</p>")
+        text = blank_page.text_content("#greeting")
+
+    assert text == "Hello"
+    assert round_trips.total >= 2
+    assert round_trips.by_method["Frame.setContent"] == 1
+    assert round_trips.by_method["Frame.textContent"] == 1
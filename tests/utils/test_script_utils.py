@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from utils.script_utils import ScriptUtils
+
+
+def test_wait_with_sleep_check_returns_soon_after_condition():
+    ready_at = time.monotonic() + 0.05
+    ScriptUtils.wait_with_sleep_check(lambda: time.monotonic() >= ready_at, timeout=5, poll_interval=1)
+    # The old fixed 1s polling would overshoot by up to a full second
+    assert time.monotonic() - ready_at < 0.2
+
+
+def test_wait_with_sleep_check_times_out():
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        ScriptUtils.wait_with_sleep_check(lambda: False, timeout=0.1, poll_interval=1)
+    assert time.monotonic() - start < 0.5
+
+
+class RecordingLocator:
+    """
+    Stands in for a Playwright page/locator and records every call that would
+    cross the wire to the browser.
+    """
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    @property
+    def first(self):
+        return self
+
+    def locator(self, selector):
+        return self
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append(name)
+            return "text"
+        return call
+
+
+def test_actions_make_one_round_trip_each():
+    calls = []
+    page = RecordingLocator(calls)
+
+    ScriptUtils.click_element(page, "#submit")
+    ScriptUtils.send_keys(page, "#name", "value")
+    assert ScriptUtils.get_text(page, "#title") == "text"
+    ScriptUtils.get_attribute(page, "#link", "href")
+    ScriptUtils.wait_for_selector_with_timeout(page, "#ready")
+
+    assert calls == ["click", "fill", "text_content", "get_attribute", "wait_for_selector"]
+
+
+def test_login_flow_round_trips():
+    from page_objects.pages.login_pages.login_page import LoginPage
+
+    calls = []
+    LoginPage(RecordingLocator(calls)).login("user", "secret")
+
+    # fill, fill, click, then a single visibility wait (previously wait_for_selector + is_visible)
+    assert calls == ["fill", "fill", "click", "wait_for"]
+
+
+def test_snapshot_reads_all_specs_in_one_evaluate():
+    calls = []
+
+    class Page:
+        def evaluate(self, script, specs):
+            calls.append(specs)
+            return {name: [] if spec["all"] else {"found": False} for name, spec in specs.items()}
+
+    state = ScriptUtils.snapshot(Page(), {
+        "title": "h1",
+        "link": {"selector": "a.more", "attributes": ["href"]},
+        "rows": {"selector": "tr", "all": True},
+    })
+
+    assert len(calls) == 1
+    assert calls[0] == {
+        "title": {"selector": "h1", "attributes": [], "all": False},
+        "link": {"selector": "a.more", "attributes": ["href"], "all": False},
+        "rows": {"selector": "tr", "attributes": [], "all": True},
+    }
+    assert state["rows"] == [] and state["title"] == {"found": False}
+
+
+SNAPSHOT_HTML = """
+<h1>Employees</h1>
+<input name="username" value="Admin">
+<button type="submit" disabled title="Fill in the form first">Login</button>
+<a class="more" href="/employees?page=2" style="visibility: hidden">More</a>
+<table><tbody><tr><td>Ann</td></tr><tr><td>Bob</td></tr></tbody></table>
+"""
+
+
+def test_snapshot_on_a_real_page(blank_page):
+    blank_page.set_content(SNAPSHOT_HTML)
+
+    state = ScriptUtils.snapshot(blank_page, {
+        "title": "h1",
+        "username": "input[name='username']",
+        "submit": {"selector": "button[type='submit']", "attributes": ["title", "disabled"]},
+        "more": {"selector": "a.more", "attributes": ["href"]},
+        "rows": {"selector": "tbody tr", "all": True},
+        "missing": {"selector": "#nope", "attributes": ["href"]},
+    })
+
+    assert state["title"]["found"] and state["title"]["visible"] and state["title"]["text"] == "Employees"
+    assert state["username"]["value"] == "Admin" and state["username"]["enabled"]
+    assert state["submit"]["enabled"] is False
+    assert state["submit"]["attributes"] == {"title": "Fill in the form first", "disabled": ""}
+    assert state["more"]["visible"] is False
+    assert state["more"]["attributes"] == {"href": "/employees?page=2"}
+    assert [row["text"].strip() for row in state["rows"]] == ["Ann", "Bob"]
+    assert state["missing"] == {"found": False, "visible": False, "enabled": False, "text": None, "value": None,
+                                "checked": None, "attributes": {"href": None}}
@@ -0,0 +1,46 @@
+import time
+
+from utils.timing import ActionProfiler, instrument, timed
+import utils.timing as timing
+
+
+def test_nested_actions_build_profile_and_folded_stacks(monkeypatch):
+    profiler = ActionProfiler()
+    monkeypatch.setattr(timing, "_profiler", profiler)
+
+    @instrument
+    class Fake:
+        def click(page, selector):
+            time.sleep(0.01)
+
+        def open_and_click(page, selector):
+            time.sleep(0.01)
+            Fake.click(page, selector)
+
+
+    profiler.start_test("tests/ui/test_x.py::test_a")
+    with timed("goto", selector="https://example.test", page_object="page"):
+        pass
+    Fake.open_and_click(None, "#submit")
+    profile = profiler.finish_test()
+
+    actions = [(r["action"], r["selector"], r["depth"]) for r in profile["actions"]]
+    assert actions == [("goto", "https://example.test", 0), ("click", "#submit", 1), ("open_and_click", "#submit", 0)]
+    outer = profile["actions"][2]
+    assert outer["duration_ms"] >= 20 and 5 <= outer["self_ms"] < outer["duration_ms"]
+
+    stacks = dict(line.rsplit(" ", 1) for line in profiler.folded_text().splitlines())
+    assert "tests/ui/test_x.py::test_a;Fake.open_and_click(#submit);Fake.click(#submit)" in stacks
+    assert profiler.slowest(1)[0]["action"] == "open_and_click"
+
+
+def test_merge_adds_worker_profiles():
+    controller, worker = ActionProfiler(), ActionProfiler()
+    for profiler in (controller, worker):
+        frame = profiler.push("click", "#a", "ScriptUtils")
+        profiler.pop(frame)
+
+    controller.merge(worker.session_profile())
+
+    assert controller.slowest(1)[0]["count"] == 2
+    assert len(controller.folded) == 1
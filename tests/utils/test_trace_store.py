@@ -0,0 +1,108 @@
+import os
+import zipfile
+
+import pytest
+
+from utils.trace_store import TraceSession, TraceStore
+
+
+class FakeTracing:
+    def __init__(self):
+        self.started = None
+        self.stopped_with = []
+
+    def start(self, **options):
+        self.started = options
+
+    def stop(self, path=None):
+        self.stopped_with.append(path)
+        if path:
+            with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as trace:
+                trace.writestr("trace.trace", "{}\n" * 2000)
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+
+def write_trace(path, size):
+    with zipfile.ZipFile(path, "w") as trace:
+        trace.writestr("trace.trace", os.urandom(size))
+
+
+def test_passing_trace_is_discarded_without_writing(tmp_path):
+    store = TraceStore(str(tmp_path / "traces"))
+    context = FakeContext()
+    trace = TraceSession("retain-on-failure", store, "tests/ui/test_login.py::test_ok")
+    trace.start(context)
+
+    assert trace.stop(context, failed=False) is None
+    assert context.tracing.stopped_with == [None]
+    assert context.tracing.started["snapshots"] is True
+    assert store.entries() == []
+
+
+def test_failing_trace_is_stored_compressed(tmp_path):
+    store = TraceStore(str(tmp_path / "traces"))
+    context = FakeContext()
+    trace = TraceSession("retain-on-failure", store, "tests/ui/test_login.py::test_bad[chromium-0]")
+    trace.start(context)
+    path = trace.stop(context, failed=True)
+
+    assert os.path.dirname(path) == str(tmp_path / "traces")
+    with zipfile.ZipFile(path) as stored:
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in stored.infolist())
+    assert trace.overhead_ms >= 0
+
+
+@pytest.mark.parametrize("mode, execution_count, enabled", [
+    ("off", 1, False),
+    ("on", 1, True),
+    ("on-first-retry", 1, False),
+    ("on-first-retry", 2, True),
+    ("on-first-retry", 3, False),
+])
+def test_mode_decides_whether_to_trace(mode, execution_count, enabled):
+    assert TraceSession(mode, None, "t", execution_count=execution_count).enabled is enabled
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TraceSession("always", None, "t")
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = TraceStore(str(tmp_path / "traces"), max_bytes=2500)
+    os.makedirs(store.trace_dir)
+    old, used = (os.path.join(store.trace_dir, name) for name in ("old.zip", "used.zip"))
+    for age, path in enumerate((old, used)):
+        write_trace(path, 1000)
+        os.utime(path, (1000 + age, 1000 + age))
+    store.touch(old)  # Attached recently, so "used" is now the least recently used
+
+    source = str(tmp_path / "new.zip")
+    write_trace(source, 1000)
+    added = store.add(source, "test_new")
+
+    assert os.path.exists(old) and os.path.exists(added)
+    assert not os.path.exists(used)
+    assert store.evicted == 1
+    assert not os.path.exists(source)
+
+
+def test_rerun_keeps_the_earlier_trace_of_the_same_test(tmp_path):
+    store = TraceStore(str(tmp_path / "traces"), max_bytes=2500)
+    os.makedirs(store.trace_dir)
+    first_attempt, other = (os.path.join(store.trace_dir, name) for name in
+                            ("test_a-20260101-000000.zip", "test_a_b-20260101-000001.zip"))
+    for age, path in enumerate((first_attempt, other)):
+        write_trace(path, 1000)
+        os.utime(path, (1000 + age, 1000 + age))
+
+    source = str(tmp_path / "rerun.zip")
+    write_trace(source, 1000)
+    store.add(source, "test_a")
+
+    assert os.path.exists(first_attempt)
+    assert not os.path.exists(other)
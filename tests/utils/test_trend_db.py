@@ -0,0 +1,47 @@
+from utils.trend_db import TrendDB
+
+
+def record(db, run, outcomes):
+    """
+    :param outcomes: {nodeid: (outcome, seconds) or (outcome, seconds, attempts)}
+    """
+    results = [{"nodeid": nodeid, "outcome": values[0], "duration": values[1],
+                "attempts": values[2] if len(values) > 2 else 1, "browser": "chromium", "instance": 0}
+               for nodeid, values in outcomes.items()]
+    return db.record_run(f"run-{run}", started_at=run, results=results, exit_status=0)
+
+
+def test_slowest_uses_latest_run_by_default(tmp_path):
+    with TrendDB(str(tmp_path / "trends.sqlite")) as db:
+        record(db, 1, {"test_a": ("passed", 9.0), "test_b": ("passed", 1.0)})
+        record(db, 2, {"test_a": ("passed", 2.0), "test_b": ("passed", 3.0), "test_c": ("skipped", 0.0)})
+
+        assert [row["nodeid"] for row in db.slowest(5)] == ["test_b", "test_a"]
+        assert db.slowest(1, runs=2)[0]["nodeid"] == "test_a"
+        assert db.run_count() == 2
+
+
+def test_regressions_compare_against_previous_runs(tmp_path):
+    with TrendDB(str(tmp_path / "trends.sqlite")) as db:
+        for run in range(1, 4):
+            record(db, run, {"test_slow": ("passed", 10.0), "test_steady": ("passed", 5.0), "test_tiny": ("passed", 0.01)})
+        record(db, 4, {"test_slow": ("passed", 14.0), "test_steady": ("passed", 5.5), "test_tiny": ("passed", 0.05)})
+
+        regressions = db.regressions(threshold_pct=25, baseline_runs=3)
+
+    assert [row["nodeid"] for row in regressions] == ["test_slow"]
+    assert regressions[0]["change_pct"] == 40.0 and regressions[0]["baseline_runs"] == 3
+
+
+def test_flake_rate_counts_reruns_and_flips(tmp_path):
+    with TrendDB(str(tmp_path / "trends.sqlite")) as db:
+        record(db, 1, {"test_flaky": ("passed", 1.0), "test_broken": ("failed", 1.0), "test_ok": ("passed", 1.0)})
+        record(db, 2, {"test_flaky": ("failed", 1.0), "test_broken": ("failed", 1.0), "test_ok": ("passed", 1.0)})
+        record(db, 3, {"test_flaky": ("passed", 1.0, 2), "test_broken": ("failed", 1.0), "test_ok": ("passed", 1.0)})
+        record(db, 4, {"test_flaky": ("passed", 1.0), "test_broken": ("failed", 1.0), "test_ok": ("passed", 1.0)})
+
+        rates = db.flake_rates(runs=20, min_runs=3)
+
+    assert len(rates) == 1
+    assert rates[0]["nodeid"] == "test_flaky"
+    assert (rates[0]["flaky_runs"], rates[0]["failures"], rates[0]["flake_rate"]) == (2, 1, 0.5)
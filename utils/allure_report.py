@@ -1,25 +1,211 @@
 from datetime import timedelta, datetime
+from concurrent.futures import ProcessPoolExecutor
+import itertools
 import os
+import shutil
 import subprocess
 import json
 
-def generate_allure_report(results_dir="allure-results", base_output="reports/allure-report/"):
+RESULT_SUFFIX = "-result.json"
+STATUSES = ("passed", "failed", "broken", "skipped", "unknown")
+
+
+# ------------------ NATIVE SUMMARY ------------------ #
+def _label(result, name):
+    return next((label.get("value") for label in result.get("labels", []) if label.get("name") == name), None)
+
+
+def read_result(path):
+    """
+    Reads one allure-results/*-result.json into the few fields the summary
+    needs, or None if the file is unreadable (e.g. still being written).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    start, stop = result.get("start"), result.get("stop")
+    return {
+        "key": result.get("historyId") or result.get("fullName") or result.get("uuid") or path,
+        "name": result.get("fullName") or result.get("name"),
+        "suite": _label(result, "suite") or _label(result, "parentSuite") or "(no suite)",
+        "status": result.get("status") if result.get("status") in STATUSES else "unknown",
+        "start": start,
+        "stop": stop,
+        "duration_ms": stop - start if start is not None and stop is not None else 0,
+    }
+
+
+def _read_chunk(paths):
+    # Module level so a process pool can pickle it
+    return [record for record in map(read_result, paths) if record is not None]
+
+
+def iter_result_files(results_dir="allure-results", since=None):
+    """
+    Yields result file paths without listing the whole directory into memory.
+    Files last modified before `since` (epoch seconds), i.e. left over from
+    earlier runs, are skipped without being opened.
+    """
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        output_dir = os.path.join(base_output, f"allure-report-{timestamp}")
-        os.makedirs(output_dir, exist_ok=True)
+        entries = os.scandir(results_dir)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(RESULT_SUFFIX):
+                continue
+            if since is not None and entry.stat().st_mtime < since:
+                continue
+            yield entry.path
+
+
+class ResultsSummary:
+    """
+    Running totals over Allure results, fed one record at a time. Like the
+    Allure report, a test with several results (reruns) counts once, with the
+    status of its latest attempt.
+    """
+
+    def __init__(self):
+        self.latest = {}
+        self.retries = 0
+        self.files = 0
+
+    def add(self, record):
+        self.files += 1
+        current = self.latest.get(record["key"])
+        if current is not None:
+            self.retries += 1
+            if (current["stop"] or 0) > (record["stop"] or 0):
+                return
+        self.latest[record["key"]] = record
+
+    def add_all(self, records):
+        for record in records:
+            self.add(record)
 
-        print("[INFO] Generating Allure HTML report...")
-        subprocess.run([
-            "allure", "generate", results_dir, "--clean", "-o", output_dir
-        ], check=True, shell=True)
+    def as_dict(self, top_n=10):
+        stats = dict.fromkeys(STATUSES, 0)
+        suites = {}
+        starts, stops = [], []
+        for record in self.latest.values():
+            stats[record["status"]] += 1
+            suite = suites.setdefault(record["suite"], dict(dict.fromkeys(STATUSES, 0), total=0, duration_ms=0))
+            suite[record["status"]] += 1
+            suite["total"] += 1
+            suite["duration_ms"] += record["duration_ms"]
+            if record["start"] is not None:
+                starts.append(record["start"])
+            if record["stop"] is not None:
+                stops.append(record["stop"])
+        # Wall-clock span, as the Allure report shows it; test_time_ms adds up every test
+        wall_ms = max(stops) - min(starts) if starts and stops else 0
+        slowest = sorted(self.latest.values(), key=lambda record: record["duration_ms"], reverse=True)[:top_n]
+        return dict(
+            stats,
+            total=len(self.latest),
+            retries=self.retries,
+            duration=str(timedelta(milliseconds=wall_ms)),
+            duration_ms=wall_ms,
+            test_time_ms=sum(record["duration_ms"] for record in self.latest.values()),
+            suites=dict(sorted(suites.items())),
+            slowest=[{"name": record["name"], "duration_ms": record["duration_ms"]} for record in slowest],
+        )
 
-        print(f"[PASS] Allure report generated at: {output_dir}")
-        return output_dir  # ✅ Return the actual path for further use
 
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Failed to generate Allure report: {e}")
+def summarize_results(results_dir="allure-results", since=None, processes=None, parallel_threshold=2000, chunk_size=500):
+    """
+    Builds the run summary (status totals, durations, per-suite stats) straight
+    from the result files, without the allure CLI. Files are streamed; once more
+    than `parallel_threshold` files are found, the rest are parsed in chunks by
+    a process pool.
+
+    :param since: Only count files written at or after this epoch time (run start).
+    :param processes: Pool size; 0 disables the pool, None uses os.cpu_count().
+    :return: dict with passed/failed/broken/skipped/unknown/total, retries,
+             duration (h:mm:ss), duration_ms, test_time_ms, suites and slowest.
+    """
+    summary = ResultsSummary()
+    paths = iter_result_files(results_dir, since)
+    summary.add_all(_read_chunk(itertools.islice(paths, parallel_threshold)))
+
+    chunks = iter(lambda: list(itertools.islice(paths, chunk_size)), [])
+    first = next(chunks, None)
+    if first is not None:
+        chunks = itertools.chain([first], chunks)
+        if processes == 0:
+            for records in map(_read_chunk, chunks):
+                summary.add_all(records)
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                for records in executor.map(_read_chunk, chunks):
+                    summary.add_all(records)
+    return summary.as_dict()
+
+
+def write_summary(summary, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2)
+    return path
+
+
+# ------------------ HTML REPORT (ALLURE CLI) ------------------ #
+class AllureReportJob:
+    """
+    A running `allure generate`. `wait()` returns the report folder once the
+    CLI has succeeded, or None on failure or timeout.
+    """
+
+    def __init__(self, process, output_dir, log_path):
+        self.process = process
+        self.output_dir = output_dir
+        self.log_path = log_path
+
+    def done(self):
+        return self.process.poll() is not None
+
+    def wait(self, timeout=None):
+        try:
+            returncode = self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return None
+        if returncode != 0:
+            print(f"[ERROR] Failed to generate Allure report (exit code {returncode}), see {self.log_path}")
+            return None
+        print(f"[PASS] Allure report generated at: {self.output_dir}")
+        return self.output_dir
+
+
+def start_allure_report(results_dir="allure-results", base_output="reports/allure-report/"):
+    """
+    Starts `allure generate` in the background and returns an AllureReportJob,
+    or None when the allure CLI is not installed.
+    """
+    allure_cli = shutil.which("allure")
+    if allure_cli is None:
+        print("[WARN] allure CLI not found on PATH — skipping HTML report")
         return None
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_dir = os.path.join(base_output, f"allure-report-{timestamp}")
+    os.makedirs(base_output, exist_ok=True)
+    log_path = f"{output_dir}.log"
+    print("[INFO] Generating Allure HTML report in the background...")
+    # No shell: with shell=True a list runs only "allure" on POSIX and drops every argument
+    with open(log_path, "w") as log_file:
+        process = subprocess.Popen(
+            [allure_cli, "generate", results_dir, "--clean", "-o", output_dir],
+            stdout=log_file, stderr=subprocess.STDOUT,
+        )
+    return AllureReportJob(process, output_dir, log_path)
+
+
+def generate_allure_report(results_dir="allure-results", base_output="reports/allure-report/"):
+    try:
+        job = start_allure_report(results_dir, base_output)
+        return job.wait() if job else None  # ✅ Return the actual path for further use
     except Exception as ex:
         print(f"[ERROR] Exception during Allure report generation: {ex}")
         return None
@@ -71,4 +257,3 @@ def parse_allure_summary(base_dir="reports/allure-report/") -> dict:
     except Exception as e:
         print(f"[ERROR] Failed to parse Allure summary: {e}")
         return {}
-    
\ No newline at end of file
@@ -1,19 +1,158 @@
 import requests
-import json
-import logging
-from jsonschema import validate, ValidationError
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urljoin, urlsplit
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+from utils.cassette import Cassette
+from utils.logger_utils import get_logger
+from utils.schema_registry import SchemaRegistry
 
-# Logger configuration
-logger = logging.getLogger("api_utils")
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Logs through the structured automation logger; conftest configures it
+logger = get_logger(name="api_utils")
+
+# Record/replay store for API calls; disabled until configure_cassette() is called
+_cassette = Cassette(mode="off")
+
+def configure_cassette(mode="off", directory="cassettes"):
+    global _cassette
+    _cassette = Cassette(directory=directory, mode=mode)
+    return _cassette
+
+def get_cassette():
+    return _cassette
+
+# Compiled JSON-schema validators shared by validate_json_schema
+_schema_registry = SchemaRegistry()
+
+def configure_schema_registry(schema_dir="schemas/"):
+    global _schema_registry
+    _schema_registry = SchemaRegistry(schema_dir)
+    return _schema_registry
+
+def get_schema_registry():
+    return _schema_registry
+
+# -------------------------------------
+# Pooled HTTP Client
+# -------------------------------------
+def join_url(base_url, url):
+    """
+    Prefixes relative `url` with `base_url`; absolute URLs are returned unchanged.
+    """
+    if base_url and not urlsplit(url).scheme:
+        return urljoin(base_url.rstrip("/") + "/", url.lstrip("/"))
+    return url
+
+class ApiClient:
+    """
+    Keep-alive HTTP client with one `requests.Session` per host, all sharing a
+    single pooled HTTPAdapter with retry/backoff.
+
+    :param base_url: Prefix for relative URLs passed to `request`.
+    :param default_headers: Headers sent with every request.
+    :param pool_connections: Number of per-host connection pools to keep.
+    :param pool_maxsize: Maximum open connections per host.
+    :param retries: Retries on connection errors and `status_forcelist` responses.
+    :param backoff_factor: Exponential backoff factor between retries.
+    :param timeout: Default request timeout in seconds.
+    """
+
+    def __init__(self, base_url=None, default_headers=None, pool_connections=10, pool_maxsize=20,
+                 retries=0, backoff_factor=0.3, status_forcelist=(502, 503, 504), timeout=10):
+        self.base_url = base_url
+        self.default_headers = dict(default_headers or {})
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def build_url(self, url):
+        return join_url(self.base_url, url)
+
+    def new_session(self, headers=None, persist_cookies=True):
+        """
+        Returns a new Session that uses this client's connection pool.
+        """
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        session.headers.update(self.default_headers)
+        session.headers.update(headers or {})
+        if not persist_cookies:
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def session_for(self, url):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                # Shared sessions stay stateless like the plain requests.* calls they replace
+                session = self.new_session(persist_cookies=False)
+                self._sessions[host] = session
+            return session
+
+    def request(self, method, url, headers=None, params=None, json=None, data=None, auth=None, timeout=None):
+        url = self.build_url(url)
+        session = self.session_for(url)
+
+        def send():
+            return session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                json=json,
+                data=data,
+                auth=auth,
+                timeout=timeout or self.timeout
+            )
+
+        if _cassette.enabled:
+            return _cassette.perform(method, url, send, headers=headers, params=params, json_body=json, data=data)
+        return send()
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+        self.adapter.close()
+
+_default_client = None
+
+def configure_default_client(**options):
+    """
+    Replaces the shared client used by get/post/put/delete/send_request,
+    e.g. configure_default_client(**config["api"]).
+    """
+    global _default_client
+    if _default_client is not None:
+        _default_client.close()
+    _default_client = ApiClient(**options)
+    return _default_client
+
+def get_default_client():
+    global _default_client
+    if _default_client is None:
+        _default_client = ApiClient()
+    return _default_client
 
 # -------------------------------------
 # Basic HTTP Methods
 # -------------------------------------
 def get(url, headers=None, auth=None, params=None):
     try:
-        response = requests.get(url, headers=headers, auth=auth, params=params)
+        response = get_default_client().request("GET", url, headers=headers, auth=auth, params=params)
         response.raise_for_status()
         logger.info(f"[GET] {url} -> {response.status_code}")
         return response
@@ -22,7 +161,7 @@ def get(url, headers=None, auth=None, params=None):
 
 def post(url, data=None, json_data=None, headers=None, auth=None):
     try:
-        response = requests.post(url, data=data, json=json_data, headers=headers, auth=auth)
+        response = get_default_client().request("POST", url, data=data, json=json_data, headers=headers, auth=auth)
         response.raise_for_status()
         logger.info(f"[POST] {url} -> {response.status_code}")
         return response
@@ -31,7 +170,7 @@ def post(url, data=None, json_data=None, headers=None, auth=None):
 
 def put(url, data=None, json_data=None, headers=None, auth=None):
     try:
-        response = requests.put(url, data=data, json=json_data, headers=headers, auth=auth)
+        response = get_default_client().request("PUT", url, data=data, json=json_data, headers=headers, auth=auth)
         response.raise_for_status()
         logger.info(f"[PUT] {url} -> {response.status_code}")
         return response
@@ -40,7 +179,7 @@ def put(url, data=None, json_data=None, headers=None, auth=None):
 
 def delete(url, headers=None, auth=None):
     try:
-        response = requests.delete(url, headers=headers, auth=auth)
+        response = get_default_client().request("DELETE", url, headers=headers, auth=auth)
         logger.info(f"[DELETE] {url} -> {response.status_code}")
         return response
     except requests.exceptions.RequestException as e:
@@ -52,9 +191,9 @@ def delete(url, headers=None, auth=None):
 def send_request(method, url, headers=None, params=None, json=None, data=None, auth=None, timeout=10):
     try:
         logger.info(f"Request: [{method}] {url}")
-        response = requests.request(
-            method=method,
-            url=url,
+        response = get_default_client().request(
+            method,
+            url,
             headers=headers,
             params=params,
             json=json,
@@ -100,16 +239,21 @@ def assert_json_contains_keys(response, keys):
     assert not missing, f"[FAIL] Missing keys in response: {missing}"
     logger.info(f"[PASS] All keys {keys} present in response")
 
-def validate_json_schema(response, schema_path):
+def validate_json_schema(response, schema):
+    """
+    Validates the response body against `schema`, a mapping (dict or FrozenConfig) or a schema file path
+    (resolved against `paths.schema_dir`). Reports every error in one pass.
+    """
     try:
-        with open(schema_path, 'r') as file:
-            schema = json.load(file)
-        validate(instance=response.json(), schema=schema)
-        logger.info(f"[PASS] JSON matches schema.")
-    except ValidationError as e:
-        raise AssertionError(f"[FAIL] JSON schema validation error: {e.message}")
+        errors = _schema_registry.iter_errors(response.json(), schema)
     except Exception as e:
         raise Exception(f"[ERROR] Failed to validate schema: {str(e)}")
+    if errors:
+        details = "\n".join(
+            f"  - {'/'.join(str(p) for p in e.absolute_path) or '<root>'}: {e.message}" for e in errors
+        )
+        raise AssertionError(f"[FAIL] JSON schema validation failed with {len(errors)} error(s):\n{details}")
+    logger.info(f"[PASS] JSON matches schema.")
 
 def assert_response_time(response, threshold_seconds=2):
     duration = response.elapsed.total_seconds()
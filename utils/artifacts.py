@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.lazy_imports import lazy_import
+
+# Optional: without Pillow screenshots are stored as the PNG Playwright returns
+Image = lazy_import("PIL.Image")
+
+IMAGE_EXTENSIONS = {"webp": "webp", "jpeg": "jpg", "png": "png"}
+
+
+def encode_image(png_bytes, image_format="webp", quality=75):
+    """
+    Re-encodes a PNG screenshot. Returns (bytes, extension); falls back to the
+    original PNG when Pillow is missing or the result would not be smaller.
+    """
+    if image_format == "png":
+        return png_bytes, "png"
+    try:
+        image = Image.open(io.BytesIO(png_bytes))
+        if image_format == "jpeg":
+            image = image.convert("RGB")
+        out = io.BytesIO()
+        image.save(out, format=image_format.upper(), quality=quality)
+        encoded = out.getvalue()
+    except ImportError:
+        return png_bytes, "png"
+    if len(encoded) >= len(png_bytes):
+        return png_bytes, "png"
+    return encoded, IMAGE_EXTENSIONS[image_format]
+
+
+class ConsoleRecorder:
+    """
+    Keeps the last `max_entries` console messages and uncaught page errors,
+    so they can be saved when the test fails.
+    """
+
+    def __init__(self, page, max_entries=500):
+        self.entries = deque(maxlen=max_entries)
+        page.on("console", lambda message: self.entries.append(f"[{message.type}] {message.text}"))
+        page.on("pageerror", lambda error: self.entries.append(f"[pageerror] {error}"))
+
+    def text(self):
+        return "\n".join(self.entries)
+
+
+class FailureArtifacts:
+    """
+    Futures for one test's artifacts; `wait()` returns {kind: path or None}.
+    """
+
+    def __init__(self, nodeid, futures):
+        self.nodeid = nodeid
+        self.futures = futures
+
+    def wait(self, timeout=None):
+        results = {}
+        for kind, future in self.futures.items():
+            try:
+                results[kind] = future.result(timeout=timeout)
+            except Exception as e:
+                print(f"[WARN] Saving {kind} for {self.nodeid} failed: {e}")
+                results[kind] = None
+        return results
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for failure artifacts (screenshot, DOM, console log).
+
+    Only the capture itself runs on the test thread; hashing, image encoding,
+    gzip and disk writes run in a small thread pool. Identical content is
+    written once under its hash, and once `max_bytes` have been written further
+    screenshots and DOM snapshots are skipped.
+
+    Usage:
+        store = ArtifactStore("screenshots/<run>", max_bytes=200 * 1024 ** 2)
+        pending = store.capture(page, item.nodeid, console.text())
+        ...
+        paths = pending.wait()  # {"screenshot": ..., "dom": ..., "console": ...}
+        store.record(item.nodeid, paths)
+    """
+
+    def __init__(self, base_dir, max_bytes=None, image_format="webp", quality=75,
+                 full_page=False, capture_dom=True, workers=2):
+        if image_format not in IMAGE_EXTENSIONS:
+            raise ValueError(f"Unknown screenshot image format '{image_format}'. Expected one of {sorted(IMAGE_EXTENSIONS)}")
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self.image_format = image_format
+        self.quality = quality
+        self.full_page = full_page
+        self.capture_dom = capture_dom
+        self.bytes_written = 0
+        self.deduplicated = 0
+        self.skipped = 0
+        self._stored = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+
+    def over_budget(self):
+        return self.max_bytes is not None and self.bytes_written >= self.max_bytes
+
+    def capture(self, page, nodeid, console_text=None):
+        """
+        Grabs the raw artifacts from `page` (must run on the Playwright thread)
+        and queues them for encoding and storage.
+        """
+        futures = {}
+        if self.over_budget():
+            self.skipped += 1
+            print(f"[WARN] Artifact budget of {self.max_bytes / 1024 ** 2:.0f} MB reached — skipping screenshot/DOM for {nodeid}")
+        else:
+            try:
+                png = page.screenshot(full_page=self.full_page)
+                futures["screenshot"] = self._executor.submit(self._store_screenshot, png)
+            except Exception as e:
+                print(f"[WARN] Screenshot capture failed: {e}")
+            if self.capture_dom:
+                try:
+                    html = page.content()
+                    futures["dom"] = self._executor.submit(self._store, html.encode("utf-8"), "html.gz", True)
+                except Exception as e:
+                    print(f"[WARN] DOM capture failed: {e}")
+        if console_text:
+            futures["console"] = self._executor.submit(self._store, console_text.encode("utf-8"), "log", False)
+        return FailureArtifacts(nodeid, futures)
+
+    def _store_screenshot(self, png):
+        # Hash the raw capture so identical screens skip encoding entirely
+        digest = hashlib.sha256(png).hexdigest()
+        with self._lock:
+            if digest in self._stored:
+                self.deduplicated += 1
+                return self._stored[digest]
+        try:
+            data, extension = encode_image(png, self.image_format, self.quality)
+        except Exception as e:
+            # Keep the capture rather than lose the screenshot to an encoder error
+            print(f"[WARN] Encoding screenshot as {self.image_format} failed, storing PNG: {e}")
+            data, extension = png, "png"
+        return self._write(digest, data, extension)
+
+    def _store(self, raw, extension, compress):
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            if digest in self._stored:
+                self.deduplicated += 1
+                return self._stored[digest]
+        return self._write(digest, gzip.compress(raw) if compress else raw, extension)
+
+    def _write(self, digest, data, extension):
+        path = os.path.join(self.base_dir, "objects", digest[:2], f"{digest}.{extension}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self._stored[digest] = path
+            self.bytes_written += len(data)
+        return path
+
+    def record(self, nodeid, paths):
+        """
+        Appends the test's artifact paths to this worker's manifest, since the
+        stored files are named by hash.
+        """
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        os.makedirs(self.base_dir, exist_ok=True)
+        with open(os.path.join(self.base_dir, f"manifest-{worker}.jsonl"), "a") as f:
+            f.write(json.dumps(dict(paths, nodeid=nodeid)) + "\n")
+
+    def stats(self):
+        return {"bytes_written": self.bytes_written, "deduplicated": self.deduplicated, "skipped": self.skipped}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,148 @@
+import asyncio
+import datetime
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from utils.lazy_imports import lazy_import
+from utils.logger_utils import get_logger
+
+# Re-exported so async tests can use the same assertions as api_utils tests
+from utils.api_utils import (
+    join_url,
+    assert_status_code,
+    assert_json_key_value,
+    assert_json_contains_keys,
+    assert_response_time,
+)
+
+aiohttp = lazy_import("aiohttp")
+
+__all__ = [
+    "AsyncResponse",
+    "AsyncApiClient",
+    "run_sync",
+    "gather_requests",
+    "join_url",
+    "assert_status_code",
+    "assert_json_key_value",
+    "assert_json_contains_keys",
+    "assert_response_time",
+]
+
+logger = get_logger(name="async_api_utils")
+
+# -------------------------------------
+# Response
+# -------------------------------------
+class AsyncResponse:
+    """
+    Fully read response exposing the attributes used by the api_utils
+    assertions: status_code, headers, text, json() and elapsed.
+    """
+
+    def __init__(self, method, url, status_code, reason, headers, content, elapsed):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error: {self.reason} for url: {self.url}", response=self)
+
+# -------------------------------------
+# Async Client
+# -------------------------------------
+class AsyncApiClient:
+    """
+    aiohttp-based counterpart of api_utils.ApiClient. At most `concurrency`
+    requests are in flight at once.
+
+    Usage:
+        async with AsyncApiClient(base_url="https://reqres.in/api", concurrency=50) as client:
+            responses = await client.gather([{"url": f"/users?page={p}"} for p in range(1, 100)])
+    """
+
+    def __init__(self, base_url=None, default_headers=None, concurrency=20, timeout=10, log_requests=True):
+        self.base_url = base_url
+        self.default_headers = dict(default_headers or {})
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.log_requests = log_requests
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._session = aiohttp.ClientSession(
+            headers=self.default_headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+
+    async def request(self, url, method="GET", headers=None, params=None, json=None, data=None):
+        url = join_url(self.base_url, url)
+        if params:
+            params = {str(k): str(v) for k, v in params.items()}
+        async with self._semaphore:
+            start = time.perf_counter()
+            async with self._session.request(method, url, headers=headers, params=params, json=json, data=data) as resp:
+                content = await resp.read()
+            elapsed = datetime.timedelta(seconds=time.perf_counter() - start)
+        if self.log_requests:
+            logger.info(f"[{method}] {url} -> {resp.status} ({elapsed.total_seconds():.3f}s)")
+        return AsyncResponse(method, str(resp.url), resp.status, resp.reason, CaseInsensitiveDict(resp.headers), content, elapsed)
+
+    async def gather(self, specs, return_exceptions=False):
+        """
+        Sends every request spec concurrently and returns responses in input order.
+        A spec is a dict of `request` keyword arguments, e.g. {"method": "POST", "url": "/users", "json": {...}}.
+        """
+        return await asyncio.gather(*(self.request(**spec) for spec in specs), return_exceptions=return_exceptions)
+
+# -------------------------------------
+# Sync Entry Points
+# -------------------------------------
+def run_sync(coro):
+    """
+    Runs a coroutine to completion from synchronous code.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Playwright's sync API keeps a loop running in this thread, so use a fresh one elsewhere
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+def gather_requests(specs, concurrency=20, base_url=None, headers=None, timeout=10, return_exceptions=False):
+    """
+    Runs `specs` through an AsyncApiClient from synchronous test code and
+    returns the responses in input order.
+    """
+    async def run():
+        async with AsyncApiClient(base_url, headers, concurrency, timeout) as client:
+            return await client.gather(specs, return_exceptions=return_exceptions)
+
+    try:
+        return run_sync(run())
+    except Exception as e:
+        logger.error(f"[ERROR] Bulk request failed: {e}")
+        raise
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+
+from utils.file_lock import FileLock
+
+
+def storage_state_path(cache_dir, env, user):
+    return os.path.join(cache_dir, env, f"{user}.json")
+
+
+def is_storage_state_valid(path, ttl_seconds, min_cookie_lifetime=60):
+    """
+    Checks whether a saved Playwright storage state can still be used.
+
+    The file must be younger than `ttl_seconds` and none of its persistent
+    cookies may expire within `min_cookie_lifetime` seconds. Session cookies
+    (expires == -1) are bounded by the TTL only.
+    """
+    if not os.path.exists(path):
+        return False
+    if time.time() - os.path.getmtime(path) > ttl_seconds:
+        return False
+
+    try:
+        with open(path, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    cookies = state.get("cookies", [])
+    if not cookies:
+        return False
+
+    now = time.time()
+    for cookie in cookies:
+        expires = cookie.get("expires", -1)
+        if expires is not None and expires > 0 and expires - now < min_cookie_lifetime:
+            return False
+    return True
+
+
+def get_storage_state(browser, env, user, login_fn, cache_dir=".auth", ttl_seconds=1800, context_options=None,
+                      lock_timeout=120):
+    """
+    Returns the path of a storage state file for `user` in `env`, logging in
+    through `login_fn(page)` only when no valid cached state exists. The login
+    runs under a file lock, so on a cold cache one xdist worker logs in and the
+    others wait for its state instead of all logging in at once.
+
+    :param browser: Browser used to run the login flow when the cache is stale.
+    :param env: Environment name, part of the cache key.
+    :param user: Credential set name (key in testdata/login_data.json).
+    :param login_fn: Callable that drives the login flow on a fresh page.
+    :param cache_dir: Directory holding cached states.
+    :param ttl_seconds: Maximum age of a cached state.
+    :param context_options: Options for the temporary login context.
+    :param lock_timeout: Seconds to wait for another worker's login.
+    :return: Path to a JSON storage state usable as `new_context(storage_state=...)`.
+    """
+    path = storage_state_path(cache_dir, env, user)
+    if is_storage_state_valid(path, ttl_seconds):
+        return path
+
+    with FileLock(f"{path}.lock", timeout=lock_timeout):
+        # Another worker may have logged in while this one waited
+        if is_storage_state_valid(path, ttl_seconds):
+            return path
+        print(f"[Auth] No valid storage state for '{user}' on '{env}' — logging in")
+        context = browser.new_context(**(context_options or {}))
+        try:
+            page = context.new_page()
+            login_fn(page)
+            _save_storage_state(context, path)
+        finally:
+            context.close()
+
+    print(f"[Auth] Saved storage state: {path}")
+    return path
+
+
+def refresh_storage_state(context, page, env, user, login_fn, cache_dir=".auth", lock_timeout=120):
+    """
+    For a cached state the server no longer accepts (the restored session ended
+    up on the login page): drops it, logs in again on `page` and saves the new
+    state for the following tests.
+
+    :return: Path to the refreshed storage state.
+    """
+    path = storage_state_path(cache_dir, env, user)
+    print(f"[Auth] Cached session for '{user}' on '{env}' was rejected — logging in again")
+    with FileLock(f"{path}.lock", timeout=lock_timeout):
+        invalidate_storage_state(cache_dir, env, user)
+        login_fn(page)
+        _save_storage_state(context, path)
+    return path
+
+
+def _save_storage_state(context, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so parallel workers never read a half-written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    context.storage_state(path=tmp_path)
+    os.replace(tmp_path, path)
+
+
+def invalidate_storage_state(cache_dir, env, user):
+    path = storage_state_path(cache_dir, env, user)
+    if os.path.exists(path):
+        os.remove(path)
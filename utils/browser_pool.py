@@ -0,0 +1,74 @@
+import threading
+
+
+class BrowserPool:
+    """
+    Keeps one launched browser per (browser_name, instance) pair and hands it
+    out to tests, so each test only pays for a new BrowserContext.
+
+    Browsers are launched lazily on first use and recycled after `max_uses`
+    tests or as soon as they are found disconnected (crashed).
+
+    :param playwright: Started Playwright instance.
+    :param max_uses: Number of tests a browser serves before being relaunched (0 = never).
+    """
+
+    def __init__(self, playwright, max_uses=50):
+        self.playwright = playwright
+        self.max_uses = max_uses
+        self._browsers = {}
+        self._uses = {}
+        self._lock = threading.Lock()
+        self.launches = 0
+
+    def acquire(self, browser_instance, launch_options):
+        """
+        Returns a connected browser for the given (browser_name, instance) pair,
+        launching or relaunching it when needed.
+        """
+        key = tuple(browser_instance)
+        with self._lock:
+            browser = self._browsers.get(key)
+            if browser is not None and not browser.is_connected():
+                print(f"[Pool] Browser {key} disconnected — relaunching")
+                self._discard(key)
+                browser = None
+            elif browser is not None and self.max_uses and self._uses[key] >= self.max_uses:
+                print(f"[Pool] Browser {key} served {self._uses[key]} tests — recycling")
+                self._discard(key)
+                browser = None
+
+            if browser is None:
+                browser_name = key[0]
+                browser = getattr(self.playwright, browser_name).launch(**launch_options)
+                self._browsers[key] = browser
+                self._uses[key] = 0
+                self.launches += 1
+
+            self._uses[key] += 1
+            return browser
+
+    def release(self, browser_instance, crashed=False):
+        """
+        Hands a browser back after a test. A crashed browser is dropped so the
+        next test gets a fresh one.
+        """
+        key = tuple(browser_instance)
+        with self._lock:
+            browser = self._browsers.get(key)
+            if browser is not None and (crashed or not browser.is_connected()):
+                self._discard(key)
+
+    def close_all(self):
+        with self._lock:
+            for key in list(self._browsers):
+                self._discard(key)
+
+    def _discard(self, key):
+        browser = self._browsers.pop(key, None)
+        self._uses.pop(key, None)
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception as e:
+                print(f"[WARN] Failed to close browser {key}: {e}")
@@ -0,0 +1,105 @@
+import json
+import os
+import re
+
+BROWSER_TYPES = ("chromium", "firefox", "webkit")
+SLOT_PATTERN = re.compile(r"\b(chromium|firefox|webkit)-(\d+)\b")
+
+
+def slot_id(browser_name, instance):
+    return f"{browser_name}-{instance}"
+
+
+def slot_of(nodeid):
+    """
+    Returns the browser slot ("chromium-0") a test is parametrized with, or None.
+    """
+    if "[" not in nodeid:
+        return None
+    match = SLOT_PATTERN.search(nodeid[nodeid.index("["):])
+    return match.group(0) if match else None
+
+
+def item_slot(item):
+    """
+    Returns the browser slot a collected test is parametrized with, from its
+    `browser_instance` param, or None.
+    """
+    callspec = getattr(item, "callspec", None)
+    if callspec is None or "browser_instance" not in callspec.params:
+        return None
+    return slot_id(*callspec.params["browser_instance"])
+
+
+def save_slot_map(directory, worker, slots):
+    """
+    Writes {nodeid: slot} for one xdist worker's collection. The controller
+    only receives node ids, so the scheduler reads slots from here.
+    """
+    path = os.path.join(directory, f"{worker}.json")
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({nodeid: slot for nodeid, slot in slots.items() if slot}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def load_slot_map(directory, worker):
+    try:
+        with open(os.path.join(directory, f"{worker}.json"), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _slot_sort_key(slot):
+    browser_name, instance = slot.rsplit("-", 1)
+    return browser_name, int(instance)
+
+
+def assign_slots(slots, num_workers):
+    """
+    Gives every slot one owning worker index. Slots are handed out in contiguous
+    runs sorted by browser type, so a worker owning several slots keeps to as
+    few browser types as possible; with more workers than slots the owners are
+    spread out and the remaining workers own none.
+
+    :return: {slot: worker_index}
+    """
+    slots = sorted(set(slots), key=_slot_sort_key)
+    if num_workers < 1:
+        return {}
+    return {slot: position * num_workers // len(slots) for position, slot in enumerate(slots)}
+
+
+def _available_memory_mb():
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // 1024 ** 2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _usable_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def browser_capacity(cpus_per_browser=1.0, memory_mb_per_browser=600, reserve_memory_mb=1024, max_browsers=None):
+    """
+    How many browsers this machine can run side by side, limited by usable CPUs
+    and available memory (minus a reserve for the test processes themselves).
+    """
+    limits = [int(_usable_cpus() // cpus_per_browser)]
+    memory_mb = _available_memory_mb()
+    if memory_mb is not None:
+        limits.append(int((memory_mb - reserve_memory_mb) // memory_mb_per_browser))
+    if max_browsers:
+        limits.append(int(max_browsers))
+    return max(1, min(limits))
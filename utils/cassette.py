@@ -0,0 +1,161 @@
+import base64
+import datetime
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_MODES = ("off", "record", "replay", "record-missing")
+
+# Values that change on every call or carry secrets; stored as "<redacted>"
+VOLATILE_HEADERS = {
+    "authorization", "cookie", "set-cookie", "date", "expires", "age", "etag",
+    "last-modified", "x-request-id", "x-correlation-id", "cf-ray", "report-to",
+    "nel", "server-timing", "x-amz-cf-id", "x-amz-request-id",
+}
+REDACTED = "<redacted>"
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def _body_hash(json_body=None, data=None):
+    if json_body is not None:
+        payload = json.dumps(json_body, sort_keys=True, separators=(",", ":")).encode()
+    elif isinstance(data, dict):
+        payload = urlencode(sorted(data.items())).encode()
+    elif isinstance(data, str):
+        payload = data.encode()
+    elif isinstance(data, bytes):
+        payload = data
+    else:
+        payload = b""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def normalize_request(method, url, params=None, json_body=None, data=None):
+    """
+    Returns (method, url, query, body_hash) with scheme/host lower-cased and
+    query parameters from the URL and `params` merged and sorted, so equivalent
+    requests map to the same cassette entry.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += list(params.items()) if isinstance(params, dict) else list(params)
+    query = sorted((str(k), str(v)) for k, v in query)
+    base_url = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", "", ""))
+    return method.upper(), base_url, urlencode(query), _body_hash(json_body, data)
+
+
+def request_key(method, url, params=None, json_body=None, data=None):
+    normalized = normalize_request(method, url, params, json_body, data)
+    return hashlib.sha256("\n".join(normalized).encode()).hexdigest()
+
+
+def redact_headers(headers):
+    return {k: (REDACTED if k.lower() in VOLATILE_HEADERS else v) for k, v in (headers or {}).items()}
+
+
+class Cassette:
+    """
+    On-disk store of request/response pairs for `api_utils.send_request`.
+
+    Modes:
+        record          always call the network and (over)write the entry
+        replay          serve only from disk; a missing entry raises CassetteMiss
+        record-missing  serve from disk when present, otherwise record
+        off             bypass the cassette entirely
+    """
+
+    def __init__(self, directory="cassettes", mode="off"):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"[ERROR] Unknown cassette mode '{mode}'. Expected one of {CASSETTE_MODES}")
+        self.directory = directory
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def perform(self, method, url, send, headers=None, params=None, json_body=None, data=None):
+        """
+        Returns a response for the request, from disk or by calling `send()`
+        depending on the mode.
+        """
+        key = request_key(method, url, params, json_body, data)
+
+        if self.mode in ("replay", "record-missing"):
+            response = self.load(key)
+            if response is not None:
+                self._count("hits")
+                return response
+            self._count("misses")
+            if self.mode == "replay":
+                raise CassetteMiss(f"[ERROR] No cassette entry for [{method}] {url} (key {key[:12]})")
+
+        response = send()
+        self.save(key, method, url, headers, params, response)
+        self._count("recorded")
+        return response
+
+    def load(self, key):
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            entry = json.load(f)
+
+        stored = entry["response"]
+        response = requests.Response()
+        response.status_code = stored["status_code"]
+        response.reason = stored.get("reason")
+        response.url = stored["url"]
+        response.encoding = stored.get("encoding")
+        response.headers = CaseInsensitiveDict(stored.get("headers", {}))
+        response._content = base64.b64decode(stored["body"])
+        response.elapsed = datetime.timedelta(seconds=stored.get("elapsed", 0))
+        return response
+
+    def save(self, key, method, url, headers, params, response):
+        entry = {
+            "request": {
+                "method": method.upper(),
+                "url": url,
+                "params": params,
+                "headers": redact_headers(headers),
+            },
+            "response": {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "url": response.url,
+                "encoding": response.encoding,
+                "headers": redact_headers(response.headers),
+                "body": base64.b64encode(response.content or b"").decode(),
+                "elapsed": response.elapsed.total_seconds(),
+            },
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path_for(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, self.path_for(key))
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
@@ -1,6 +1,34 @@
 import os
 import shutil
 import datetime
+import threading
+import time
+from utils.file_lock import FileLock
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def _timestamp_folders(base_dir, timestamp_format):
+    """
+    Yields (timestamp, path) for subfolders named with `timestamp_format`.
+    """
+    if not os.path.isdir(base_dir):
+        return
+    for folder in os.listdir(base_dir):
+        folder_path = os.path.join(base_dir, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        try:
+            yield datetime.datetime.strptime(folder, timestamp_format), folder_path
+        except ValueError:
+            continue  # Skip non-timestamp folders
 
 def delete_old_timestamp_folders(base_dir: str, days_old: int = 7, timestamp_format="%Y-%m-%d_%H-%M-%S", marker_file=".last_cleanup"):
     """
@@ -13,9 +41,13 @@ def delete_old_timestamp_folders(base_dir: str, days_old: int = 7, timestamp_for
         days_old (int): Threshold in days for deletion.
         timestamp_format (str): Format used in folder names.
         marker_file (str): Name of the marker file to control cleanup frequency.
+
+    Returns:
+        int: Bytes reclaimed.
     """
     now = datetime.datetime.now()
     marker_path = os.path.join(base_dir, marker_file)
+    reclaimed = 0
 
     # Check if we should skip (weekly cleanup control)
     if os.path.exists(marker_path):
@@ -23,26 +55,119 @@ def delete_old_timestamp_folders(base_dir: str, days_old: int = 7, timestamp_for
             with open(marker_path, "r") as f:
                 last_run = datetime.datetime.strptime(f.read().strip(), "%Y-%m-%d")
             if (now - last_run).days < 7:
-                return  # Skip cleanup
+                return reclaimed  # Skip cleanup
         except Exception:
             pass
 
     # Cleanup logic
     if not os.path.exists(base_dir):
-        return
+        return reclaimed
 
-    for folder in os.listdir(base_dir):
-        folder_path = os.path.join(base_dir, folder)
-        if os.path.isdir(folder_path) and folder != marker_file:
-            try:
-                folder_time = datetime.datetime.strptime(folder, timestamp_format)
-                if (now - folder_time).days > days_old:
-                    shutil.rmtree(folder_path)
-                    print(f"[Cleanup] Deleted old folder: {folder_path}")
-            except ValueError:
-                continue  # Skip non-timestamp folders
+    for folder_time, folder_path in _timestamp_folders(base_dir, timestamp_format):
+        if (now - folder_time).days > days_old:
+            size = _dir_size(folder_path)
+            shutil.rmtree(folder_path, ignore_errors=True)
+            reclaimed += size
+            print(f"[Cleanup] Deleted old folder: {folder_path}")
 
     # Update marker
     os.makedirs(base_dir, exist_ok=True)
     with open(marker_path, "w") as f:
         f.write(now.strftime("%Y-%m-%d"))
+    return reclaimed
+
+def enforce_size_budget(base_dirs, max_total_bytes, timestamp_format="%Y-%m-%d_%H-%M-%S", keep_after=None, deadline=None):
+    """
+    Deletes timestamp folders across `base_dirs`, oldest first, until their
+    combined size is at most `max_total_bytes`.
+
+    Args:
+        base_dirs (list): Parent folders containing dated folders.
+        max_total_bytes (int): Size budget for all dated folders together.
+        keep_after (datetime): Folders stamped at or after this time (the current run) are never deleted.
+        deadline (float): time.monotonic() value after which deletion stops.
+
+    Returns:
+        int: Bytes reclaimed.
+    """
+    folders = []
+    for base_dir in base_dirs:
+        for folder_time, folder_path in _timestamp_folders(base_dir, timestamp_format):
+            folders.append((folder_time, folder_path, _dir_size(folder_path)))
+
+    total = sum(size for _, _, size in folders)
+    reclaimed = 0
+    for folder_time, folder_path, size in sorted(folders):
+        if total <= max_total_bytes:
+            break
+        if deadline is not None and time.monotonic() > deadline:
+            print("[Cleanup] Deadline reached — stopping size-based cleanup")
+            break
+        if keep_after is not None and folder_time >= keep_after:
+            continue
+        shutil.rmtree(folder_path, ignore_errors=True)
+        total -= size
+        reclaimed += size
+        print(f"[Cleanup] Deleted folder over size budget: {folder_path}")
+    return reclaimed
+
+def run_cleanup(folders, days_old=7, max_total_gb=None, lock_path=".cleanup.lock", keep_after=None, deadline_seconds=120):
+    """
+    Applies the age policy to each folder, then the size budget across all of
+    them. Only one process cleans at a time; others skip immediately.
+
+    Returns:
+        dict: {"ran": bool, "reclaimed_bytes": int}
+    """
+    lock = FileLock(lock_path, stale_after=max(deadline_seconds * 2, 60))
+    if not lock.acquire(blocking=False):
+        return {"ran": False, "reclaimed_bytes": 0}
+    try:
+        deadline = time.monotonic() + deadline_seconds
+        reclaimed = 0
+        for folder in folders:
+            if time.monotonic() > deadline:
+                break
+            reclaimed += delete_old_timestamp_folders(folder, days_old=days_old)
+        if max_total_gb:
+            reclaimed += enforce_size_budget(folders, int(max_total_gb * 1024 ** 3), keep_after=keep_after, deadline=deadline)
+        return {"ran": True, "reclaimed_bytes": reclaimed}
+    finally:
+        lock.release()
+
+class BackgroundCleanup:
+    """
+    Runs `run_cleanup` in a daemon thread so test collection does not wait on
+    directory walks and deletions.
+
+    Usage:
+        task = BackgroundCleanup(["screenshots", "logs"], days_old=7, max_total_gb=10).start()
+        ...
+        result = task.join(timeout=30)
+    """
+
+    def __init__(self, folders, **cleanup_options):
+        self.folders = folders
+        self.cleanup_options = cleanup_options
+        self.result = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="artifact-cleanup", daemon=True)
+
+    def _run(self):
+        try:
+            self.result = run_cleanup(self.folders, **self.cleanup_options)
+        except Exception as e:
+            self.error = e
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        """
+        Waits up to `timeout` seconds and returns the result, or None if still running.
+        """
+        self._thread.join(timeout)
+        if self.error is not None:
+            print(f"[WARN] Background cleanup failed: {self.error}")
+        return self.result
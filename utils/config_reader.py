@@ -1,5 +1,158 @@
+import copy
 import json
+import os
+import threading
+from collections.abc import Mapping
+
+DEFAULT_CONFIG_PATH = "data/config.json"
+
+_default_path = DEFAULT_CONFIG_PATH
+_cache = {}
+_lock = threading.Lock()
+
 
 def read_json_config(file_path):
-    with open(file_path) as f:
-        return json.load(f)
\ No newline at end of file
+    try:
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"[ERROR] JSON file not found: {file_path}")
+    except json.JSONDecodeError:
+        raise ValueError(f"[ERROR] Invalid JSON format in file: {file_path}")
+
+
+class FrozenConfig(Mapping):
+    """
+    Read-only view of a parsed config. Supports both `cfg["waits"]["default_timeout"]`
+    and `cfg.waits.default_timeout`; nested dicts are frozen too and lists become tuples.
+    """
+
+    def __init__(self, data):
+        object.__setattr__(self, "_data", {key: _freeze(value) for key, value in data.items()})
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __getattr__(self, name):
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(f"Config has no key '{name}'") from None
+
+    def __setattr__(self, name, value):
+        raise TypeError("FrozenConfig is read-only")
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"FrozenConfig({self.to_dict()!r})"
+
+    def to_dict(self):
+        """
+        Returns a mutable deep copy.
+        """
+        return {key: _thaw(value) for key, value in self._data.items()}
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return FrozenConfig(value)
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, FrozenConfig):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return copy.deepcopy(value)
+
+
+def _deep_merge(base, overlay):
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _overlay_path(path, env):
+    """
+    Per-environment overlay next to the base file, e.g. data/config.json ->
+    data/config.staging.json. The file may not exist (yet).
+    """
+    if not env:
+        return None
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{env}{ext}"
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _resolve_env_vars(data):
+    """
+    For every `<name>_env_var` key in the `environment` section, copies the value
+    of that environment variable (when set) into `<name>`, e.g.
+    auth_token_env_var=AUTH_TOKEN -> environment.auth_token.
+    """
+    env_section = data.get("environment")
+    if not isinstance(env_section, dict):
+        return data
+    for key, var_name in list(env_section.items()):
+        if key.endswith("_env_var") and var_name:
+            value = os.getenv(var_name)
+            if value:
+                env_section[key[:-len("_env_var")]] = value
+    return data
+
+
+def set_default_config_path(path):
+    """
+    Makes get_config() without arguments return `path` (set from --config in conftest).
+    """
+    global _default_path
+    _default_path = path
+
+
+def get_config(path=None, env=None):
+    """
+    Returns the FrozenConfig for `path` (default: the --config file).
+
+    The file is parsed once per process; later calls only stat the base file and
+    its overlay path and re-parse when an mtime changes or the overlay appears. The environment overlay is
+    chosen by `env`, then $TEST_ENV, then the file's own `environment.env`.
+    """
+    path = os.path.abspath(path or _default_path)
+    env = env or os.getenv("TEST_ENV")
+
+    with _lock:
+        cached = _cache.get((path, env))
+        if cached is not None:
+            watched, mtimes, frozen = cached
+            # A missing overlay is watched too (mtime None), so creating it later is picked up
+            if tuple(_mtime(layer) for layer in watched) == mtimes:
+                return frozen
+
+        data = read_json_config(path)
+        env_name = env or (data.get("environment") or {}).get("env")
+        overlay = _overlay_path(path, env_name)
+        watched = (path, overlay) if overlay else (path,)
+        mtimes = tuple(_mtime(layer) for layer in watched)
+        if overlay and os.path.exists(overlay):
+            data = _deep_merge(data, read_json_config(overlay))
+        frozen = FrozenConfig(_resolve_env_vars(data))
+        _cache[(path, env)] = (watched, mtimes, frozen)
+        return frozen
@@ -1,16 +1,7 @@
-import pymysql
-import json
+from utils.config_reader import read_json_config
+from utils.lazy_imports import lazy_import
 
-def read_json_config(path):
-    try:
-        with open(path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"[ERROR] Config file not found: {path}")
-    except json.JSONDecodeError:
-        raise ValueError(f"[ERROR] Invalid JSON format in config: {path}")
-    except Exception as e:
-        raise Exception(f"[ERROR] Failed to read config file: {str(e)}")
+pymysql = lazy_import("pymysql")
 
 def connect_to_mysql_from_config(config_path):
     try:
@@ -0,0 +1,321 @@
+import heapq
+import json
+import statistics
+import time
+
+from xdist.scheduler import LoadScheduling
+
+from utils.browser_slots import assign_slots, load_slot_map
+from utils.file_lock import FileLock
+
+LANES = ("ui", "api")
+
+
+# ------------------ HISTORY ------------------ #
+class DurationHistory:
+    """
+    Per-test durations from previous runs, smoothed with an exponential moving
+    average and stored as JSON: {nodeid: {"seconds": float, "runs": int}}.
+    """
+
+    def __init__(self, path=".test_durations.json", alpha=0.5):
+        self.path = path
+        self.alpha = alpha
+        self.durations = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                self.durations = json.load(f)
+        except (OSError, ValueError):
+            self.durations = {}
+        return self
+
+    def get(self, nodeid):
+        entry = self.durations.get(nodeid)
+        return entry["seconds"] if entry else None
+
+    def update(self, measured):
+        """
+        Folds {nodeid: seconds} from this run into the history and saves it.
+        Concurrent runs are serialised with a lock and re-read the file first.
+        """
+        if not measured:
+            return
+        with FileLock(f"{self.path}.lock", timeout=30):
+            self.load()
+            for nodeid, seconds in measured.items():
+                entry = self.durations.get(nodeid)
+                if entry is None:
+                    self.durations[nodeid] = {"seconds": round(seconds, 4), "runs": 1}
+                else:
+                    smoothed = self.alpha * seconds + (1 - self.alpha) * entry["seconds"]
+                    self.durations[nodeid] = {"seconds": round(smoothed, 4), "runs": entry["runs"] + 1}
+            with open(self.path, "w") as f:
+                json.dump(self.durations, f, indent=1, sort_keys=True)
+
+
+# ------------------ PLANNING ------------------ #
+def lane_of(nodeid, ui_paths=("tests/ui/",)):
+    return "ui" if nodeid.startswith(tuple(ui_paths)) else "api"
+
+
+def predict_durations(nodeids, history, lanes, defaults):
+    """
+    Returns {nodeid: seconds}. Tests without history get the median of known
+    tests in the same lane, or the lane's configured default.
+    """
+    known = {lane: [] for lane in LANES}
+    for nodeid in nodeids:
+        seconds = history.get(nodeid)
+        if seconds is not None:
+            known[lanes[nodeid]].append(seconds)
+    fallback = {lane: statistics.median(values) if values else defaults[lane] for lane, values in known.items()}
+    return {nodeid: history.get(nodeid) if history.get(nodeid) is not None else fallback[lanes[nodeid]]
+            for nodeid in nodeids}
+
+
+def simulate_makespan(durations, groups, worker_prefs):
+    """
+    Simulates the dispatch policy: whenever a worker frees up it takes the
+    longest remaining test from the first non-empty group in its preference
+    list. A worker with nothing left that it may take retires.
+
+    :param durations: {test: seconds}
+    :param groups: {test: group} (a lane or a browser slot)
+    :param worker_prefs: for each worker, the groups it may take from, in order
+    :return: (makespan, [busy seconds per worker])
+    """
+    queues = {}
+    for test in sorted(durations, key=durations.get):
+        queues.setdefault(groups[test], []).append(test)
+    busy = [0.0] * len(worker_prefs)
+    finish = [0.0] * len(worker_prefs)
+    free_at = [(0.0, i) for i in range(len(worker_prefs))]
+    heapq.heapify(free_at)
+    while free_at and any(queues.values()):
+        now, worker = heapq.heappop(free_at)
+        queue = next((queues[group] for group in worker_prefs[worker] if queues.get(group)), None)
+        if queue is None:
+            continue
+        test = queue.pop()
+        busy[worker] += durations[test]
+        finish[worker] = now + durations[test]
+        heapq.heappush(free_at, (finish[worker], worker))
+    return max(finish, default=0.0), busy
+
+
+def lane_prefs(worker_lanes):
+    """
+    A worker serves its own lane first and the other lane once its own is drained.
+    """
+    return [[lane] + [other for other in LANES if other != lane] for lane in worker_lanes]
+
+
+def plan_lanes(durations, lanes, num_workers):
+    """
+    Picks how many workers serve the UI lane so the simulated makespan is minimal.
+
+    :return: (worker_lanes, predicted_makespan)
+    """
+    has = {lane: any(lanes[t] == lane for t in durations) for lane in LANES}
+    if num_workers < 2 or not all(has.values()):
+        only = "ui" if has["ui"] else "api"
+        worker_lanes = [only] * num_workers
+        return worker_lanes, simulate_makespan(durations, lanes, lane_prefs(worker_lanes))[0]
+    best = None
+    for ui_workers in range(1, num_workers):
+        worker_lanes = ["ui"] * ui_workers + ["api"] * (num_workers - ui_workers)
+        makespan = simulate_makespan(durations, lanes, lane_prefs(worker_lanes))[0]
+        if best is None or makespan < best[1]:
+            best = (worker_lanes, makespan)
+    return best
+
+
+def plan_slots(durations, groups, num_workers):
+    """
+    Gives each browser slot one owning worker. Owners run only their own slots'
+    UI tests (so only their browsers are ever launched) and then help with
+    unslotted tests; workers owning no slot run unslotted tests only.
+
+    :return: (worker_prefs, predicted_makespan)
+    """
+    owners = assign_slots([g for g in set(groups.values()) if g not in LANES], num_workers)
+    worker_prefs = []
+    for worker in range(num_workers):
+        owned = [slot for slot, owner in owners.items() if owner == worker]
+        worker_prefs.append(owned + (["ui", "api"] if owned else ["api", "ui"]))
+    return worker_prefs, simulate_makespan(durations, groups, worker_prefs)[0]
+
+
+def choose_plan(durations, lanes, slots, num_workers):
+    """
+    Plans in lane mode and, when tests carry browser slots, in slot mode too, and
+    keeps whichever predicts the shorter makespan (slot mode on a tie, for its
+    warm browsers). Slot mode loses when there are fewer slots than workers with
+    UI work to share, e.g. one chromium slot pinning every UI test to one worker.
+
+    :param slots: {test: slot or None}
+    :return: (worker_prefs, groups, predicted_makespan)
+    """
+    worker_lanes, lane_makespan = plan_lanes(durations, lanes, num_workers)
+    best = (lane_prefs(worker_lanes), lanes, lane_makespan)
+    if any(slots.values()):
+        groups = {test: slots[test] or lanes[test] for test in durations}
+        slot_prefs, slot_makespan = plan_slots(durations, groups, num_workers)
+        if slot_makespan <= lane_makespan:
+            best = (slot_prefs, groups, slot_makespan)
+    return best
+
+
+# ------------------ XDIST SCHEDULER ------------------ #
+class DurationScheduling(LoadScheduling):
+    """
+    Longest-processing-time-first scheduling with separate UI and API lanes.
+
+    When tests are parametrized with browser slots ("chromium-0") and that
+    predicts no longer a run, each slot is owned by one worker and its tests are
+    routed there, so every worker keeps a fixed, warm browser. Otherwise workers
+    are split between the UI and API lanes so the predicted makespan is minimal.
+
+    Each worker holds at most `queue_depth` tests and, whenever one finishes,
+    receives the longest pending test it may take, so a single slow worker
+    cannot set the run time.
+    """
+
+    def __init__(self, config, log=None, history=None, ui_paths=("tests/ui/",),
+                 defaults=None, queue_depth=2, slot_map_dir=None):
+        """
+        :param slot_map_dir: Where workers saved each test's browser slot
+                             (browser_slots.save_slot_map); without it every
+                             test is scheduled by lane only.
+        """
+        super().__init__(config, log)
+        self.slot_map_dir = slot_map_dir
+        self.history = history or DurationHistory()
+        self.ui_paths = tuple(ui_paths)
+        self.defaults = dict({"ui": 30.0, "api": 1.0}, **(defaults or {}))
+        self.queue_depth = max(queue_depth, 2)  # xdist needs 2 queued tests (or shutdown) to run one
+        self.lanes = {}
+        self.groups = {}
+        self.predicted = {}
+        self.node2prefs = {}
+        self.slot_owner = {}
+        self.predicted_makespan = None
+        self.started_at = None
+        self.finished_at = None
+        self.node_busy = {}
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        collecting_node, self.collection = next(iter(self.node2collection.items()))
+        if not self.collection:
+            return
+        self.lanes = {nodeid: lane_of(nodeid, self.ui_paths) for nodeid in self.collection}
+        self.predicted = predict_durations(self.collection, self.history, self.lanes, self.defaults)
+
+        nodes = sorted(self.nodes, key=lambda node: int(node.gateway.id.lstrip("gw") or 0))
+        slot_map = load_slot_map(self.slot_map_dir, collecting_node.gateway.id) if self.slot_map_dir else {}
+        slots = {nodeid: slot_map.get(nodeid) for nodeid in self.collection}
+        worker_prefs, self.groups, self.predicted_makespan = choose_plan(self.predicted, self.lanes, slots, len(nodes))
+        self.node2prefs = dict(zip(nodes, worker_prefs))
+        self.slot_owner = {group: node for node, prefs in self.node2prefs.items() for group in prefs if group not in LANES}
+        self.pending[:] = range(len(self.collection))
+        self._sort_pending()
+        self.started_at = time.monotonic()
+
+        for node in nodes:
+            self.check_schedule(node)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        if self.pending:
+            missing = self.queue_depth - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        if not any(self._allowed(node, index) for index in self.pending):
+            # Nothing left this worker may run: let it finish what it holds
+            node.shutdown()
+
+    def remove_node(self, node):
+        """
+        As LoadScheduling.remove_node, but re-sorts pending before handing a
+        crashed worker's tests to the others: _take relies on longest-first order.
+        """
+        pending = self.node2pending.pop(node)
+        if not pending:
+            return None
+        crashitem = self.collection[pending.pop(0)]
+        self.pending.extend(pending)
+        self._sort_pending()
+        for other in self.node2pending:
+            self.check_schedule(other)
+        return crashitem
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        self.node_busy[node.gateway.id] = self.node_busy.get(node.gateway.id, 0.0) + duration
+        self.finished_at = time.monotonic()
+        super().mark_test_complete(node, item_index, duration)
+
+    def _sort_pending(self):
+        self.pending.sort(key=lambda index: self.predicted[self.collection[index]], reverse=True)
+
+    def _allowed_groups(self, node):
+        # Slots whose owner went away (crash) may be picked up by anyone
+        orphaned = [slot for slot, owner in self.slot_owner.items() if owner not in self.node2pending]
+        return self.node2prefs.get(node, list(LANES)) + orphaned
+
+    def _allowed(self, node, index):
+        return self.groups.get(self.collection[index]) in self._allowed_groups(node)
+
+    def _take(self, node):
+        """
+        Pops the longest pending test from the node's most preferred group, or None.
+        self.pending is longest-first, so the first match in a group is its longest test.
+        """
+        pending_groups = [self.groups.get(self.collection[index]) for index in self.pending]
+        for group in self._allowed_groups(node):
+            if group in pending_groups:
+                return self.pending.pop(pending_groups.index(group))
+        return None
+
+    def _send_tests(self, node, num):
+        tests = []
+        for _ in range(num):
+            index = self._take(node)
+            if index is None:
+                break
+            tests.append(index)
+        if tests:
+            self.node2pending[node].extend(tests)
+            node.send_runtest_some(tests)
+
+    def summary(self):
+        """
+        Returns predicted vs actual makespan and, per worker, the slots or lane
+        it served and its busy time.
+        """
+        actual = None
+        if self.started_at is not None and self.finished_at is not None:
+            actual = self.finished_at - self.started_at
+        workers = {}
+        for node, prefs in self.node2prefs.items():
+            slots = [group for group in prefs if group not in LANES]
+            workers[node.gateway.id] = {
+                "serves": ", ".join(slots) if slots else f"{prefs[0]} lane",
+                "busy_seconds": round(self.node_busy.get(node.gateway.id, 0.0), 2),
+            }
+        return {"predicted_makespan": self.predicted_makespan, "actual_makespan": actual, "workers": workers}
@@ -1,7 +1,7 @@
-import openpyxl
-import pandas as pd
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment
+from utils.lazy_imports import lazy_import
+
+openpyxl = lazy_import("openpyxl")
+pd = lazy_import("pandas")
 
 
 class ExcelCSVUtils:
@@ -0,0 +1,77 @@
+import os
+import time
+
+
+class FileLockTimeout(Exception):
+    pass
+
+
+class FileLock:
+    """
+    Cross-process lock based on exclusive creation of a lock file, so pytest-xdist
+    workers (and parallel pytest runs) can coordinate on shared files.
+
+    A lock file older than `stale_after` seconds is treated as left behind by a
+    crashed process and removed.
+
+    Usage:
+        with FileLock("reports/.cleanup.lock", timeout=10):
+            ...
+    """
+
+    def __init__(self, path, timeout=30, poll_interval=0.05, stale_after=600):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._fd = None
+
+    def acquire(self, blocking=True):
+        """
+        Returns True once the lock is held; with blocking=False returns False
+        immediately if another process holds it.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return True
+            except FileExistsError:
+                self._remove_if_stale()
+                if not blocking:
+                    return False
+                if time.monotonic() >= deadline:
+                    raise FileLockTimeout(f"[ERROR] Timed out after {self.timeout}s waiting for lock: {self.path}")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def is_held(self):
+        return self._fd is not None
+
+    def _remove_if_stale(self):
+        try:
+            if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -1,16 +1,7 @@
-import json
 import yaml
+from utils.config_reader import read_json_config  # Re-exported for existing imports
 
-def read_json_config(file_path):
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"[ERROR] JSON file not found: {file_path}")
-    except json.JSONDecodeError:
-        raise ValueError(f"[ERROR] Invalid JSON format in file: {file_path}")
-    except Exception as e:
-        raise Exception(f"[ERROR] Unexpected error reading JSON: {str(e)}")
+__all__ = ["read_json_config", "read_yaml_config", "read_text_file", "write_text_file"]
 
 def read_yaml_config(file_path):
     try:
@@ -0,0 +1,59 @@
+import os
+import re
+
+HAR_MODES = ("off", "record", "replay")
+
+
+def har_path_for(har_dir, nodeid):
+    """
+    Maps a pytest node id to a HAR file path, e.g.
+    'tests/ui/login/test_login.py::test_valid_login[chromium-0]' ->
+    '<har_dir>/tests_ui_login_test_login.py_test_valid_login_chromium-0_.har'
+    """
+    file_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid) + ".har"
+    return os.path.join(har_dir, file_name)
+
+
+class HarSession:
+    """
+    Per-test HAR record/replay.
+
+    record: the context writes every request/response to the test's HAR on close.
+    replay: requests are served from the test's HAR; anything not in it is
+            aborted and listed in `unmatched`, so stale recordings are easy to spot.
+    """
+
+    def __init__(self, mode, har_dir, nodeid):
+        if mode not in HAR_MODES:
+            raise ValueError(f"[ERROR] Unknown HAR mode '{mode}'. Expected one of {HAR_MODES}")
+        self.mode = mode
+        self.nodeid = nodeid
+        self.path = har_path_for(har_dir, nodeid)
+        self.unmatched = []
+
+    @property
+    def has_recording(self):
+        return os.path.exists(self.path)
+
+    def context_options(self):
+        if self.mode != "record":
+            return {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        return {"record_har_path": self.path, "record_har_content": "embed"}
+
+    def install_unmatched_catcher(self, context):
+        """
+        Must be registered before any other route so it runs last: it only sees
+        requests that neither the HAR nor other handlers served.
+        """
+        if self.mode == "replay":
+            context.route("**/*", self._abort_unmatched)
+
+    def install_replay(self, context):
+        if self.mode == "replay":
+            context.route_from_har(self.path, not_found="fallback")
+
+    def _abort_unmatched(self, route):
+        request = route.request
+        self.unmatched.append(f"{request.method} {request.url}")
+        route.abort("internetdisconnected")
@@ -1,43 +1,141 @@
+import hashlib
+import json
+import os
+import time
 import requests
-import pymysql
-from utils.config_reader import read_json_config
+from concurrent.futures import ThreadPoolExecutor, wait
+from utils.config_reader import get_config
+from utils.file_lock import FileLock
+from utils.lazy_imports import lazy_import
 
-def check_web_app():
-    config_path = "data/config.json"
-    config = read_json_config(config_path)
+pymysql = lazy_import("pymysql")
+
+def check_web_app(config=None, timeout=5):
+    config = config or get_config()
     url = config["environment"]["base_url"]
     try:
-        response = requests.get(url, timeout=5)
+        response = requests.get(url, timeout=timeout)
         return response.status_code == 200
     except Exception:
         return False
 
-def check_mobile_backend():
-    config_path = "data/config.json"
-    config = read_json_config(config_path)
+def check_mobile_backend(config=None, timeout=5):
+    config = config or get_config()
     api_endpoint = config["environment"]["api_url"]
     try:
-        response = requests.get(f"{api_endpoint}", timeout=5)
+        response = requests.get(f"{api_endpoint}", timeout=timeout)
         return response.status_code == 200
     except Exception:
         return False
 
-def check_api():
-    config_path = "data/config.json"
-    config = read_json_config(config_path)
+def check_api(config=None, timeout=5):
+    config = config or get_config()
     endpoint = config["environment"]["api_url"]
     try:
-        response = requests.get(endpoint, timeout=5)
+        response = requests.get(endpoint, timeout=timeout)
         return response.status_code == 200
     except Exception:
         return False
 
-def check_database(host, user, password, db):
+def check_database(host, user, password, db, timeout=5):
     try:
-        conn = pymysql.connect(host=host, user=user, password=password, database=db, connect_timeout=5)
+        conn = pymysql.connect(host=host, user=user, password=password, database=db, connect_timeout=timeout)
         with conn.cursor() as cur:
             cur.execute("SELECT 1")
         conn.close()
         return True
     except Exception:
         return False
+
+# ------------------ PRE-SUITE GATE ------------------ #
+def build_health_checks(config, names=("web_app", "api", "mobile_backend", "database"), timeout=5):
+    """
+    Returns {name: callable} for the requested checks, skipping any whose
+    endpoint is not configured (e.g. an empty api_url).
+    """
+    env = config.get("environment", {})
+    checks = {}
+    if "web_app" in names and env.get("base_url"):
+        checks["web_app"] = lambda: check_web_app(config, timeout)
+    if "api" in names and env.get("api_url"):
+        checks["api"] = lambda: check_api(config, timeout)
+    if "mobile_backend" in names and env.get("api_url"):
+        checks["mobile_backend"] = lambda: check_mobile_backend(config, timeout)
+    if "database" in names and config.get("mysql", {}).get("host"):
+        mysql = config["mysql"]
+        password = env.get("db_password") or mysql.get("password")
+        checks["database"] = lambda: check_database(mysql["host"], mysql["username"], password, mysql["database"], timeout)
+    return checks
+
+def _timed_check(check):
+    start = time.perf_counter()
+    try:
+        ok, error = bool(check()), None
+    except Exception as e:
+        ok, error = False, str(e)
+    return {"ok": ok, "latency_ms": round((time.perf_counter() - start) * 1000, 1), "error": error}
+
+def run_health_checks(checks, deadline_seconds=15):
+    """
+    Runs all checks concurrently. Checks still running at the deadline are
+    reported as failed.
+
+    :return: {name: {"ok": bool, "latency_ms": float, "error": str | None}}
+    """
+    if not checks:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="health-check")
+    futures = {executor.submit(_timed_check, check): name for name, check in checks.items()}
+    done, _ = wait(futures, timeout=deadline_seconds)
+    results = {}
+    for future, name in futures.items():
+        if future in done:
+            results[name] = future.result()
+        else:
+            results[name] = {"ok": False, "latency_ms": deadline_seconds * 1000, "error": "deadline exceeded"}
+    # Do not wait for checks stuck past the deadline
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+def health_cache_key(config, names):
+    """
+    Identifies what a cached gate result was probed against: the environment
+    name plus a hash of the configured checks and their endpoints.
+    """
+    env = config.get("environment", {})
+    targets = {
+        "checks": sorted(names),
+        "base_url": env.get("base_url"),
+        "api_url": env.get("api_url"),
+        "mysql_host": config.get("mysql", {}).get("host"),
+    }
+    digest = hashlib.sha256(json.dumps(targets, sort_keys=True).encode()).hexdigest()[:16]
+    return f"{env.get('env', 'default')}-{digest}"
+
+def run_health_gate(checks, deadline_seconds=15, cache_path=".health_cache.json", ttl_seconds=60, cache_key=None):
+    """
+    Returns (results, from_cache). Results younger than `ttl_seconds` that were
+    stored under the same `cache_key` are read from `cache_path`; otherwise one
+    process probes while the others wait on the lock and then read its results.
+    """
+    with FileLock(f"{cache_path}.lock", timeout=deadline_seconds + 10):
+        try:
+            if time.time() - os.path.getmtime(cache_path) < ttl_seconds:
+                with open(cache_path, "r") as f:
+                    cached = json.load(f)
+                if cached.get("key") == cache_key and set(cached.get("results", {})) == set(checks):
+                    return cached["results"], True
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        results = run_health_checks(checks, deadline_seconds)
+        with open(cache_path, "w") as f:
+            json.dump({"key": cache_key, "results": results}, f, indent=2)
+        return results, False
+
+def format_health_table(results):
+    lines = [f"{'Check':<16}{'Status':<8}{'Latency':>12}  Error", "-" * 52]
+    for name, result in results.items():
+        status = "UP" if result["ok"] else "DOWN"
+        lines.append(f"{name:<16}{status:<8}{result['latency_ms']:>9.0f} ms  {result.get('error') or ''}")
+    return "\n".join(lines)
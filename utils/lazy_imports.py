@@ -0,0 +1,38 @@
+import importlib
+import sys
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access, so heavy
+    optional dependencies (twilio, pandas, openpyxl, fitz, pymysql, ...) cost
+    nothing for test runs that never use them. A missing package only raises
+    ImportError when the helper that needs it is actually called.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    Returns the module if it is already imported, otherwise a LazyModule.
+
+    Usage:
+        pd = lazy_import("pandas")
+        twilio_rest = lazy_import("twilio.rest")
+    """
+    return sys.modules.get(name) or LazyModule(name)
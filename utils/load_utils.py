@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import math
+import time
+
+from utils.async_api_utils import AsyncApiClient, run_sync
+
+logger = logging.getLogger("load_utils")
+
+# -------------------------------------
+# Latency Histogram
+# -------------------------------------
+class LatencyHistogram:
+    """
+    HDR-style histogram of integer microsecond latencies.
+
+    Values are grouped into log-linear buckets so that every recorded value is
+    reproduced within 10^-significant_figures relative error, using a fixed
+    amount of memory regardless of how many samples are recorded.
+    """
+
+    def __init__(self, significant_figures=3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("[ERROR] significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        largest_single_unit = 2 * 10 ** significant_figures
+        self._sub_bucket_bits = math.ceil(math.log2(largest_single_unit))
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._sub_bucket_half = self._sub_bucket_count // 2
+        self._counts = {}
+        self.total_count = 0
+        self.min = None
+        self.max = 0
+        self._sum = 0
+
+    def _index(self, value):
+        bucket = max(0, value.bit_length() - self._sub_bucket_bits)
+        return bucket * self._sub_bucket_half + (value >> bucket)
+
+    def _highest_equivalent_value(self, index):
+        if index < self._sub_bucket_count:
+            return index
+        bucket = (index - self._sub_bucket_count) // self._sub_bucket_half + 1
+        sub_bucket = (index - self._sub_bucket_count) % self._sub_bucket_half + self._sub_bucket_half
+        return (sub_bucket << bucket) + (1 << bucket) - 1
+
+    def record(self, value_us, count=1):
+        value = max(0, int(value_us))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += count
+        self._sum += value * count
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def merge(self, other):
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self._sum += other._sum
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    @property
+    def mean(self):
+        return self._sum / self.total_count if self.total_count else 0
+
+    def percentile(self, percentile):
+        """
+        Returns the value (in microseconds) at or below which `percentile`
+        percent of the samples fall.
+        """
+        if not self.total_count:
+            return 0
+        target = max(1, math.ceil(percentile / 100 * self.total_count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent_value(index), self.max)
+        return self.max
+
+# -------------------------------------
+# Load Result
+# -------------------------------------
+class LoadResult:
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.exceptions = {}
+        self.duration = 0.0
+
+    @property
+    def error_rate(self):
+        return self.errors / self.requests if self.requests else 0.0
+
+    def percentile_ms(self, percentile):
+        return self.histogram.percentile(percentile) / 1000
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "duration_s": round(self.duration, 3),
+            "throughput_rps": round(self.requests / self.duration, 1) if self.duration else 0.0,
+            "mean_ms": round(self.histogram.mean / 1000, 3),
+            "p50_ms": self.percentile_ms(50),
+            "p90_ms": self.percentile_ms(90),
+            "p99_ms": self.percentile_ms(99),
+            "max_ms": self.histogram.max / 1000,
+        }
+
+# -------------------------------------
+# Load Runner
+# -------------------------------------
+async def _send(client, spec, intended_start, result):
+    try:
+        response = await client.request(**spec)
+        # Measured from when the request *should* have started, so a stalled
+        # server cannot hide queueing delay (coordinated omission)
+        result.histogram.record((time.perf_counter() - intended_start) * 1_000_000)
+        if response.status_code >= 400:
+            result.errors += 1
+    except Exception as e:
+        result.errors += 1
+        name = type(e).__name__
+        result.exceptions[name] = result.exceptions.get(name, 0) + 1
+    result.requests += 1
+
+async def _run_fixed_rate(client, spec, duration, rps, result):
+    interval = 1 / rps
+    start = time.perf_counter()
+    tasks = []
+    sent = 0
+    while sent * interval < duration:
+        intended = start + sent * interval
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_send(client, spec, intended, result)))
+        sent += 1
+    await asyncio.gather(*tasks)
+
+async def _run_fixed_concurrency(client, spec, duration, concurrency, result):
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await _send(client, spec, time.perf_counter(), result)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+def run_load(spec, duration_seconds, rps=None, concurrency=10, base_url=None, headers=None, timeout=10):
+    """
+    Replays one request spec for `duration_seconds` and returns a LoadResult.
+
+    With `rps`, requests are started on a fixed schedule (open model) and at
+    most `concurrency` are in flight; without it, `concurrency` workers send
+    back-to-back requests (closed model).
+
+    :param spec: Request keyword arguments, e.g. {"method": "GET", "url": "/users", "params": {"page": 2}}.
+    """
+    result = LoadResult()
+
+    async def run():
+        async with AsyncApiClient(base_url, headers, concurrency, timeout, log_requests=False) as client:
+            start = time.perf_counter()
+            if rps:
+                await _run_fixed_rate(client, spec, duration_seconds, rps, result)
+            else:
+                await _run_fixed_concurrency(client, spec, duration_seconds, concurrency, result)
+            result.duration = time.perf_counter() - start
+
+    mode = f"{rps} rps" if rps else f"{concurrency} concurrent"
+    logger.info(f"[LOAD] {spec.get('method', 'GET')} {spec['url']} for {duration_seconds}s at {mode}")
+    run_sync(run())
+    logger.info(f"[LOAD] {result.summary()}")
+    return result
+
+# -------------------------------------
+# Assertion Utilities
+# -------------------------------------
+def assert_latency_percentile(result, percentile, threshold_ms):
+    actual = result.percentile_ms(percentile)
+    assert actual <= threshold_ms, f"[FAIL] p{percentile} latency {actual:.2f}ms exceeds {threshold_ms}ms"
+    logger.info(f"[PASS] p{percentile} latency: {actual:.2f}ms")
+
+def assert_error_rate(result, max_error_rate=0.0):
+    actual = result.error_rate
+    assert actual <= max_error_rate, f"[FAIL] Error rate {actual:.2%} exceeds {max_error_rate:.2%} ({result.errors}/{result.requests})"
+    logger.info(f"[PASS] Error rate: {actual:.2%}")
@@ -0,0 +1,75 @@
+"""
+Interleaves the per-worker JSON-lines logs of one run by timestamp.
+
+Usage:
+    python utils/log_merge.py logs/2025-01-10_12-00-00            # writes merged.jsonl
+    python utils/log_merge.py logs/2025-01-10_12-00-00 --text     # human-readable to stdout
+"""
+import argparse
+import glob
+import heapq
+import json
+import os
+import sys
+
+MERGED_NAME = "merged.jsonl"
+
+
+def _read_entries(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # Tolerate a partially written last line
+
+
+def iter_merged(run_dir):
+    """
+    Yields log entries from every <worker>.jsonl in `run_dir`, ordered by `ts`.
+    Each worker file is already in time order, so this streams with heapq.merge.
+    """
+    paths = sorted(p for p in glob.glob(os.path.join(run_dir, "*.jsonl")) if os.path.basename(p) != MERGED_NAME)
+    return heapq.merge(*(_read_entries(p) for p in paths), key=lambda entry: entry.get("ts", 0))
+
+
+def merge_logs(run_dir, output=None):
+    """
+    Writes the merged log to `output` (default <run_dir>/merged.jsonl).
+
+    :return: Number of entries written.
+    """
+    output = output or os.path.join(run_dir, MERGED_NAME)
+    count = 0
+    with open(output, "w", encoding="utf-8") as f:
+        for entry in iter_merged(run_dir):
+            f.write(json.dumps(entry) + "\n")
+            count += 1
+    return count
+
+
+def format_entry(entry):
+    where = " ".join(part for part in (entry.get("worker"), entry.get("browser"), entry.get("nodeid")) if part)
+    return f"{entry.get('time')} {entry.get('level', ''):<8} [{where}] {entry.get('msg')}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("run_dir")
+    parser.add_argument("-o", "--output", help="Merged JSON-lines file (default <run_dir>/merged.jsonl)")
+    parser.add_argument("--text", action="store_true", help="Print readable lines to stdout instead")
+    args = parser.parse_args()
+
+    if args.text:
+        for entry in iter_merged(args.run_dir):
+            print(format_entry(entry))
+        return
+    count = merge_logs(args.run_dir, args.output)
+    print(f"[INFO] Merged {count} log entries from {args.run_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,164 @@
+import atexit
+import datetime
+import json
 import logging
+import logging.handlers
+import os
+import queue
 
-def get_logger(log_file='test_log.log'):
+LOGGER_NAME = 'automation_logger'
+
+# Copied onto every record in the calling thread, before it is queued
+_test_context = {"nodeid": None, "browser": None}
+_listener = None
+
+
+def worker_id():
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def run_timestamp():
+    """
+    The run's timestamp, shared with xdist workers through the environment.
+    """
+    return os.environ.setdefault("RUN_TIMESTAMP", datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))
+
+
+def set_test_context(nodeid=None, browser=None):
+    """
+    Tags every following log record with the running test. Call with no
+    arguments to clear it.
+    """
+    _test_context["nodeid"] = nodeid
+    _test_context["browser"] = browser
+
+
+def get_test_context():
+    return dict(_test_context)
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.nodeid = _test_context["nodeid"]
+        record.browser = _test_context["browser"]
+        record.worker = worker_id()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per line; `ts` (epoch seconds) is what the merge tool sorts on.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": record.created,
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "worker": getattr(record, "worker", worker_id()),
+            "nodeid": getattr(record, "nodeid", None),
+            "browser": getattr(record, "browser", None),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def log_dir(base_dir="logs"):
+    return os.path.join(base_dir, run_timestamp())
+
+
+def configure_logging(config=None):
     """
-    Creates and returns a logger that logs messages to a file.
-    Ensures only one handler is added to prevent duplicate logs.
+    Starts the logging pipeline once per process: callers only put records on
+    a queue, and a background QueueListener writes them as JSON lines to
+    logs/<RUN_TIMESTAMP>/<worker>.jsonl (plus plain text to the console at
+    `console_level`). Records below `level` are dropped before formatting.
+    Records do not propagate to the root logger; see attach_handler().
+    The pytest session calls this from pytest_configure, once --config is set.
 
-    :param log_file: Path to the log file.
+    :param config: The "logging" config section (level, console_level, dir);
+                   read from get_config() when omitted.
     :return: Configured logger instance.
     """
-    logger = logging.getLogger('automation_logger')
-    logger.setLevel(logging.DEBUG)
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is not None:
+        return logger
+    if config is None:
+        from utils.config_reader import get_config
+        try:
+            config = get_config().get("logging", {})
+        except Exception:
+            config = {}
 
-    if not logger.handlers:
-        fh = logging.FileHandler(log_file)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
+    directory = log_dir(config.get("dir", "logs"))
+    os.makedirs(directory, exist_ok=True)
+    file_handler = logging.FileHandler(os.path.join(directory, f"{worker_id()}.jsonl"), encoding="utf-8")
+    file_handler.setFormatter(JsonLinesFormatter())
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(config.get("console_level", "WARNING"))
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(_ContextFilter())
+    logger.handlers[:] = [queue_handler]
+    logger.setLevel(config.get("level", "INFO"))
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
     return logger
 
-""" 
-from logger_utils import get_logger
+
+def attach_handler(handler):
+    """
+    Also hands every record to `handler`, in the calling thread. conftest uses
+    it for pytest's capture handlers, so caplog and the captured-log report
+    sections see records that no longer propagate to the root logger.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+
+
+def stop_logging():
+    """
+    Flushes queued records and stops the background writer.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def get_logger(log_file=None, name=None):
+    """
+    Returns the shared automation logger (or its child `name`). Safe to call at
+    import time: it does not read the config, configure_logging() starts the
+    pipeline later.
+
+    :param log_file: Deprecated; logs now go to logs/<RUN_TIMESTAMP>/<worker>.jsonl.
+    :param name: Optional child logger name, e.g. "api_utils".
+    :return: Logger instance.
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+"""
+from utils.logger_utils import get_logger
 
 logger = get_logger()
 
 logger.info("Test execution started.")
-logger.debug("Opening browser.")
+logger.debug("Opening browser %s", browser_name)   # formatted only if DEBUG is enabled
 logger.error("Login button not found.")
-logger.warning("Test ran longer than expected.") """
\ No newline at end of file
+logger.warning("Test ran longer than expected.") """
@@ -1,4 +1,3 @@
-import json
 import requests
 import smtplib
 from email.message import EmailMessage
@@ -6,11 +5,13 @@ from email.utils import formataddr
 from email.mime.application import MIMEApplication
 from datetime import datetime
 import os
-from twilio.rest import Client
+from utils.lazy_imports import lazy_import
+from utils.config_reader import get_config
+
+twilio_rest = lazy_import("twilio.rest")
 
 def send_slack_message(message):
-    config_path = "data/config.json"
-    config = read_json_config(config_path)
+    config = get_config()
     webhook_url = config["slack_webhook"]
     try:
         payload = {"text": message}
@@ -32,8 +33,7 @@ def send_slack_message(message):
         raise Exception(f"[ERROR] Unexpected error sending Slack message: {str(e)}")
 
 def send_teams_message(message):
-    config_path = "data/config.json"
-    config = read_json_config(config_path)
+    config = get_config()
     webhook_url = config["teams_webhook"]
     try:
         headers = {"Content-Type": "application/json"}
@@ -61,10 +61,6 @@ def send_teams_message(message):
     except Exception as e:
         raise Exception(f"[ERROR] Unexpected error sending Teams message: {str(e)}")
 
-def read_json_config(path):
-    with open(path, 'r') as f:
-        return json.load(f)
-
 def send_email_from_config(
     config_path: str = "data/config.json",
     allure_summary: dict = None,
@@ -73,7 +69,7 @@ def send_email_from_config(
 ):
     try:
         # Load config
-        config = read_json_config(config_path)
+        config = get_config(config_path)
         sender_email = config["sender_email"]
         sender_name = config.get("sender_name", "Automation Bot")
         sender_password = config["sender_password"]
@@ -129,7 +125,7 @@ def send_email_from_config(
 
 def send_sms_from_config(config_path, to_number, message_body):
     try:
-        config = read_json_config(config_path)
+        config = get_config(config_path)
         account_sid = config.get("twilio_account_sid")
         auth_token = config.get("twilio_auth_token")
         from_number = config.get("twilio_from_number")
@@ -137,7 +133,7 @@ def send_sms_from_config(config_path, to_number, message_body):
         if not all([account_sid, auth_token, from_number]):
             raise ValueError("[ERROR] Missing Twilio configuration values.")
 
-        client = Client(account_sid, auth_token)
+        client = twilio_rest.Client(account_sid, auth_token)
         message = client.messages.create(
             body=message_body,
             from_=from_number,
@@ -0,0 +1,73 @@
+class NetworkRouter:
+    """
+    Installs `context.route` handlers driven by the `network` section of
+    data/config.json: blocks resource types and URL globs, stubs known
+    third-party endpoints and counts what was kept off the wire.
+
+    Blocked requests never reach the network, so their real size is unknown;
+    `bytes_saved_estimate` uses the per-resource-type sizes from
+    `network.estimated_bytes`.
+
+    Example config:
+        "network": {
+            "enabled": true,
+            "block_resource_types": ["image", "font", "media"],
+            "block_url_globs": ["**/*google-analytics.com/**"],
+            "stubs": [{"url_glob": "**/*hotjar.com/**", "status": 200, "content_type": "application/javascript", "body": ""}],
+            "estimated_bytes": {"image": 40000, "font": 30000}
+        }
+    """
+
+    def __init__(self, network_config=None):
+        network_config = network_config or {}
+        self.enabled = network_config.get("enabled", False)
+        self.block_resource_types = set(network_config.get("block_resource_types", []))
+        self.block_url_globs = list(network_config.get("block_url_globs", []))
+        self.stubs = list(network_config.get("stubs", []))
+        self.estimated_bytes = dict(network_config.get("estimated_bytes", {}))
+        self.stats = {
+            "blocked": 0,
+            "stubbed": 0,
+            "bytes_saved_estimate": 0,
+            "blocked_by_type": {},
+        }
+
+    def install(self, context):
+        """
+        Registers the route handlers on a BrowserContext. Playwright tries the
+        most recently registered handler first, so stubs win over URL blocks,
+        which win over the resource-type filter. Requests that match nothing
+        fall back to any other handler (e.g. HAR replay) or the network.
+        """
+        if not self.enabled:
+            return
+        if self.block_resource_types:
+            context.route("**/*", self._block_by_type)
+        for url_glob in self.block_url_globs:
+            context.route(url_glob, self._block)
+        for stub in self.stubs:
+            context.route(stub["url_glob"], lambda route, stub=stub: self._fulfill(route, stub))
+
+    def _block_by_type(self, route):
+        if route.request.resource_type in self.block_resource_types:
+            self._block(route)
+        else:
+            route.fallback()
+
+    def _block(self, route):
+        resource_type = route.request.resource_type
+        self.stats["blocked"] += 1
+        self.stats["blocked_by_type"][resource_type] = self.stats["blocked_by_type"].get(resource_type, 0) + 1
+        self.stats["bytes_saved_estimate"] += self.estimated_bytes.get(resource_type, 0)
+        route.abort("blockedbyclient")
+
+    def _fulfill(self, route, stub):
+        body = stub.get("body", "")
+        self.stats["stubbed"] += 1
+        self.stats["bytes_saved_estimate"] += max(self.estimated_bytes.get(route.request.resource_type, 0) - len(body), 0)
+        route.fulfill(
+            status=stub.get("status", 200),
+            content_type=stub.get("content_type", "text/plain"),
+            headers=stub.get("headers"),
+            body=body,
+        )
@@ -1,5 +1,7 @@
-import fitz
 import os
+from utils.lazy_imports import lazy_import
+
+fitz = lazy_import("fitz")
 
 class PDFCompareError(Exception):
     pass
@@ -0,0 +1,178 @@
+import os
+import time
+
+import pytest
+
+from utils.trend_db import TrendDB
+
+QUARANTINE_PREFIX = "quarantined"
+
+
+def load_flake_rates(db_path, runs=20, min_runs=5):
+    """
+    {nodeid: flake_rate} from the trend database, or {} when there is no history yet.
+    """
+    if not os.path.exists(db_path):
+        return {}
+    try:
+        with TrendDB(db_path) as db:
+            return {row["nodeid"]: row["flake_rate"] for row in db.flake_rates(runs, min_runs)}
+    except Exception as e:
+        print(f"[WARN] Could not read flaky test history from {db_path}: {e}")
+        return {}
+
+
+def _xdist_interactor(config):
+    # The xdist worker plugin checks each report against the index of the test it is running
+    return next((plugin for plugin in config.pluginmanager.get_plugins()
+                 if hasattr(plugin, "item_index") and hasattr(plugin, "sendevent")), None)
+
+
+def _discard_test_instance(item):
+    # A test method gets a new class instance, so no state on `self` survives the failed attempt
+    if getattr(item, "_instance", None) is not None:
+        del item._instance
+        item._obj = None
+
+
+class SmartRerun:
+    """
+    pytest plugin that reruns failed tests at the end of the session instead of
+    straight away. By then every fixture, including session-scoped ones, has been
+    torn down, so each rerun starts from fresh fixtures.
+
+    - A failed attempt that will be retried is reported with the "rerun" outcome.
+    - A test that passes on a rerun is classified as flaky. One that fails every
+      attempt is a real failure.
+    - Tests get `retries` reruns, or `@pytest.mark.retries(n)`. Tests that the
+      trend history shows as flaky get at least `flaky_retries`, and they skip
+      the per-session budget that stops an outage from rerunning everything.
+    - With `quarantine_rate`, a test flaky in at least that share of recent runs
+      is reported as xfail when its last attempt fails, so it does not fail the build.
+    - Time spent in reruns is reported separately from the suite's own time.
+
+    Usage (conftest.py):
+        config.pluginmanager.register(SmartRerun(retries=1, flake_rates=...), "smart_rerun")
+    """
+
+    def __init__(self, retries=0, flaky_retries=2, max_session_reruns=20, backoff_seconds=1.0,
+                 flake_rates=None, quarantine_rate=None):
+        self.retries = retries
+        self.flaky_retries = flaky_retries
+        self.max_session_reruns = max_session_reruns
+        self.backoff_seconds = backoff_seconds
+        self.flake_rates = flake_rates or {}
+        self.quarantine_rate = quarantine_rate
+        self.pending = []
+        self.rerun_tests = set()
+        self.budget_used = 0
+        # Filled from reports, so on the xdist controller they cover every worker
+        self.flaky = set()
+        self.failed_after_rerun = set()
+        self.quarantined = set()
+        self.attempts = {}
+        self.rerun_seconds = 0.0
+        self.suite_seconds = 0.0
+
+    # ------------------ DECISIONS ------------------ #
+    def allowed_retries(self, item):
+        marker = item.get_closest_marker("retries")
+        if marker is not None:
+            return int(marker.args[0] if marker.args else marker.kwargs.get("n", 1))
+        if item.nodeid in self.flake_rates:
+            return max(self.retries, self.flaky_retries)
+        return self.retries
+
+    def is_quarantined(self, nodeid):
+        return self.quarantine_rate is not None and self.flake_rates.get(nodeid, 0) >= self.quarantine_rate
+
+    def _session_budget(self):
+        # Split between xdist workers, like the artifact budget
+        if self.max_session_reruns is None:
+            return None
+        return max(1, self.max_session_reruns // int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1")))
+
+    def _may_rerun(self, item, attempt):
+        if attempt > self.allowed_retries(item):
+            return False
+        if item.nodeid in self.rerun_tests or item.nodeid in self.flake_rates:
+            return True
+        budget = self._session_budget()
+        if budget is not None and self.budget_used >= budget:
+            return False
+        self.budget_used += 1
+        return True
+
+    # ------------------ HOOKS ------------------ #
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        attempt = getattr(item, "execution_count", 1)
+        report.rerun_attempt = attempt - 1
+        if not report.failed or hasattr(report, "wasxfail"):
+            return
+        if report.when == "teardown":
+            if item in self.pending:
+                report.outcome = "rerun"  # This attempt is already being retried
+            return
+        if self._may_rerun(item, attempt):
+            report.outcome = "rerun"
+            self.rerun_tests.add(item.nodeid)
+            self.pending.append(item)
+        elif self.is_quarantined(item.nodeid):
+            report.outcome = "skipped"
+            report.wasxfail = f"{QUARANTINE_PREFIX}: flaky in {self.flake_rates[item.nodeid]:.0%} of recent runs"
+            report.quarantined = True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtestloop(self, session):
+        outcome = yield
+        if outcome.excinfo is None:
+            self.run_pending(session)
+
+    def run_pending(self, session):
+        interactor = _xdist_interactor(session.config)
+        while self.pending and not (session.shouldfail or session.shouldstop):
+            item = self.pending.pop(0)
+            item.execution_count = getattr(item, "execution_count", 1) + 1
+            if self.backoff_seconds:
+                time.sleep(self.backoff_seconds * 2 ** (item.execution_count - 2))
+            _discard_test_instance(item)
+            if interactor is not None:
+                interactor.item_index = session.items.index(item)
+            # nextitem=None tears every fixture down again after the attempt
+            item.ihook.pytest_runtest_protocol(item=item, nextitem=None)
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+
+    def pytest_runtest_logreport(self, report):
+        attempt = getattr(report, "rerun_attempt", 0)
+        if attempt:
+            self.rerun_seconds += report.duration
+            self.attempts[report.nodeid] = max(self.attempts.get(report.nodeid, 1), attempt + 1)
+        else:
+            self.suite_seconds += report.duration
+        if getattr(report, "quarantined", False):
+            self.quarantined.add(report.nodeid)
+        if not attempt or report.outcome == "rerun":
+            return
+        if report.failed and report.when != "teardown":
+            self.failed_after_rerun.add(report.nodeid)
+        elif report.passed and report.when == "call":
+            self.flaky.add(report.nodeid)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not (self.attempts or self.quarantined) or hasattr(terminalreporter.config, "workerinput"):
+            return
+        terminalreporter.section("Reruns")
+        terminalreporter.write_line(
+            f"rerun {len(self.attempts)} test(s): {len(self.flaky)} flaky, {len(self.failed_after_rerun)} failed every attempt, "
+            f"{len(self.quarantined)} quarantined")
+        terminalreporter.write_line(f"suite time {self.suite_seconds:.1f} s + rerun time {self.rerun_seconds:.1f} s")
+        for nodeid in sorted(self.flaky):
+            terminalreporter.write_line(f"    flaky ({self.attempts[nodeid]} attempts): {nodeid}")
+        for nodeid in sorted(self.quarantined):
+            terminalreporter.write_line(f"    quarantined: {nodeid}")
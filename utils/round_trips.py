@@ -0,0 +1,71 @@
+import inspect
+from collections import Counter
+
+try:
+    from playwright._impl._connection import Connection
+except ImportError:  # Playwright internals moved; install() reports it
+    Connection = None
+
+# The private method is patched, so its leading arguments must match what counting_send expects
+EXPECTED_SEND_PARAMS = ["self", "object", "method"]
+
+
+class RoundTripCounter:
+    """
+    Counts Playwright protocol messages (one per browser round-trip) sent while
+    the counter is active. Hooks Playwright's private connection layer and
+    raises RuntimeError if that layer changes, rather than silently counting 0.
+
+    Usage:
+        with RoundTripCounter() as round_trips:
+            login_page.login(username, password)
+        print(round_trips.total, round_trips.by_method.most_common(5))
+    """
+
+    _active = []
+    _installed = False
+
+    def __init__(self):
+        self.total = 0
+        self.by_method = Counter()
+
+    @classmethod
+    def install(cls):
+        """
+        Patches the connection once per process.
+        """
+        if cls._installed:
+            return True
+        send = getattr(Connection, "_send_message_to_server", None)
+        if send is None:
+            raise RuntimeError("Playwright has no Connection._send_message_to_server; "
+                               "RoundTripCounter must be updated for this Playwright version")
+        params = list(inspect.signature(send).parameters)[:len(EXPECTED_SEND_PARAMS)]
+        if params != EXPECTED_SEND_PARAMS:
+            raise RuntimeError(f"Connection._send_message_to_server takes {params}, expected "
+                               f"{EXPECTED_SEND_PARAMS}; RoundTripCounter must be updated for this Playwright version")
+
+        def counting_send(connection, object, method, *args, **kwargs):
+            for counter in cls._active:
+                counter._record(f"{getattr(object, '_type', '?')}.{method}")
+            return send(connection, object, method, *args, **kwargs)
+
+        Connection._send_message_to_server = counting_send
+        cls._installed = True
+        return True
+
+    def _record(self, method):
+        self.total += 1
+        self.by_method[method] += 1
+
+    def __enter__(self):
+        self.install()
+        RoundTripCounter._active.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        RoundTripCounter._active.remove(self)
+        return False
+
+    def summary(self):
+        return {"total": self.total, "by_method": dict(self.by_method.most_common())}
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+
+from utils.lazy_imports import lazy_import
+
+# jsonschema is only needed once a schema is actually validated
+validators = lazy_import("jsonschema.validators")
+
+# Schema objects remembered by id(); cleared when full, so per-call schema literals cannot grow it forever
+MAX_SCHEMA_OBJECTS = 1024
+
+
+class SchemaRegistry:
+    """
+    Compiles each JSON schema once and reuses the validator.
+
+    Schemas may be given as a mapping (a dict, or a FrozenConfig from
+    get_config) or as a path (absolute, relative to the working directory, or
+    relative to `schema_dir`). File-based validators are rebuilt only when the
+    file's mtime changes.
+
+    A mapping passed again as the same object is looked up by id() without
+    being re-serialised, so it must not be mutated after it was first used.
+    Equal mappings that are different objects share one validator.
+    """
+
+    def __init__(self, schema_dir="schemas/"):
+        self.schema_dir = schema_dir
+        self._file_validators = {}
+        self._dict_validators = {}
+        self._object_validators = {}
+        self._lock = threading.Lock()
+
+    def resolve_path(self, schema_path):
+        if os.path.isabs(schema_path) or os.path.exists(schema_path):
+            return os.path.abspath(schema_path)
+        return os.path.abspath(os.path.join(self.schema_dir, schema_path))
+
+    def get_validator(self, schema):
+        if isinstance(schema, Mapping):
+            return self._mapping_validator(schema)
+
+        path = self.resolve_path(schema)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._file_validators.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            with open(path, "r") as f:
+                validator = self._compile(json.load(f))
+            self._file_validators[path] = (mtime, validator)
+            return validator
+
+    def _mapping_validator(self, schema):
+        cached = self._object_validators.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        plain = _plain(schema)
+        key = json.dumps(plain, sort_keys=True)
+        with self._lock:
+            validator = self._dict_validators.get(key)
+            if validator is None:
+                validator = self._compile(plain)
+                self._dict_validators[key] = validator
+            if len(self._object_validators) >= MAX_SCHEMA_OBJECTS:
+                self._object_validators.clear()
+            # Holding the schema keeps its id from being reused by another object
+            self._object_validators[id(schema)] = (schema, validator)
+        return validator
+
+    def iter_errors(self, instance, schema):
+        """
+        Returns every validation error for `instance`, ordered by location.
+        """
+        validator = self.get_validator(schema)
+        return sorted(validator.iter_errors(instance), key=lambda e: [str(p) for p in e.absolute_path])
+
+    def clear(self):
+        with self._lock:
+            self._file_validators.clear()
+            self._dict_validators.clear()
+            self._object_validators.clear()
+
+    @staticmethod
+    def _compile(schema):
+        validator_cls = validators.validator_for(schema)
+        validator_cls.check_schema(schema)
+        return validator_cls(schema, format_checker=validator_cls.FORMAT_CHECKER)
+
+
+def _plain(value):
+    # jsonschema and json.dumps need plain dicts and lists, not FrozenConfig mappings and tuples
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
@@ -1,106 +1,161 @@
 import time
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from typing import Dict, List, Optional, TypedDict, Union
+from playwright.sync_api import Locator, Page, expect, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
-from utils.config_reader import read_json_config
+from utils.config_reader import get_config
+from utils.logger_utils import get_logger
+from utils.timing import instrument
+
+logger = get_logger()
+
+class ElementState(TypedDict):
+    found: bool
+    visible: bool
+    enabled: bool
+    text: Optional[str]
+    value: Optional[str]
+    checked: Optional[bool]
+    attributes: Dict[str, Optional[str]]
+
+# ElementState for single specs, List[ElementState] for {"all": True} specs
+Snapshot = Dict[str, Union[ElementState, List[ElementState]]]
+
+SNAPSHOT_SCRIPT = """(specs) => {
+    const read = (el, attributes) => {
+        const rect = el.getBoundingClientRect();
+        const style = window.getComputedStyle(el);
+        const attrs = {};
+        for (const name of attributes) attrs[name] = el.getAttribute(name);
+        return {
+            found: true,
+            visible: rect.width > 0 && rect.height > 0 && style.visibility !== "hidden",
+            enabled: !el.matches(":disabled"),
+            text: el.innerText ?? el.textContent,
+            value: "value" in el ? String(el.value) : null,
+            checked: "checked" in el ? el.checked : null,
+            attributes: attrs,
+        };
+    };
+    const missing = (attributes) => ({
+        found: false, visible: false, enabled: false, text: null, value: null, checked: null,
+        attributes: Object.fromEntries(attributes.map((name) => [name, null])),
+    });
+    const result = {};
+    for (const [name, spec] of Object.entries(specs)) {
+        if (spec.all) {
+            result[name] = Array.from(document.querySelectorAll(spec.selector), (el) => read(el, spec.attributes));
+        } else {
+            const el = document.querySelector(spec.selector);
+            result[name] = el ? read(el, spec.attributes) : missing(spec.attributes);
+        }
+    }
+    return result;
+}"""
 
 class ScriptUtils:
-    config = read_json_config("data/config.json")
-    timeout = config["waits"]["default_timeout"]
+    timeout = get_config().waits.default_timeout
+
+    # Every action below is a single Playwright call: locator actions already
+    # auto-wait for the element, so a preceding wait_for_selector only adds a round-trip.
+    # Helpers built on _locator accept either a selector string or a Locator.
+
+    def _locator(page: Page, selector) -> Locator:
+        """
+        Returns `selector` unchanged if it is a Locator, otherwise the first match on the page
+        (matching the non-strict behaviour of page.click/page.fill).
+        """
+        if isinstance(selector, Locator):
+            return selector
+        return page.locator(selector).first
 
     def find_element(page: Page, selector: str, timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            element = page.query_selector(selector)
-            print(f"[{datetime.now()}] Found element: {selector}")
+            element = page.wait_for_selector(selector, timeout=timeout)
+            logger.info("Found element: %s", selector)
             return element
         except Exception as e:
-            print(f"[{datetime.now()}] Error in find_element: {str(e)}")
+            logger.error("Error in find_element: %s", e)
             return None
 
     def find_elements(page: Page, selector: str, timeout: int = timeout):
         try:
             page.wait_for_selector(selector, timeout=timeout)
             elements = page.query_selector_all(selector)
-            print(f"[{datetime.now()}] Found {len(elements)} elements for: {selector}")
+            logger.info("Found %s elements for: %s", len(elements), selector)
             return elements
         except Exception as e:
-            print(f"[{datetime.now()}] Error in find_elements: {str(e)}")
+            logger.error("Error in find_elements: %s", e)
             return []
 
     def find_child_element(parent_element, child_selector: str):
         try:
             child = parent_element.query_selector(child_selector)
-            print(f"[{datetime.now()}] Found child element: {child_selector}")
+            logger.info("Found child element: %s", child_selector)
             return child
         except Exception as e:
-            print(f"[{datetime.now()}] Error in find_child_element: {str(e)}")
+            logger.error("Error in find_child_element: %s", e)
             return None
 
     def click_element(page: Page, selector: str, timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            page.click(selector)
-            print(f"[{datetime.now()}] Clicked element: {selector}")
+            ScriptUtils._locator(page, selector).click(timeout=timeout)
+            logger.info("Clicked element: %s", selector)
         except Exception as e:
-            print(f"[{datetime.now()}] Error in click_element: {str(e)}")
+            logger.error("Error in click_element: %s", e)
 
     def send_keys(page: Page, selector: str, text: str, timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            page.fill(selector, text)
-            print(f"[{datetime.now()}] Entered text in element: {selector}")
+            ScriptUtils._locator(page, selector).fill(text, timeout=timeout)
+            logger.info("Entered text in element: %s", selector)
         except Exception as e:
-            print(f"[{datetime.now()}] Error in send_keys: {str(e)}")
+            logger.error("Error in send_keys: %s", e)
 
     def get_text(page: Page, selector: str, timeout: int = timeout):
         try:
-            page.text_content(selector, timeout=timeout)
-            text = page.text_content(selector)
-            print(f"[{datetime.now()}] Text from element {selector}: {text}")
+            text = ScriptUtils._locator(page, selector).text_content(timeout=timeout)
+            logger.info("Text from element %s: %s", selector, text)
             return text
         except Exception as e:
-            print(f"[{datetime.now()}] Error in get_text: {str(e)}")
+            logger.error("Error in get_text: %s", e)
             return None
 
     def get_attribute(page: Page, selector: str, attribute_name: str, timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            attr = page.get_attribute(selector, attribute_name)
-            print(f"[{datetime.now()}] Attribute '{attribute_name}' from {selector}: {attr}")
+            attr = ScriptUtils._locator(page, selector).get_attribute(attribute_name, timeout=timeout)
+            logger.info("Attribute '%s' from %s: %s", attribute_name, selector, attr)
             return attr
         except Exception as e:
-            print(f"[{datetime.now()}] Error in get_attribute: {str(e)}")
+            logger.error("Error in get_attribute: %s", e)
             return None
 
     def press_key(page: Page, selector: str, key: str, timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            page.press(selector, key)
-            print(f"[{datetime.now()}] Pressed key '{key}' on element: {selector}")
+            ScriptUtils._locator(page, selector).press(key, timeout=timeout)
+            logger.info("Pressed key '%s' on element: %s", key, selector)
         except Exception as e:
-            print(f"[{datetime.now()}] Error in press_key: {str(e)}")
+            logger.error("Error in press_key: %s", e)
 
     def accept_alert(page: Page):
         try:
             page.once("dialog", lambda dialog: dialog.accept())
-            print(f"[{datetime.now()}] Alert accepted")
+            logger.info("Alert accepted")
         except Exception as e:
-            print(f"[{datetime.now()}] Error in accept_alert: {str(e)}")
+            logger.error("Error in accept_alert: %s", e)
 
     def dismiss_alert(page: Page):
         try:
             page.once("dialog", lambda dialog: dialog.dismiss())
-            print(f"[{datetime.now()}] Alert dismissed")
+            logger.info("Alert dismissed")
         except Exception as e:
-            print(f"[{datetime.now()}] Error in dismiss_alert: {str(e)}")
+            logger.error("Error in dismiss_alert: %s", e)
 
     def get_window_handles(context):
         try:
             pages = context.pages
-            print(f"[{datetime.now()}] Open windows count: {len(pages)}")
+            logger.info("Open windows count: %s", len(pages))
             return pages
         except Exception as e:
-            print(f"[{datetime.now()}] Error in get_window_handles: {str(e)}")
+            logger.error("Error in get_window_handles: %s", e)
             return []
 
     def switch_to_window(context, index: int):
@@ -108,49 +163,44 @@ class ScriptUtils:
             pages = context.pages
             page = pages[index]
             page.bring_to_front()
-            print(f"[{datetime.now()}] Switched to window at index: {index}")
+            logger.info("Switched to window at index: %s", index)
             return page
         except Exception as e:
-            print(f"[{datetime.now()}] Error in switch_to_window: {str(e)}")
+            logger.error("Error in switch_to_window: %s", e)
             return None
         
     def select_dropdown(page: Page, selector: str, value: str = None, label: str = None, timeout: int = timeout):
         try:
             if value:
-                page.wait_for_selector(selector, timeout=timeout)
-                page.select_option(selector, value=value)
-                print(f"[{datetime.now()}] Selected value '{value}' from dropdown: {selector}")
+                ScriptUtils._locator(page, selector).select_option(value=value, timeout=timeout)
+                logger.info("Selected value '%s' from dropdown: %s", value, selector)
             elif label:
-                page.wait_for_selector(selector, timeout=timeout)
-                page.select_option(selector, label=label)
-                print(f"[{datetime.now()}] Selected label '{label}' from dropdown: {selector}")
+                ScriptUtils._locator(page, selector).select_option(label=label, timeout=timeout)
+                logger.info("Selected label '%s' from dropdown: %s", label, selector)
         except Exception as e:
-            print(f"[{datetime.now()}] Error in select_dropdown: {str(e)}")
+            logger.error("Error in select_dropdown: %s", e)
 
     def select_custom_dropdown(page: Page, dropdown_selector: str, option_text: str, timeout: int = timeout):
         try:
-            page.wait_for_selector(dropdown_selector, timeout=timeout)
-            page.click(dropdown_selector)
-            page.click(f"text={option_text}")
-            print(f"[{datetime.now()}] Selected '{option_text}' from custom dropdown: {dropdown_selector}")
+            ScriptUtils._locator(page, dropdown_selector).click(timeout=timeout)
+            page.locator(f"text={option_text}").first.click(timeout=timeout)
+            logger.info("Selected '%s' from custom dropdown: %s", option_text, dropdown_selector)
         except Exception as e:
-            print(f"[{datetime.now()}] Error in select_custom_dropdown: {str(e)}")
+            logger.error("Error in select_custom_dropdown: %s", e)
 
     def pick_date_with_input(page: Page, selector: str, date_str: str, timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            page.fill(selector, "")  # Clear input
-            page.fill(selector, date_str)
-            print(f"[{datetime.now()}] Entered date '{date_str}' in field: {selector}")
+            # fill() clears the input itself
+            ScriptUtils._locator(page, selector).fill(date_str, timeout=timeout)
+            logger.info("Entered date '%s' in field: %s", date_str, selector)
         except Exception as e:
-            print(f"[{datetime.now()}] Error in pick_date_with_input: {str(e)}")
+            logger.error("Error in pick_date_with_input: %s", e)
 
     def pick_date_from_calendar(page: Page, calendar_open_selector: str, month_selector: str,
                                 next_button_selector: str, date_selector_template: str, target_date: str, timeout: int = timeout):
         try:
             target = datetime.strptime(target_date, "%Y-%m-%d")
-            page.wait_for_selector(calendar_open_selector, timeout=timeout)
-            page.click(calendar_open_selector)
+            ScriptUtils._locator(page, calendar_open_selector).click(timeout=timeout)
 
             # Loop until correct month is visible
             while True:
@@ -161,83 +211,111 @@ class ScriptUtils:
 
             # Click specific date
             page.click(date_selector_template.format(date=target_date))
-            print(f"[{datetime.now()}] Selected date '{target_date}' from calendar")
+            logger.info("Selected date '%s' from calendar", target_date)
         except Exception as e:
-            print(f"[{datetime.now()}] Error in pick_date_from_calendar: {str(e)}")
+            logger.error("Error in pick_date_from_calendar: %s", e)
 
     def js_click(page, selector):
         try:
             page.evaluate("""(sel) => {
                 document.querySelector(sel).click();
             }""", selector)
-            print(f"[{datetime.now()}] JavaScript click on: {selector}")
+            logger.info("JavaScript click on: %s", selector)
         except Exception as e:
-            print(f"[{datetime.now()}] JS click failed on {selector}: {str(e)}")
+            logger.error("JS click failed on %s: %s", selector, e)
 
     def scroll_into_view(page, selector):
         try:
             page.evaluate("""(sel) => {
                 document.querySelector(sel).scrollIntoView({behavior: 'smooth', block: 'center'});
             }""", selector)
-            print(f"[{datetime.now()}] Scrolled to element: {selector}")
+            logger.info("Scrolled to element: %s", selector)
         except Exception as e:
-            print(f"[{datetime.now()}] Scroll failed on {selector}: {str(e)}")
+            logger.error("Scroll failed on %s: %s", selector, e)
 
     def js_get_value(page, selector):
         try:
             value = page.evaluate("""(sel) => {
                 return document.querySelector(sel).value;
             }""", selector)
-            print(f"[{datetime.now()}] Value from {selector}: {value}")
+            logger.info("Value from %s: %s", selector, value)
             return value
         except Exception as e:
-            print(f"[{datetime.now()}] JS get value failed on {selector}: {str(e)}")
+            logger.error("JS get value failed on %s: %s", selector, e)
             return None
         
+    def snapshot(page: Page, specs: dict) -> Snapshot:
+        """
+        Reads the state of many elements in a single page.evaluate round-trip.
+        Each spec is a CSS selector, or a dict {"selector": ..., "attributes": [...], "all": bool}.
+        Every element comes back as found, visible, enabled, text, value, checked and attributes.
+        Missing elements come back with found=False instead of raising.
+
+        Usage:
+            state = ScriptUtils.snapshot(page, {
+                "username": "input[name='username']",
+                "submit": {"selector": "button[type='submit']", "attributes": ["disabled"]},
+                "rows": {"selector": "table tbody tr", "all": True},
+            })
+            assert state["username"]["value"] == "Admin"
+            assert len(state["rows"]) == 10
+        """
+        normalized = {}
+        for name, spec in specs.items():
+            if isinstance(spec, str):
+                spec = {"selector": spec}
+            normalized[name] = {
+                "selector": spec["selector"],
+                "attributes": list(spec.get("attributes", [])),
+                "all": bool(spec.get("all", False)),
+            }
+        state = page.evaluate(SNAPSHOT_SCRIPT, normalized)
+        logger.info("Snapshot of %s element spec(s)", len(normalized))
+        return state
+
     def assert_equal(actual, expected, message='Values do not match'):
         try:
             assert actual == expected, f"{message}: Expected '{expected}', got '{actual}'"
-            print(f"[PASS] assert_equal: {actual} == {expected}")
+            logger.info("[PASS] assert_equal: %s == %s", actual, expected)
         except AssertionError as e:
-            print(f"[FAIL] {str(e)}")
+            logger.error("[FAIL] %s", e)
             raise
 
     def assert_true(condition, message='Condition is not true'):
         try:
             assert condition, message
-            print(f"[PASS] assert_true: Condition met")
+            logger.info("[PASS] assert_true: Condition met")
         except AssertionError as e:
-            print(f"[FAIL] {str(e)}")
+            logger.error("[FAIL] %s", e)
             raise
 
     def assert_element_present(page, selector, message="Element not found", timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            element = page.query_selector(selector)
+            element = page.wait_for_selector(selector, timeout=timeout)
             assert element is not None, message
-            print(f"[PASS] Element found: {selector}")
+            logger.info("[PASS] Element found: %s", selector)
         except Exception as e:
-            print(f"[FAIL] assert_element_present: {str(e)}")
+            logger.error("[FAIL] assert_element_present: %s", e)
             raise
 
     def assert_element_visible(page, selector, message="Element not visible", timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            visible = page.is_visible(selector)
-            assert visible, message
-            print(f"[PASS] Element visible: {selector}")
+            try:
+                ScriptUtils._locator(page, selector).wait_for(state="visible", timeout=timeout)
+            except PlaywrightTimeoutError:
+                raise AssertionError(message)
+            logger.info("[PASS] Element visible: %s", selector)
         except Exception as e:
-            print(f"[FAIL] assert_element_visible: {str(e)}")
+            logger.error("[FAIL] assert_element_visible: %s", e)
             raise
 
     def assert_text_in_element(page, selector, expected_text, message="Text not found in element", timeout: int = timeout):
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            actual_text = page.inner_text(selector)
+            actual_text = ScriptUtils._locator(page, selector).inner_text(timeout=timeout)
             assert expected_text in actual_text, f"{message}: Expected '{expected_text}' in '{actual_text}'"
-            print(f"[PASS] Text found in element: '{expected_text}' in '{actual_text}'")
+            logger.info("[PASS] Text found in element: '%s' in '%s'", expected_text, actual_text)
         except Exception as e:
-            print(f"[FAIL] assert_text_in_element: {str(e)}")
+            logger.error("[FAIL] assert_text_in_element: %s", e)
             raise
 
     def wait_for_element_visible(page: Page, selector: str, timeout: int = timeout):
@@ -245,11 +323,10 @@ class ScriptUtils:
         Wait for an element to become visible using Playwright's explicit wait.
         """
         try:
-            page.wait_for_selector(selector, timeout=timeout)
-            page.locator(selector).wait_for(state="visible", timeout=timeout)
-            print(f"[PASS] Element is visible: {selector}")
+            ScriptUtils._locator(page, selector).wait_for(state="visible", timeout=timeout)
+            logger.info("[PASS] Element is visible: %s", selector)
         except PlaywrightTimeoutError:
-            print(f"[FAIL] Element not visible after {timeout}ms: {selector}")
+            logger.error("[FAIL] Element not visible after %sms: %s", timeout, selector)
             raise
 
     def wait_for_selector_with_timeout(page: Page, selector: str, timeout: int = timeout):
@@ -258,36 +335,73 @@ class ScriptUtils:
         """
         try:
             page.wait_for_selector(selector, timeout=timeout)
-            page.wait_for_selector(selector, timeout=timeout)
-            print(f"[PASS] Selector found: {selector}")
+            logger.info("[PASS] Selector found: %s", selector)
         except PlaywrightTimeoutError:
-            print(f"[FAIL] Selector not found after {timeout}ms: {selector}")
+            logger.error("[FAIL] Selector not found after %sms: %s", timeout, selector)
             raise
 
     def fluent_wait(page: Page, selector: str, timeout: int = 10, poll_interval: float = 0.5):
         """
-        Custom polling logic to check element visibility, similar to Selenium FluentWait.
+        Wait (in seconds) for an element to become visible, similar to Selenium FluentWait.
+        Uses Playwright's locator auto-waiting, so it returns as soon as the element
+        shows up; `poll_interval` is kept for backwards compatibility and ignored.
         """
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            try:
-                if page.is_visible(selector):
-                    print(f"[PASS] Element became visible: {selector}")
-                    return True
-            except:
-                pass
-            time.sleep(poll_interval)
-        raise TimeoutError(f"[FAIL] Element not visible after {timeout} seconds: {selector}")
-
-    def wait_with_sleep_check(condition_func, timeout: int = 10, poll_interval: float = 1):
+        try:
+            ScriptUtils._locator(page, selector).wait_for(state="visible", timeout=timeout * 1000)
+            logger.info("[PASS] Element became visible: %s", selector)
+            return True
+        except PlaywrightTimeoutError:
+            raise TimeoutError(f"[FAIL] Element not visible after {timeout} seconds: {selector}")
+
+    def wait_with_sleep_check(condition_func, timeout: int = 10, poll_interval: float = 1, page: Page = None):
         """
-        Wait for any boolean condition with polling.
-        Usage: wait_with_sleep_check(lambda: page.is_visible("#id"))
+        Wait (in seconds) for any boolean Python condition.
+        Polls with adaptive backoff: the first re-check is after 5 ms and the delay grows
+        by 1.5x up to `poll_interval`, so fast conditions cost milliseconds, not a full interval.
+        Pass `page` to sleep via page.wait_for_timeout, which keeps Playwright events
+        (console, network, dialogs) flowing while waiting.
+        Usage: wait_with_sleep_check(lambda: len(messages) > 0, page=page)
         """
-        end = time.time() + timeout
-        while time.time() < end:
+        end = time.monotonic() + timeout
+        delay = 0.005
+        while True:
             if condition_func():
-                print("[PASS] Condition met.")
+                logger.info("[PASS] Condition met.")
                 return
-            time.sleep(poll_interval)
-        raise TimeoutError("[FAIL] Condition not met within timeout.")
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("[FAIL] Condition not met within timeout.")
+            sleep_for = min(delay, remaining)
+            if page is not None:
+                page.wait_for_timeout(sleep_for * 1000)
+            else:
+                time.sleep(sleep_for)
+            delay = min(delay * 1.5, poll_interval)
+
+    def wait_for_js_condition(page: Page, expression: str, arg=None, timeout: int = timeout):
+        """
+        Wait (in ms) until a JavaScript expression or function is truthy in the page.
+        Evaluated inside the browser on every animation frame, so no protocol round-trip per check.
+        Usage: wait_for_js_condition(page, "() => window.appReady === true")
+        """
+        try:
+            result = page.wait_for_function(expression, arg=arg, timeout=timeout)
+            logger.info("[PASS] JS condition met: %s", expression)
+            return result.json_value()
+        except PlaywrightTimeoutError:
+            logger.error("[FAIL] JS condition not met after %sms: %s", timeout, expression)
+            raise
+
+    def wait_for_text(page: Page, selector: str, expected_text: str, timeout: int = timeout):
+        """
+        Wait (in ms) until the element contains `expected_text`, using Playwright's expect polling.
+        """
+        try:
+            expect(ScriptUtils._locator(page, selector)).to_contain_text(expected_text, timeout=timeout)
+            logger.info("[PASS] Text appeared in element: '%s' in %s", expected_text, selector)
+        except AssertionError:
+            logger.error("[FAIL] Text '%s' not found in %s after %sms", expected_text, selector, timeout)
+            raise
+
+# Every public helper is recorded as a timed action (see utils/timing.py)
+instrument(ScriptUtils)
@@ -0,0 +1,121 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            server.client_ports.add(self.client_address[1])
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            status, body = self._prepare(server)
+        finally:
+            # Counted as done before the reply goes out, so the client's next request never overlaps it
+            with server.lock:
+                server.in_flight -= 1
+
+        payload = json.dumps(body).encode() if status != 204 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _prepare(self, server):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        route = server.routes.get(urlsplit(self.path).path)
+        if route is None:
+            status, body = 404, {"error": "not found", "path": self.path}
+            delay_ms = 0
+        else:
+            status = route.get("status", 200)
+            body = route.get("body")
+            if body is None:
+                body = {"path": self.path}
+            delay_ms = route.get("delay_ms", 0)
+            if server.error_rate and random.random() < server.error_rate:
+                status, body = 500, {"error": "injected failure"}
+
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        return status, body
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """
+    Local HTTP server with canned JSON responses, for exercising the API
+    helpers without network access.
+
+    :param routes: Mapping of path -> {"status": int, "body": json, "delay_ms": int}.
+                   Without a body the request path is echoed; unknown paths return 404.
+    :param error_rate: Fraction of requests to known routes answered with HTTP 500.
+
+    Usage:
+        with StubServer({"/users": {"body": {"data": []}, "delay_ms": 5}}) as server:
+            send_request("GET", f"{server.url}/users")
+    """
+
+    def __init__(self, routes=None, error_rate=0.0, host="127.0.0.1", port=0):
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.routes = dict(routes or {})
+        self._server.error_rate = error_rate
+        self._server.request_count = 0
+        self._server.client_ports = set()
+        self._server.in_flight = 0
+        self._server.peak_in_flight = 0
+        self._server.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self):
+        return self._server.request_count
+
+    @property
+    def client_ports(self):
+        return self._server.client_ports
+
+    @property
+    def peak_in_flight(self):
+        # Most requests the server was handling at the same time
+        return self._server.peak_in_flight
+
+    def add_route(self, path, status=200, body=None, delay_ms=0):
+        self._server.routes[path] = {"status": status, "body": body, "delay_ms": delay_ms}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
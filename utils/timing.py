@@ -0,0 +1,232 @@
+import functools
+import inspect
+import threading
+import time
+from collections import Counter
+
+from utils.logger_utils import get_test_context
+
+SELECTOR_PARAMS = ("selector", "dropdown_selector", "calendar_open_selector", "expression", "url")
+
+
+def _frame_label(page_object, action, selector):
+    label = f"{page_object}.{action}" if page_object else action
+    if selector:
+        label = f"{label}({selector})"
+    # ';' separates frames in the folded format
+    return label.replace(";", ",")
+
+
+class ActionProfiler:
+    """
+    Collects nested action timings for the running test and aggregates them
+    for the whole session.
+
+    Per test: a list of records (action, selector, page object, browser,
+    offset, duration and self time). Per session: totals per
+    (page object, action, selector) and folded stacks
+    ("test;LoginPage.login;ScriptUtils.click_element(#submit) <self µs>"),
+    which flamegraph.pl and speedscope read directly.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._local = threading.local()
+        self._test = None
+        self._test_start = None
+        self.records = []
+        self.actions = {}
+        self.folded = Counter()
+
+    # ---- nesting ---- #
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def push(self, action, selector=None, page_object=None):
+        frame = {
+            "action": action,
+            "selector": None if selector is None else str(selector),
+            "page_object": page_object,
+            "label": _frame_label(page_object, action, None if selector is None else str(selector)),
+            "start": time.perf_counter(),
+            "child_ms": 0.0,
+        }
+        self._stack().append(frame)
+        return frame
+
+    def pop(self, frame):
+        duration_ms = (time.perf_counter() - frame["start"]) * 1000
+        stack = self._stack()
+        stack.remove(frame)
+        if stack:
+            stack[-1]["child_ms"] += duration_ms
+        frame["duration_ms"] = duration_ms
+        self._record(frame, [f["label"] for f in stack], duration_ms)
+        return duration_ms
+
+    def _record(self, frame, parents, duration_ms):
+        self_ms = max(duration_ms - frame["child_ms"], 0.0)
+        root = (self._test or "session").replace(";", ",")
+        self.folded[";".join([root, *parents, frame["label"]])] += int(self_ms * 1000)
+
+        key = f"{frame['page_object'] or ''}|{frame['action']}|{frame['selector'] or ''}"
+        totals = self.actions.setdefault(key, {"page_object": frame["page_object"], "action": frame["action"],
+                                               "selector": frame["selector"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        totals["count"] += 1
+        totals["total_ms"] += duration_ms
+        totals["max_ms"] = max(totals["max_ms"], duration_ms)
+
+        if self._test is not None:
+            self.records.append({
+                "action": frame["action"],
+                "selector": frame["selector"],
+                "page_object": frame["page_object"],
+                "browser": get_test_context()["browser"],
+                "depth": len(parents),
+                "offset_ms": round((frame["start"] - self._test_start) * 1000, 2),
+                "duration_ms": round(duration_ms, 2),
+                "self_ms": round(self_ms, 2),
+            })
+
+    # ---- per test ---- #
+    def start_test(self, nodeid):
+        self._test = nodeid
+        self._test_start = time.perf_counter()
+        self.records = []
+
+    def finish_test(self):
+        """
+        Returns the test's profile and adds the time not covered by any
+        action to the test's own frame in the folded stacks.
+        """
+        if self._test is None:
+            return None
+        total_ms = (time.perf_counter() - self._test_start) * 1000
+        instrumented_ms = sum(r["duration_ms"] for r in self.records if r["depth"] == 0)
+        self.folded[self._test.replace(";", ",")] += int(max(total_ms - instrumented_ms, 0) * 1000)
+        profile = {
+            "nodeid": self._test,
+            "total_ms": round(total_ms, 2),
+            "instrumented_ms": round(instrumented_ms, 2),
+            "actions": self.records,
+        }
+        self._test = None
+        self.records = []
+        return profile
+
+    # ---- session ---- #
+    def session_profile(self):
+        return {"actions": list(self.actions.values()), "folded": dict(self.folded)}
+
+    def merge(self, profile):
+        """
+        Adds a session_profile() from another process (e.g. an xdist worker).
+        """
+        for totals in profile["actions"]:
+            key = f"{totals['page_object'] or ''}|{totals['action']}|{totals['selector'] or ''}"
+            current = self.actions.setdefault(key, dict(totals, count=0, total_ms=0.0, max_ms=0.0))
+            current["count"] += totals["count"]
+            current["total_ms"] += totals["total_ms"]
+            current["max_ms"] = max(current["max_ms"], totals["max_ms"])
+        self.folded.update(profile["folded"])
+
+    def slowest(self, n=10, key="total_ms"):
+        return sorted(self.actions.values(), key=lambda totals: totals[key], reverse=True)[:n]
+
+    def folded_text(self):
+        return "\n".join(f"{stack} {micros}" for stack, micros in sorted(self.folded.items()) if micros > 0) + "\n"
+
+
+_profiler = ActionProfiler()
+
+
+def get_profiler():
+    return _profiler
+
+
+def configure_timing(enabled=True):
+    _profiler.enabled = enabled
+    return _profiler
+
+
+class timed:
+    """
+    Times a block or a function as one labelled action; nested actions build
+    the stacks for the flame graph.
+
+    Usage:
+        with timed("goto", selector=url, page_object="page") as t:
+            page.goto(url)
+        print(t.duration_ms)
+
+        @timed("login", page_object="LoginPage")
+        def login(self, username, password): ...
+    """
+
+    def __init__(self, action=None, selector=None, page_object=None):
+        self.action = action
+        self.selector = selector
+        self.page_object = page_object
+        self.duration_ms = None
+        self._frame = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        if _profiler.enabled:
+            self._frame = _profiler.push(self.action, self.selector, self.page_object)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._frame is not None:
+            self.duration_ms = _profiler.pop(self._frame)
+            self._frame = None
+        else:
+            self.duration_ms = (time.perf_counter() - self._start) * 1000
+        return False
+
+    def __call__(self, func):
+        action = self.action or func.__name__
+        page_object = self.page_object
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _profiler.enabled:
+                return func(*args, **kwargs)
+            with timed(action, None, page_object):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def instrument(cls, page_object=None):
+    """
+    Wraps every public function of `cls` in a timed action labelled with the
+    method name and, when the method takes one, its selector argument.
+    """
+    page_object = page_object or cls.__name__
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(func):
+            continue
+        setattr(cls, name, _timed_method(func, page_object))
+    return cls
+
+
+def _timed_method(func, page_object):
+    signature = inspect.signature(func)
+    selector_param = next((p for p in signature.parameters if p in SELECTOR_PARAMS), None)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _profiler.enabled:
+            return func(*args, **kwargs)
+        selector = None
+        if selector_param:
+            try:
+                selector = signature.bind_partial(*args, **kwargs).arguments.get(selector_param)
+            except TypeError:
+                pass
+        with timed(func.__name__, selector, page_object):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,156 @@
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+
+from utils.file_lock import FileLock
+
+TRACE_MODES = ("off", "on", "retain-on-failure", "on-first-retry")
+
+
+class TraceStore:
+    """
+    Size-capped directory of kept Playwright traces. Adding a trace evicts the
+    least recently used ones (oldest mtime) until the store fits `max_bytes`.
+    A trace counts as used when it is attached (`touch`) and when a rerun of
+    the same test adds a newer trace next to it. Writers on different xdist
+    workers are serialised with a file lock.
+    """
+
+    def __init__(self, trace_dir="traces", max_bytes=500 * 1024 ** 2):
+        self.trace_dir = trace_dir
+        self.max_bytes = max_bytes
+        self.evicted = 0
+
+    def path_for(self, nodeid):
+        return os.path.join(self.trace_dir, f"{_file_stem(nodeid)}-{time.strftime('%Y%m%d-%H%M%S')}.zip")
+
+    def add(self, source_path, nodeid):
+        """
+        Moves a trace zip into the store (recompressing it if Playwright left
+        entries uncompressed) and returns its path.
+        """
+        os.makedirs(self.trace_dir, exist_ok=True)
+        path = self.path_for(nodeid)
+        _compress_zip(source_path, path)
+        os.remove(source_path)
+        with FileLock(os.path.join(self.trace_dir, ".store.lock"), timeout=30):
+            # The test's earlier attempts belong with this trace, so they are not the least recently used
+            for earlier in self.traces_of(nodeid):
+                if earlier != path:
+                    self.touch(earlier)
+            self._evict(keep=path)
+        return path
+
+    def touch(self, path):
+        """
+        Marks a trace as used, moving it to the back of the eviction order.
+        """
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def traces_of(self, nodeid):
+        pattern = re.compile(re.escape(_file_stem(nodeid)) + r"-\d{8}-\d{6}\.zip")
+        return [path for _, _, path in self.entries() if pattern.fullmatch(os.path.basename(path))]
+
+    def entries(self):
+        """
+        Returns [(mtime, size, path)] oldest first.
+        """
+        if not os.path.isdir(self.trace_dir):
+            return []
+        found = []
+        for name in os.listdir(self.trace_dir):
+            if name.endswith(".zip"):
+                path = os.path.join(self.trace_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, stat.st_size, path))
+        return sorted(found)
+
+    def total_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def _evict(self, keep):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evicted += 1
+
+
+def _file_stem(nodeid):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid)
+
+
+def _compress_zip(source_path, target_path):
+    with zipfile.ZipFile(source_path) as source:
+        if all(info.compress_type != zipfile.ZIP_STORED for info in source.infolist()):
+            shutil.copyfile(source_path, target_path)
+            return
+        fd, tmp_path = tempfile.mkstemp(suffix=".zip", dir=os.path.dirname(target_path))
+        os.close(fd)
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as target:
+            for info in source.infolist():
+                target.writestr(info.filename, source.read(info.filename))
+    os.replace(tmp_path, target_path)
+
+
+class TraceSession:
+    """
+    Per-test Playwright tracing.
+
+    on: every trace is kept.
+    retain-on-failure: traces of passing tests are discarded without being written.
+    on-first-retry: only the first rerun of a failed test is traced, and kept.
+    `overhead_ms` is the time spent starting and stopping the trace.
+    """
+
+    def __init__(self, mode, store, nodeid, execution_count=1, screenshots=True, snapshots=True, sources=False):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"[ERROR] Unknown trace mode '{mode}'. Expected one of {TRACE_MODES}")
+        self.mode = mode
+        self.store = store
+        self.nodeid = nodeid
+        self.options = {"screenshots": screenshots, "snapshots": snapshots, "sources": sources}
+        self.enabled = mode in ("on", "retain-on-failure") or (mode == "on-first-retry" and execution_count == 2)
+        self.overhead_ms = 0.0
+        self.path = None
+
+    def start(self, context):
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        context.tracing.start(title=self.nodeid, **self.options)
+        self.overhead_ms += (time.perf_counter() - start) * 1000
+
+    def stop(self, context, failed):
+        """
+        Stops tracing before the context closes; returns the stored trace path or None.
+        """
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        if self.mode == "retain-on-failure" and not failed:
+            context.tracing.stop()  # Dropped in the browser, never written
+        else:
+            fd, tmp_path = tempfile.mkstemp(suffix=".zip")
+            os.close(fd)
+            context.tracing.stop(path=tmp_path)
+            self.path = self.store.add(tmp_path, self.nodeid)
+        self.overhead_ms += (time.perf_counter() - start) * 1000
+        return self.path
@@ -0,0 +1,181 @@
+"""
+Run history in a local SQLite database: one row per run and one per test result,
+appended at the end of every session, so trends never need old report folders.
+
+Usage:
+    python utils/trend_db.py slowest --top 10
+    python utils/trend_db.py regressions --threshold 25 --baseline-runs 5
+    python utils/trend_db.py flaky --runs 20
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT UNIQUE NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    exit_status INTEGER,
+    total INTEGER NOT NULL,
+    failed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    browser TEXT,
+    instance INTEGER,
+    worker TEXT,
+    PRIMARY KEY (nodeid, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id, duration);
+"""
+
+
+class TrendDB:
+    """
+    Usage:
+        with TrendDB("reports/trends.sqlite") as db:
+            db.record_run(run_key, started_at, results)
+            db.slowest(10)
+    Each result is a dict with nodeid, outcome (passed/failed/skipped/error),
+    duration (seconds) and optionally attempts, browser, instance and worker.
+    """
+
+    def __init__(self, path="reports/trends.sqlite"):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def record_run(self, run_key, started_at, results, exit_status=None, finished_at=None):
+        """
+        Appends one run in a single transaction and returns its id.
+        """
+        results = list(results)
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (run_key, started_at, finished_at, exit_status, total, failed) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_key, started_at, finished_at or time.time(), exit_status, len(results),
+                 sum(1 for result in results if result["outcome"] in ("failed", "error"))),
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO results (run_id, nodeid, outcome, duration, attempts, browser, instance, worker) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, result["nodeid"], result["outcome"], round(result["duration"], 4), result.get("attempts", 1),
+                  result.get("browser"), result.get("instance"), result.get("worker")) for result in results],
+            )
+        return run_id
+
+    def run_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def _last_run_ids(self, n):
+        rows = self.conn.execute("SELECT id FROM runs ORDER BY id DESC LIMIT ?", (n,)).fetchall()
+        return [row[0] for row in rows]
+
+    def slowest(self, n=10, runs=1):
+        """
+        Tests with the highest mean duration over the last `runs` runs.
+        """
+        run_ids = self._last_run_ids(runs)
+        if not run_ids:
+            return []
+        rows = self.conn.execute(
+            "SELECT nodeid, AVG(duration) AS mean_seconds, MAX(duration) AS max_seconds, COUNT(*) AS runs "
+            f"FROM results WHERE run_id IN ({','.join('?' * len(run_ids))}) AND outcome != 'skipped' "
+            "GROUP BY nodeid ORDER BY mean_seconds DESC LIMIT ?",
+            (*run_ids, n),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def regressions(self, threshold_pct=25.0, baseline_runs=5, min_seconds=0.5):
+        """
+        Passing tests in the latest run that were more than `threshold_pct` slower
+        than their mean over the previous `baseline_runs` runs. Tests faster than
+        `min_seconds` in both are ignored as noise.
+        """
+        run_ids = self._last_run_ids(baseline_runs + 1)
+        if len(run_ids) < 2:
+            return []
+        latest, baseline = run_ids[0], run_ids[1:]
+        rows = self.conn.execute(
+            "SELECT cur.nodeid, cur.duration AS seconds, AVG(prev.duration) AS baseline_seconds, COUNT(*) AS baseline_runs "
+            "FROM results cur JOIN results prev ON prev.nodeid = cur.nodeid "
+            f"AND prev.run_id IN ({','.join('?' * len(baseline))}) AND prev.outcome = 'passed' "
+            "WHERE cur.run_id = ? AND cur.outcome = 'passed' "
+            "GROUP BY cur.nodeid "
+            "HAVING seconds > baseline_seconds * (1 + ? / 100.0) AND MAX(seconds, baseline_seconds) >= ? "
+            "ORDER BY seconds / baseline_seconds DESC",
+            (*baseline, latest, threshold_pct, min_seconds),
+        ).fetchall()
+        return [dict(row, change_pct=round((row["seconds"] / row["baseline_seconds"] - 1) * 100, 1)) for row in rows]
+
+    def flake_rates(self, runs=20, min_runs=3):
+        """
+        Per test over the last `runs` runs: how often it failed, and how often it
+        was flaky. A run counts as flaky when the test needed more than one attempt
+        to pass, or when it passed/failed differently from its previous run.
+        """
+        run_ids = self._last_run_ids(runs)
+        if not run_ids:
+            return []
+        rows = self.conn.execute(
+            "SELECT nodeid, COUNT(*) AS runs, "
+            "SUM(outcome IN ('failed', 'error')) AS failures, "
+            "SUM((attempts > 1 AND outcome = 'passed') OR (prev_outcome IS NOT NULL AND prev_outcome != outcome)) AS flaky_runs "
+            "FROM (SELECT nodeid, outcome, attempts, "
+            "      LAG(outcome) OVER (PARTITION BY nodeid ORDER BY run_id) AS prev_outcome "
+            f"      FROM results WHERE run_id IN ({','.join('?' * len(run_ids))}) AND outcome != 'skipped') "
+            "GROUP BY nodeid HAVING runs >= ? AND flaky_runs > 0 "
+            "ORDER BY CAST(flaky_runs AS REAL) / runs DESC, nodeid",
+            (*run_ids, min_runs),
+        ).fetchall()
+        return [dict(row, flake_rate=round(row["flaky_runs"] / row["runs"], 3)) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", choices=("slowest", "regressions", "flaky"))
+    parser.add_argument("--db", default="reports/trends.sqlite")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=None, help="Runs to look back over (default: 1 for slowest, 20 for flaky)")
+    parser.add_argument("--threshold", type=float, default=25.0, help="Regression threshold in percent")
+    parser.add_argument("--baseline-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"[WARN] No trend database at {args.db}")
+        return
+    with TrendDB(args.db) as db:
+        if args.query == "slowest":
+            for row in db.slowest(args.top, runs=args.runs or 1):
+                print(f"{row['mean_seconds']:9.2f} s  max {row['max_seconds']:7.2f} s  {row['nodeid']}")
+        elif args.query == "regressions":
+            for row in db.regressions(args.threshold, args.baseline_runs):
+                print(f"{row['change_pct']:+7.1f}%  {row['baseline_seconds']:7.2f} s -> {row['seconds']:7.2f} s  {row['nodeid']}")
+        else:
+            for row in db.flake_rates(args.runs or 20)[:args.top]:
+                print(f"{row['flake_rate'] * 100:5.1f}%  flaky {row['flaky_runs']}/{row['runs']}, failed {row['failures']}  {row['nodeid']}")
+
+
+if __name__ == "__main__":
+    main()